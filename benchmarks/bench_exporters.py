@@ -0,0 +1,106 @@
+# benchmarks/bench_exporters.py
+"""
+Mide cuánto tarda cada exportador según la longitud de la transcripción.
+
+Uso:
+    python -m benchmarks.bench_exporters --segments 100 1000 10000 --formats TXT PDF
+    python -m benchmarks.bench_exporters --segments 1000 10000 --memory
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from utils.file_handler import EXPORT_FORMATS, save_transcription
+from utils.transcript import Transcript
+
+SAMPLE_TEXT = "Esta es una frase de ejemplo para medir el tiempo de exportación de una transcripción larga."
+
+
+def synthetic_segments(count, segment_seconds=4.0):
+    """Genera segmentos consecutivos de duración fija, alternando dos hablantes."""
+    return [
+        {
+            "start": i * segment_seconds,
+            "end": (i + 1) * segment_seconds,
+            "text": SAMPLE_TEXT,
+            "speaker": f"Hablante {i % 2 + 1}",
+        }
+        for i in range(count)
+    ]
+
+
+def bench_exporters(segment_counts=(100, 1000, 10000), formats=EXPORT_FORMATS):
+    """
+    Exporta transcripciones sintéticas de distintas longitudes en cada formato.
+
+    :param segment_counts: Número de segmentos de cada transcripción.
+    :param formats: Formatos a medir.
+    :return: Lista de diccionarios con format, segments, seconds y bytes.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in segment_counts:
+            segments = synthetic_segments(count)
+            for file_format in formats:
+                path = os.path.join(tmp_dir, f"bench_{count}.{file_format.lower()}")
+                start = time.perf_counter()
+                save_transcription(segments, path, file_format)
+                elapsed = time.perf_counter() - start
+                results.append({
+                    "format": file_format,
+                    "segments": count,
+                    "seconds": round(elapsed, 4),
+                    "bytes": os.path.getsize(path),
+                })
+    return results
+
+
+def bench_transcript_memory(segment_counts=(1000, 10000)):
+    """
+    Compara la memoria de una lista de segmentos con la de la misma transcripción en columnas (Transcript).
+
+    :return: Lista de diccionarios con segments, list_bytes, transcript_bytes y ratio.
+    """
+    results = []
+    for count in segment_counts:
+        tracemalloc.start()
+        segments = synthetic_segments(count)
+        list_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        transcript = Transcript.from_segments(segments)
+        results.append({
+            "segments": count,
+            "list_bytes": list_bytes,
+            "transcript_bytes": transcript.nbytes,
+            "ratio": round(list_bytes / max(transcript.nbytes, 1), 1),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el tiempo de los exportadores según la longitud.")
+    parser.add_argument("--segments", nargs="+", type=int, default=[100, 1000, 10000],
+                        help="Número de segmentos de cada transcripción")
+    parser.add_argument("--formats", nargs="+", choices=EXPORT_FORMATS, default=list(EXPORT_FORMATS),
+                        help="Formatos a medir")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo JSON")
+    parser.add_argument("--memory", action="store_true",
+                        help="Comparar la memoria de la lista de segmentos con la de Transcript")
+    args = parser.parse_args()
+
+    if args.memory:
+        results = bench_transcript_memory(args.segments)
+        print(f"{'Segmentos':>10}{'Lista (B)':>14}{'Transcript (B)':>16}{'Ratio':>8}")
+        for row in results:
+            print(f"{row['segments']:>10}{row['list_bytes']:>14}{row['transcript_bytes']:>16}{row['ratio']:>8}")
+    else:
+        results = bench_exporters(args.segments, args.formats)
+        print(f"{'Formato':<8}{'Segmentos':>11}{'Tiempo (s)':>12}{'Tamaño (B)':>14}")
+        for row in results:
+            print(f"{row['format']:<8}{row['segments']:>11}{row['seconds']:>12}{row['bytes']:>14}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,248 @@
+# benchmarks/bench_pipeline.py
+"""
+Benchmark de la cadena completa audio -> documento con audio sintético.
+
+Mide las etapas que ejecuta TranscriptionPipeline (conversión a WAV con la caché de preprocesado,
+detección de voz y recorte de ventanas sobre el WAV mapeado en memoria), la carga del modelo,
+transcribe_audio (modelo tiny), los exportadores, format_markdown_table y el registro de trabajos, y
+guarda los tiempos en JSON.
+
+Uso:
+    python -m benchmarks.bench_pipeline --durations 60 600 --output resultados.json
+    python -m benchmarks.bench_pipeline --baseline resultados.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_exporters import synthetic_segments
+from benchmarks.synthetic_audio import AUDIO_KINDS, write_synthetic_wav
+from src.audio.buffer import open_wav, to_float32
+from src.audio.vad import detect_speech_chunks, split_windows
+from src.pipeline.stages import decode_file
+from src.storage import preprocess_cache, transcription_cache
+from utils.file_handler import EXPORT_FORMATS, save_transcription
+from utils.formatter import format_markdown_table
+
+# De 1 minuto a 4 horas
+DEFAULT_DURATIONS = (60, 600, 3600, 14400)
+
+# Los tiempos menores que este umbral no se comparan: el ruido de medida es mayor que el cambio
+MIN_COMPARABLE_SECONDS = 0.05
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def _run_stage(results, stage, fn, **labels):
+    """Ejecuta una etapa, añade su tiempo (o el error) a results y devuelve su resultado."""
+    entry = {"stage": stage, **labels}
+    try:
+        seconds, result = _timed(fn)
+        entry["seconds"] = round(seconds, 4)
+    except Exception as e:
+        entry["error"] = str(e)
+        result = None
+    results.append(entry)
+    print(json.dumps(entry, ensure_ascii=False))
+    return result
+
+
+def _slice_windows(samples, chunks, sample_rate):
+    """Recorta las ventanas de Whisper de cada fragmento como hace la inferencia y devuelve cuántas hay."""
+    count = 0
+    for start, end in chunks:
+        for audio, _ in split_windows(samples[start:end], start / sample_rate, sample_rate):
+            to_float32(audio)
+            count += 1
+    return count
+
+
+def bench_audio(results, work_dir, durations, kinds):
+    """Convierte cada audio sintético, detecta su voz y recorta sus ventanas, como la etapa de decodificación."""
+    # Cachés en el directorio temporal para no llenar ni reutilizar las de la instalación
+    preprocess_cache.PREPROCESS_CACHE_DIR = os.path.join(work_dir, "preprocess_cache")
+    transcription_cache.TRANSCRIPTION_CACHE_DIR = os.path.join(work_dir, "transcription_cache")
+    for duration in durations:
+        for kind in kinds:
+            source = write_synthetic_wav(os.path.join(work_dir, f"{kind}_{duration}.wav"), duration, kind)
+            labels = {"kind": kind, "duration_s": duration}
+            converted = _run_stage(results, "preprocess", lambda: preprocess_cache.get_preprocessed_audio(source),
+                                   **labels)
+            # Segunda llamada: el hash del archivo y el acierto en la caché de preprocesado
+            _run_stage(results, "preprocess_cached", lambda: preprocess_cache.get_preprocessed_audio(source),
+                       **labels)
+            if converted:
+                samples, sample_rate = open_wav(converted[0])
+                chunks = _run_stage(results, "detect_speech_chunks",
+                                    lambda: detect_speech_chunks(samples, sample_rate), **labels)
+                if chunks is not None:
+                    results[-1]["chunks"] = len(chunks)
+                    windows = _run_stage(results, "slice_windows",
+                                         lambda: _slice_windows(samples, chunks, sample_rate), **labels)
+                    if windows is not None:
+                        results[-1]["windows"] = windows
+                del samples  # Cerrar el mapeo antes de que la expulsión pueda borrar el WAV
+            # La etapa completa tal como la ejecuta el pipeline, con el WAV ya en caché
+            _run_stage(results, "decode_file", lambda: decode_file(source), **labels)
+            os.remove(source)
+
+
+def bench_model(results, work_dir, model_name, transcribe_seconds):
+    """Carga el modelo en frío y transcribe un fragmento de voz sintética."""
+    from src.audio.buffer import open_wav
+    from src.transcription.model_pool import clear_models, default_device, get_model
+    from src.transcription.whisper_transcriber import transcribe_audio
+
+    clear_models()
+    device = default_device()
+    if _run_stage(results, "model_load", lambda: get_model(model_name, device=device),
+                  model=model_name, device=device) is None:
+        return
+
+    wav_path = write_synthetic_wav(os.path.join(work_dir, "transcribe.wav"), transcribe_seconds, "speech")
+    samples, _ = open_wav(wav_path)
+    segments = _run_stage(results, "transcribe_audio", lambda: transcribe_audio(samples, model_name=model_name),
+                          model=model_name, device=device, duration_s=transcribe_seconds)
+    if segments is not None and "seconds" in results[-1]:
+        results[-1]["rtf"] = round(results[-1]["seconds"] / transcribe_seconds, 4)
+
+
+def bench_exports(results, work_dir, durations, formats):
+    """Exporta transcripciones del tamaño que tendrían los audios (un segmento cada 4 s)."""
+    for duration in durations:
+        segments = synthetic_segments(max(int(duration / 4), 1))
+        for file_format in formats:
+            path = os.path.join(work_dir, f"export_{duration}.{file_format.lower()}")
+            _run_stage(results, "export", lambda: save_transcription(segments, path, file_format),
+                       format=file_format, duration_s=duration, segments=len(segments))
+
+
+def bench_registry(results, work_dir, row_counts):
+    """Alta, actualización y lectura de trabajos en el registro, y la tabla Markdown resultante."""
+    from src.storage.job_store import add_job, list_jobs, update_job
+
+    for rows in row_counts:
+        db_path = os.path.join(work_dir, f"jobs_{rows}.db")
+        names = [f"archivo_{i:06d}.mp3" for i in range(rows)]
+
+        def add_all():
+            for name in names:
+                add_job(name, f"/tmp/{name}", "PDF", db_path=db_path)
+
+        def update_all():
+            for name in names:
+                update_job(name, db_path=db_path, status="Finalizado", time=12.5,
+                           download_link=f"[Descargar](/{name}.pdf)")
+
+        _run_stage(results, "registry_add", add_all, rows=rows)
+        _run_stage(results, "registry_update", update_all, rows=rows)
+        jobs = _run_stage(results, "registry_list", lambda: list_jobs(page_size=None, db_path=db_path), rows=rows)
+
+        data = [[job["file_name"], job["status"], job["time"], job["download_link"]] for job in jobs or []]
+        _run_stage(results, "format_markdown_table", lambda: format_markdown_table(data), rows=len(data))
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Campos que son medidas y no identifican la prueba
+_MEASURES = ("seconds", "rtf", "chunks", "windows", "error")
+
+
+def _result_key(entry):
+    return tuple(sorted((k, v) for k, v in entry.items() if k not in _MEASURES))
+
+
+def compare_results(results, baseline, tolerance=0.2):
+    """
+    Compara los tiempos con una ejecución anterior.
+
+    :param results: Resultados actuales.
+    :param baseline: Resultados de referencia (la lista "results" de otro JSON).
+    :param tolerance: Aumento relativo permitido antes de considerarlo una regresión.
+    :return: Lista de tuplas (entrada, segundos de referencia) que empeoraron.
+    """
+    reference = {_result_key(entry): entry["seconds"] for entry in baseline if "seconds" in entry}
+    regressions = []
+    for entry in results:
+        before = reference.get(_result_key(entry))
+        if before is None or "seconds" not in entry or before < MIN_COMPARABLE_SECONDS:
+            continue
+        if entry["seconds"] > before * (1 + tolerance):
+            regressions.append((entry, before))
+    return regressions
+
+
+def run_benchmarks(durations=DEFAULT_DURATIONS, kinds=AUDIO_KINDS, formats=EXPORT_FORMATS, model_name="tiny",
+                   transcribe_seconds=60, row_counts=(100, 1000, 10000), skip_model=False):
+    """Ejecuta todas las etapas en un directorio temporal y devuelve el informe."""
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        bench_audio(results, work_dir, durations, kinds)
+        if not skip_model:
+            try:
+                bench_model(results, work_dir, model_name, transcribe_seconds)
+            except ImportError as e:
+                print(f"Se omite el modelo: {e}")
+        bench_exports(results, work_dir, durations, formats)
+        bench_registry(results, work_dir, row_counts)
+
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la cadena audio -> documento.")
+    parser.add_argument("--durations", nargs="+", type=int, default=list(DEFAULT_DURATIONS),
+                        help="Duraciones del audio sintético en segundos")
+    parser.add_argument("--kinds", nargs="+", choices=AUDIO_KINDS, default=list(AUDIO_KINDS),
+                        help="Tipos de audio sintético")
+    parser.add_argument("--formats", nargs="+", choices=EXPORT_FORMATS, default=list(EXPORT_FORMATS),
+                        help="Formatos de exportación")
+    parser.add_argument("--model", default="tiny", help="Modelo Whisper para la carga y la transcripción")
+    parser.add_argument("--transcribe-seconds", type=int, default=60, help="Segundos de audio a transcribir")
+    parser.add_argument("--rows", nargs="+", type=int, default=[100, 1000, 10000],
+                        help="Registros para el registro de trabajos y la tabla Markdown")
+    parser.add_argument("--skip-model", action="store_true", help="No cargar ni ejecutar Whisper")
+    parser.add_argument("--output", default="benchmark_results.json", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Aumento relativo tolerado (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.durations, args.kinds, args.formats, args.model, args.transcribe_seconds,
+                            args.rows, args.skip_model)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_results(report["results"], baseline, args.tolerance)
+        for entry, before in regressions:
+            labels = ", ".join(f"{k}={v}" for k, v in entry.items() if k not in _MEASURES)
+            print(f"Regresión: {labels}: {before} s -> {entry['seconds']} s")
+        if regressions:
+            sys.exit(1)
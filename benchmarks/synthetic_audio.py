@@ -0,0 +1,60 @@
+# benchmarks/synthetic_audio.py
+"""Generación de audio sintético para los benchmarks, sin TTS ni archivos externos."""
+import wave
+
+import numpy as np
+
+AUDIO_KINDS = ("silence", "tone", "speech")
+
+
+def _silence_block(start, length, sample_rate, rng):
+    return np.zeros(length, dtype=np.float32)
+
+
+def _tone_block(start, length, sample_rate, rng):
+    t = (start + np.arange(length)) / sample_rate
+    return 0.3 * np.sin(2 * np.pi * 440.0 * t).astype(np.float32)
+
+
+def _speech_block(start, length, sample_rate, rng):
+    """Ruido con envolvente de sílabas (~4 Hz) y pausas de frase cada pocos segundos."""
+    t = (start + np.arange(length)) / sample_rate
+    syllables = np.clip(np.sin(2 * np.pi * 4.0 * t), 0, None) ** 2
+    # Frases de 6 s con 1.5 s de silencio al final para que el VAD encuentre pausas
+    phrases = (t % 7.5) < 6.0
+    noise = rng.standard_normal(length).astype(np.float32)
+    return 0.25 * noise * syllables * phrases
+
+
+_GENERATORS = {
+    "silence": _silence_block,
+    "tone": _tone_block,
+    "speech": _speech_block,
+}
+
+
+def write_synthetic_wav(path, seconds, kind="speech", sample_rate=16000, seed=0, block_seconds=60):
+    """
+    Escribe un WAV mono de 16 bits generado por bloques (no se guarda el audio completo en memoria).
+
+    :param path: Ruta del archivo a crear.
+    :param seconds: Duración en segundos.
+    :param kind: Tipo de señal: "silence", "tone" o "speech" (ruido con envolvente de voz).
+    :param sample_rate: Frecuencia de muestreo en Hz.
+    :param seed: Semilla del ruido, para que las ejecuciones sean comparables.
+    :param block_seconds: Segundos generados en cada bloque.
+    :return: Ruta del archivo creado.
+    """
+    generate = _GENERATORS[kind]
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    block = int(block_seconds * sample_rate)
+
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for start in range(0, total, block):
+            samples = generate(start, min(block, total - start), sample_rate, rng)
+            wav.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+    return path
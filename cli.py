@@ -0,0 +1,120 @@
+# cli.py
+"""
+Transcripción por lotes desde la línea de comandos, sin Gradio ni Flask.
+
+Ejemplos:
+    python cli.py grabaciones/ --format TXT
+    python cli.py "grabaciones/**/*.mp3" --output-dir transcripciones --workers 4
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+from config.settings import (
+    WHISPER_MODEL, LANGUAGE, LANGUAGE_CHOICES, PIPELINE_INFERENCE_WORKERS, PIPELINE_MAX_PENDING, INFERENCE_BATCH_SIZE,
+    PARALLEL_SEGMENT_WORKERS
+)
+from src.pipeline.transcription_pipeline import TranscriptionPipeline, make_job
+from utils.file_handler import EXPORT_FORMATS
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".ogg", ".flac", ".aac", ".wma", ".opus", ".mp4", ".mkv", ".mov", ".webm")
+
+
+def find_inputs(patterns, recursive=False):
+    """Expande carpetas y patrones glob a la lista ordenada de archivos de audio o video."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            if recursive:
+                for root, _, names in os.walk(pattern):
+                    files += [os.path.join(root, name) for name in names]
+            else:
+                files += [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            files += glob.glob(pattern, recursive=True)
+    return sorted({
+        os.path.abspath(f) for f in files
+        if os.path.isfile(f) and f.lower().endswith(AUDIO_EXTENSIONS)
+    })
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe carpetas completas de audio sin la interfaz web.")
+    parser.add_argument("inputs", nargs="+", help="Carpetas, archivos o patrones glob (entre comillas)")
+    parser.add_argument("--format", default="TXT", choices=EXPORT_FORMATS, help="Formato de salida")
+    parser.add_argument("--output-dir", help="Carpeta de salida (por defecto, junto a cada archivo)")
+    parser.add_argument("--recursive", action="store_true", help="Recorrer también las subcarpetas")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Procesos de decodificación y de exportación")
+    parser.add_argument("--inference-workers", type=int, default=PIPELINE_INFERENCE_WORKERS,
+                        help="Hilos de inferencia (cada uno con su propio modelo)")
+    parser.add_argument("--batch-size", type=int, default=INFERENCE_BATCH_SIZE,
+                        help="Ventanas de 30 s por pasada del modelo (1 = secuencial)")
+    parser.add_argument("--segment-workers", type=int, default=PARALLEL_SEGMENT_WORKERS,
+                        help="Procesos que transcriben a la vez fragmentos de un mismo archivo (0 = desactivado)")
+    parser.add_argument("--model", default=WHISPER_MODEL, help="Modelo Whisper")
+    parser.add_argument("--language", default=LANGUAGE, choices=LANGUAGE_CHOICES,
+                        help='Idioma del audio, p. ej. "es", o "auto" para detectarlo una vez por archivo')
+    parser.add_argument("--overwrite", action="store_true", help="Volver a generar las salidas que ya existen")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    jobs = []
+    skipped = 0
+    used_names = set()
+    for file_path in find_inputs(args.inputs, args.recursive):
+        file_name = os.path.basename(file_path)
+        if args.output_dir:
+            # Evitar que dos archivos con el mismo nombre en carpetas distintas se pisen en la carpeta de salida
+            stem, ext = os.path.splitext(file_name)
+            unique_stem, suffix = stem, 1
+            while unique_stem in used_names:
+                unique_stem, suffix = f"{stem}_{suffix}", suffix + 1
+            used_names.add(unique_stem)
+            file_name = f"{unique_stem}{ext}"
+        job = make_job(file_path, args.format, output_dir=args.output_dir, model=args.model, file_name=file_name,
+                       language=args.language)
+        if not args.overwrite and os.path.exists(job["output_path"]):
+            skipped += 1
+            continue
+        jobs.append(job)
+
+    print(f"{len(jobs)} archivo(s) por transcribir, {skipped} omitido(s) porque ya tienen salida")
+    if not jobs:
+        return 0
+
+    pipeline = TranscriptionPipeline(
+        decode_workers=args.workers,
+        inference_workers=args.inference_workers,
+        export_workers=args.workers,
+        max_pending=max(PIPELINE_MAX_PENDING, args.workers),
+        batch_size=args.batch_size,
+        segment_workers=args.segment_workers,
+        record=False,  # Los archivos de la CLI no están en el registro de trabajos
+    )
+
+    start = time.time()
+    finished = errors = 0
+    for event in pipeline.run(jobs):
+        if not event["done"]:
+            continue
+        if event["status"] == "Finalizado":
+            finished += 1
+            print(f"[{finished + errors}/{len(jobs)}] {event['file_name']} -> {event['output_path']} ({event['time']} s)")
+        else:
+            errors += 1
+            print(f"[{finished + errors}/{len(jobs)}] {event['file_name']}: {event['status']}", file=sys.stderr)
+
+    print(f"Completados {finished}, con error {errors}, en {round(time.time() - start, 2)} s")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,69 @@
 # config/settings.py
 WHISPER_MODEL = "large-v3-turbo"  # Opciones: tiny, base, small, medium, large
-LANGUAGE = "es"         # Idioma de la transcripción
+LANGUAGE = "auto"       # Idioma de la transcripción ("auto" = se detecta una vez por archivo)
 OUTPUT_FORMAT = "text"  # Opciones: text, docx, pdf
+
+# Detección de idioma
+LANGUAGE_CHOICES = ("auto", "es", "en", "pt", "fr", "it", "de", "ca")  # Idiomas que se pueden elegir por trabajo
+LANGUAGE_DETECTION_SECONDS = 30  # Audio (desde el primer tramo de voz) con el que se detecta el idioma
+
+# Registro de modelos residentes
+MODEL_POOL_MAX_BYTES = 8 * 1024 ** 3  # Presupuesto de memoria para modelos cargados (0 = sin límite)
+PRELOAD_MODELS = [WHISPER_MODEL]      # Modelos que se cargan al iniciar la aplicación
+
+# Registro de trabajos
+JOB_DB_PATH = "jobs.db"  # Base de datos SQLite con el estado de cada archivo
+
+# Caché de transcripciones (clave: hash del audio decodificado + modelo + idioma)
+TRANSCRIPTION_CACHE_DIR = "cache/transcriptions"
+TRANSCRIPTION_CACHE_MAX_BYTES = 512 * 1024 ** 2  # Tamaño máximo en disco antes de expulsar entradas
+
+# Caché de preprocesado (clave: hash del archivo original + parámetros de ffmpeg)
+PREPROCESS_CACHE_DIR = "cache/audio"  # WAV 16 kHz mono ya convertidos
+PREPROCESS_CACHE_MAX_BYTES = 4 * 1024 ** 3  # Los WAV ocupan ~115 MB por hora de audio
+PREPROCESS_CACHE_GRACE_SECONDS = 3600       # Los WAV usados hace menos no se expulsan (un trabajo puede no haberlos abierto aún)
+AUDIO_BLOCK_SECONDS = 30                    # Segundos de audio que se leen de ffmpeg en cada bloque
+
+# Fragmentación por silencios (VAD por energía)
+VAD_THRESHOLD_DB = -40.0  # Energía (dBFS) por debajo de la cual una trama es silencio
+VAD_MIN_SILENCE = 1.0     # Silencios de al menos estos segundos se descartan y separan fragmentos
+VAD_MAX_CHUNK = 1800      # Duración máxima de cada fragmento en segundos
+VAD_PADDING = 0.2         # Margen en segundos que se conserva alrededor de cada tramo de voz
+
+# Pipeline de transcripción (decodificación → transcripción → exportación)
+PIPELINE_DECODE_WORKERS = 2     # Procesos para ffmpeg y la detección de silencios
+PIPELINE_INFERENCE_WORKERS = 1  # Hilos de inferencia; cada uno tiene su propia copia del modelo
+PIPELINE_EXPORT_WORKERS = 2     # Procesos para generar DOCX/PDF
+PIPELINE_MAX_PENDING = 2        # Archivos decodificados que pueden esperar a la inferencia
+PIPELINE_STREAM_CHUNK = 0       # Segundos máximos por fragmento para que el texto parcial avance por ventanas (0 = sin límite);
+                                # Whisper no arrastra el contexto entre fragmentos, así que acotarlos puede empeorar el texto
+
+# Interfaz
+STREAM_PREVIEW_LINES = 200           # Últimas líneas de texto que se muestran en "Ver Detalle" mientras se transcribe
+RESULTS_PAGE_SIZE = 25               # Trabajos por página en la tabla de resultados
+RESULTS_REFRESH_SECONDS = 2          # Intervalo de consulta de cambios de la página visible
+SEARCH_RESULTS_LIMIT = 50            # Resultados que muestra la búsqueda en las transcripciones
+
+# Inferencia por lotes
+INFERENCE_BATCH_SIZE = 1  # Ventanas de 30 s por pasada del modelo (1 = transcripción secuencial con model.transcribe)
+
+# Transcripción en paralelo de los fragmentos de un mismo archivo (nodos con muchos núcleos)
+PARALLEL_SEGMENT_WORKERS = 0        # Procesos con su propio modelo residente (0 = desactivado)
+PARALLEL_THREADS_PER_WORKER = None  # Hilos de torch fijos por proceso (None = núcleos / procesos)
+
+# Modo CPU (nodos sin GPU)
+CPU_INT8_QUANTIZATION = False  # Cuantización dinámica int8 de las capas lineales al cargar el modelo en CPU
+CPU_THREADS = None             # Hilos de torch para la inferencia (None = núcleos / hilos de inferencia)
+CPU_FALLBACK_MODEL = None      # Modelo reducido que se puede elegir por trabajo, p. ej. "small"
+
+# Diarización de hablantes (PyAnnote)
+DIARIZATION_ENABLED = False                            # Etiquetar cada segmento con su hablante
+DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"  # Requiere HUGGINGFACE_TOKEN en .env
+
+# Cola de trabajos (API REST e interfaz)
+UPLOAD_DIR = "uploads"          # Carpeta donde la API guarda los archivos recibidos y sus transcripciones
+QUEUE_MAX_PENDING = 100         # Trabajos en cola antes de rechazar nuevos envíos
+QUEUE_WORKERS = 2               # Trabajos que se transcriben a la vez, cada uno con su propia copia del modelo
+QUEUE_SHORT_CLIP_SECONDS = 600  # Los audios de hasta esta duración pasan delante de los largos
+QUEUE_AGING_SECONDS = 1800      # Cada tanto tiempo de espera adelanta un nivel de prioridad
+QUEUE_POLL_INTERVAL = 1.0       # Segundos entre consultas de un trabajador con la cola vacía
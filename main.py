@@ -1,107 +1,106 @@
+import time
+startup_time = time.perf_counter()  # Para medir cuánto tarda la interfaz en estar disponible
+
 import gradio as gr
 from gradio_modal import Modal
 import os
-import torch
 import socket
-import time
+import threading
 import webbrowser
 import requests
-import json
-from datetime import datetime
-from flask import Flask, session
 from multiprocessing import Process
-from pyannote.audio import Pipeline
-from utils.file_handler import save_as_text, save_as_docx, save_as_pdf
-from src.transcription.whisper_transcriber import transcribe_audio
-from src.audio.preprocessor import split_audio
 from src.auth.google_auth import app as flask_app
-from pathlib import Path
+from src.storage.job_store import (
+    init_store, add_job, get_job, get_jobs, list_jobs, count_jobs, stage_breakdown, search_transcripts, ERROR_FILTER,
+    ACTIVE_FILTER
+)
+from src.pipeline.job_queue import QueueFullError, submit_job, start_workers
+from src.pipeline.transcription_pipeline import make_job
+from src.transcription.parallel_transcriber import shutdown_pools
+from utils.formatter import format_stage_breakdown, format_search_results
+from utils.progress import ProgressTable
+from collections import deque
+from config.settings import (
+    WHISPER_MODEL, CPU_FALLBACK_MODEL, LANGUAGE, LANGUAGE_CHOICES, STREAM_PREVIEW_LINES, UPLOAD_DIR, RESULTS_PAGE_SIZE,
+    RESULTS_REFRESH_SECONDS, SEARCH_RESULTS_LIMIT
+)
+from utils.file_handler import EXPORT_FORMATS, partial_paths
 
 # Variable global para almacenar el estado de usuario autenticado
 authenticated_user = None
-# Lista global para rastrear los archivos ya cargados
-# Diccionario global para el registro
-file_registry = {}
 
-# Función para cargar los datos existentes en la tabla
-def load_existing_data():
-    global file_registry
+# Filtros de estado de la tabla de resultados
+STATUS_FILTERS = ["Todos", "Pendiente", "En cola", ACTIVE_FILTER, "Finalizado", ERROR_FILTER]
 
-    # Asegurarse de que el registro esté inicializado
-    initialize_file_registry()
 
-    # Construir la tabla con TODOS los registros
-    result_data = []
-    for file_name, data in file_registry.items():
-        result_data.append([file_name, data["status"], data["time"], data["download_link"]])
+def job_filters(status_filter, since, until):
+    """Filtros de list_jobs a partir de los controles de la tabla (fechas como timestamps de gr.DateTime)."""
+    return {
+        "status": None if status_filter in (None, "Todos") else status_filter,
+        "since": since or None,
+        "until": until + 24 * 3600 if until else None,  # "Hasta" incluye todo ese día
+    }
 
-    return format_markdown_table(result_data)
 
+def load_page(page, filters):
+    """
+    Filas de una página de resultados, del trabajo más reciente al más antiguo.
 
-# Función para inicializar el registro desde un archivo JSON
-def initialize_file_registry():
-    try:
-        with open("file_registry.json", "r") as f:
-            file_registry = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        file_registry = {}
+    :return: Tupla (filas, página corregida, número de páginas, total de trabajos).
+    """
+    total = count_jobs(**filters)
+    pages = max((total + RESULTS_PAGE_SIZE - 1) // RESULTS_PAGE_SIZE, 1)
+    page = min(max(int(page or 1), 1), pages)
+    jobs = list_jobs(page, RESULTS_PAGE_SIZE, newest_first=True, **filters)
+    breakdown = stage_breakdown([job["file_name"] for job in jobs])
+    rows = [
+        [job["file_name"], job["status"], job["time"], job["download_link"],
+         format_stage_breakdown(breakdown.get(job["file_name"]))]
+        for job in jobs
+    ]
+    return rows, page, pages, total
+
+
+def refresh_table(table, rows):
+    """
+    Aplica las filas de la página a la tabla de la sesión.
 
-# Función para guardar el registro en un archivo JSON
-def save_file_registry():
-    global file_registry
-    with open("file_registry.json", "w") as f:
-        json.dump(file_registry, f, indent=4)
+    Si la página muestra los mismos trabajos solo se marcan las filas que cambiaron, para que
+    render() no vuelva a formatear las demás.
+    """
+    if table is None or [row[0] for row in table.rows] != [row[0] for row in rows]:
+        return ProgressTable(rows)
+    for idx, row in enumerate(rows):
+        if row != table.rows[idx]:
+            table.update(idx, row=row)
+    return table
 
 
-import atexit
-atexit.register(save_file_registry)
-initialize_file_registry()
+# Función para cargar los datos existentes en la tabla (solo la página visible)
+def load_existing_data(page=1, status_filter="Todos", since=None, until=None, table=None):
+    rows, page, pages, total = load_page(page, job_filters(status_filter, since, until))
+    table = refresh_table(table, rows)
+    return table.render(), page, f"Página {page} de {pages} · {total} trabajo(s)", table
 
-# Función para cargar los archivos y mostrarlos en la tabla
-def load_files(files):
-    global file_registry
 
-    # Leer el archivo JSON al cargar
-    initialize_file_registry()
+def poll_existing_data(page, status_filter, since, until, table):
+    """Refresco periódico: solo envía la tabla si cambió alguna fila de la página visible."""
+    rows, page, pages, total = load_page(page, job_filters(status_filter, since, until))
+    refreshed = refresh_table(table, rows)
+    if refreshed is table and not table.changed_rows():
+        return gr.update(), gr.update(), gr.update(), table
+    return refreshed.render(), page, f"Página {page} de {pages} · {total} trabajo(s)", refreshed
 
-    # Añadir nuevos archivos al registro
-    for file in files:
-        file_name = os.path.basename(file.name)
-        if file_name not in file_registry:
-            # Agregar el nuevo archivo al registro
-            file_registry[file_name] = {
-                "status": "Pendiente",
-                "time": "-",
-                "download_link": ""
-            }
-
-    # Guardar el registro actualizado
-    save_file_registry()
-
-    # Construir la tabla con TODOS los registros del registro global
-    return load_existing_data()
-
-
-def format_status(status):
-    status_map = {
-        "Pendiente": '<span style="color: orange; font-weight: bold;">Pendiente</span>',
-        "Procesando...": '<span style="color: blue; font-weight: bold;">Procesando...</span>',
-        "Finalizado": '<span style="color: green; font-weight: bold;">Finalizado</span>',
-        "Error": '<span style="color: red; font-weight: bold;">Error</span>',
-    }
-    return status_map.get(status, status)  # Devuelve el estilo correspondiente
 
-# Función para formatear los datos en Markdown
-def format_markdown_table(data):
-    markdown_text = "| Nombre | Estado | Tiempo (s) | Descargar |\n| --- | --- | --- | --- |\n"
-    for row in data:
-        try:
-            status_styled = format_status(row[1])
-            markdown_text += f"| {row[0]} | {status_styled} | {row[2]} | {row[3]} |\n"
-        except Exception as e:
-            # Captura cualquier problema con los datos
-            print(f"Error al procesar la fila: {row}. Error: {e}")
-    return markdown_text
+# Función para cargar los archivos y mostrarlos en la tabla
+def load_files(files, page, status_filter, since, until, table):
+    # Añadir nuevos archivos al registro (los existentes se ignoran)
+    for file in files or []:
+        add_job(os.path.basename(file.name), file.name)
+
+    # Volver a la primera página, donde aparecen los archivos recién añadidos
+    return load_existing_data(1, status_filter, since, until, table)
+
 
 def wait_for_flask(host="127.0.0.1", port=5000, timeout=30):
     """Espera a que Flask esté escuchando en el puerto antes de proceder."""
@@ -111,11 +110,29 @@ def wait_for_flask(host="127.0.0.1", port=5000, timeout=30):
             with socket.create_connection((host, port), timeout=2):
                 print(f"Flask está listo en https://{host}:{port}")
                 return
-        except (socket.timeout, ConnectionRefusedError):
+        except OSError:
             if time.time() - start_time > timeout:
                 raise TimeoutError(f"No se pudo conectar a Flask en https://{host}:{port} después de {timeout} segundos.")
-            print("Esperando a que Flask esté listo...")
-            time.sleep(1)
+            time.sleep(0.1)
+
+def warm_up():
+    """
+    Carga en segundo plano torch, Whisper y los exportadores para que el primer trabajo no espere.
+
+    Si la carga falla (descarga, memoria de la GPU...), solo se informa: cada trabajo vuelve a
+    intentar cargar su modelo al empezar.
+    """
+    warm_up_start = time.perf_counter()
+    try:
+        from src.transcription.model_pool import preload_models
+        import docx, reportlab.platypus  # noqa: F401  (se cargan en la caché de módulos)
+
+        # Cargar los modelos una sola vez, antes del primer trabajo
+        preload_models()
+    except Exception as e:
+        print(f"No se pudieron precargar los modelos: {e}")
+        return
+    print(f"Modelos y exportadores cargados en {time.perf_counter() - warm_up_start:.1f} s")
 
 def run_flask():
     try:
@@ -143,284 +160,282 @@ def update_user_status():
 
     return "No se pudo conectar con Flask después de varios intentos."
 
-# Función para transcribir los archivos con actualizaciones en tiempo real
-def transcribe_files(files, file_format):
-    global file_registry
+def read_new_lines(path, offset):
+    """
+    Lee las líneas completas añadidas a un archivo desde offset.
 
-    # Validar que se hayan subido archivos
-    if not files or len(files) == 0:
-        yield "No se han seleccionado archivos para transcribir.", ""
+    :return: Tupla (líneas nuevas, offset hasta el que se leyó).
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return [], offset
+    end = data.rfind(b"\n") + 1  # Una línea a medio escribir se lee en la siguiente consulta
+    lines = data[:end].decode("utf-8", errors="replace").splitlines()
+    return lines, offset + end
 
-    # Leer el estado actual de los archivos
-    initialize_file_registry()
 
-    # Inicializar la tabla con el estado "Pendiente" solo para los archivos nuevos
-    result_data = []
-    for file in files:
-        file_path = file.name
-        file_name = os.path.basename(file_path)
+def is_finished(status):
+    return status == "Finalizado" or status.startswith("Error")
 
-        if file_name not in file_registry:
-            # Agregar nuevos archivos al registro global
-            file_registry[file_name] = {"status": "Pendiente", "time": "-", "download_link": ""}
-            result_data.append([file_name, "Pendiente", "-", ""])
-        else:
-            # Recuperar el estado de los archivos ya existentes
-            data = file_registry[file_name]
-            result_data.append([file_name, data["status"], data["time"], data["download_link"]])
 
-    # Guardar el estado actualizado en el archivo JSON
-    save_file_registry()
+# Función para transcribir los archivos con actualizaciones en tiempo real
+def transcribe_files(files, file_format, fast_mode=False, language=LANGUAGE):
+    # Validar que se hayan subido archivos
+    if not files or len(files) == 0:
+        yield "No se han seleccionado archivos para transcribir."
+        return
 
-    yield format_markdown_table(result_data), ""  # Mostrar el estado inicial de la tabla
+    # Modelo reducido opcional para este lote en nodos sin GPU
+    model = CPU_FALLBACK_MODEL if fast_mode and CPU_FALLBACK_MODEL else WHISPER_MODEL
 
-    for idx, file in enumerate(files):
+    # La interfaz es un cliente más de la cola: los trabajos siguen aunque se cierre la pestaña.
+    # El estado de cada trabajo se ve en la tabla (que se refresca sola); aquí solo se sigue el texto.
+    preview = deque(maxlen=STREAM_PREVIEW_LINES)
+    partial_offsets = {}  # Transcripción parcial de cada archivo seguido -> (archivo, bytes ya leídos)
+    for file in files:
         file_path = file.name
         file_name = os.path.basename(file_path)
 
-        if file_registry[file_name]["status"] != "Pendiente":
-            # Saltar archivos ya procesados
-            continue
-
-        # Marcar el archivo como "Procesando..."
-        result_data[idx][1] = "Procesando..."
-        file_registry[file_name]["status"] = "Procesando..."
-        yield format_markdown_table(result_data), ""  # Mostrar el cambio a "Procesando..."
-        save_file_registry()  # Guardar el estado actualizado
-        time.sleep(3)
-
-        start_time = datetime.now()
-
-        try:
-            # Dividir audio en fragmentos
-            result_data[idx][1] = "Fragmentando..."
-            file_registry[file_name]["status"] = "Fragmentando..."
-            yield format_markdown_table(result_data), ""
-            save_file_registry()
-
-            segment_paths = split_audio(file_path)
-            time.sleep(3)
-
-            # Transcribir fragmentos y combinarlos
-            full_transcription = ""
-            total_segments = len(segment_paths)  # Obtener el total de segmentos para calcular el porcentaje
-            torch_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
-            result_data[idx][1] = "Transcribiendo... (0%)"
-            file_registry[file_name]["status"] = "Transcribiendo... (0%)"
-            yield format_markdown_table(result_data), ""
-            save_file_registry()
-
-            transcription_with_timestamps = []
-
-            for i, segment in enumerate(segment_paths):
-                progress = int((i + 1) / len(segment_paths) * 100)
-                result_data[idx][1] = f"Transcribiendo... ({progress}%)"
-                file_registry[file_name]["status"] = f"Transcribiendo... ({progress}%)"
-                yield format_markdown_table(result_data), ""
-                save_file_registry()
-
-                transcription_segments = transcribe_audio(segment)  # Obtiene los segmentos con tiempos
-                for seg in transcription_segments:
-                    transcription_with_timestamps.append({
-                        "start": seg["start"],  # Tiempo de inicio del segmento
-                        "end": seg["end"],      # Tiempo de fin del segmento
-                        "text": seg["text"]     # Texto del segmento
-                    })
-                time.sleep(3)
-
-            # Generar la transcripción completa para el PDF
-            full_transcription = "\n".join([seg["text"] for seg in transcription_with_timestamps])
-
-            # Actualizar el porcentaje de progreso
-            progress = int((i + 1) / total_segments * 100)
-            result_data[idx][1] = f"Transcribiendo... ({progress}%)"
-            file_registry[file_name]["status"] = f"Transcribiendo... ({progress}%)"
-            yield format_markdown_table(result_data), ""
-            save_file_registry()
-
-            # Guardar resultado en formato seleccionado
-            output_filename = f"{os.path.splitext(file_name)[0]}.{file_format.lower()}"
-            output_path = os.path.join(os.path.dirname(file_path), output_filename)
-
-            result_data[idx][1] = "Generando documento..."
-            file_registry[file_name]["status"] = "Generando documento..."
-            yield format_markdown_table(result_data), ""
-            save_file_registry()
-
-            if file_format == "TXT":
-                save_as_text(full_transcription, output_path)
-            elif file_format == "DOCX":
-                save_as_docx(full_transcription, output_path)
-            elif file_format == "PDF":
-                save_as_pdf(full_transcription, output_path)
-            time.sleep(3)
-
-            end_time = datetime.now()
-            elapsed_time = round((end_time - start_time).total_seconds(), 2)
-
-            # Generar URL del archivo para descarga
-            # document_url = f"/gradio_api/file={output_path.replace('\\', '/')}"
-            document_url = f"/gradio_api/file={Path(output_path).as_posix()}"
-
-            download_link = f"<a href='{document_url}' download='{output_filename}'>Descargar ⇣</a>"
-
-            # Actualizar datos en la tabla con el enlace de descarga
-            result_data[idx] = [
-                file_name,
-                "Finalizado",
-                elapsed_time,
-                download_link
-            ]
-            file_registry[file_name] = {
-                "status": "Finalizado",
-                "time": elapsed_time,
-                "download_link": download_link
-            }
-            yield format_markdown_table(result_data), ""  # Actualizar la tabla después de procesar cada archivo
-            save_file_registry()
+        add_job(file_name, file_path, file_format)
+        data = get_job(file_name)
+        status = data["status"]
+        if status == "Pendiente":
+            try:
+                submit_job(file_name, file_path, file_format, model=model, language=language)
+                status = get_job(file_name)["status"]
+            except QueueFullError as e:
+                preview.append(f"{file_name}: {e}")
+                continue
+
+        if not is_finished(status):
+            output_path = make_job(data["file_path"] or file_path, data["file_format"] or file_format)["output_path"]
+            partial_offsets[partial_paths(output_path)[0]] = (file_name, 0)
+    yield "\n".join(preview)
+
+    # Leer el texto nuevo hasta que terminen los trabajos seguidos
+    watching = {file_name for file_name, _ in partial_offsets.values()}
+    while watching:
+        time.sleep(RESULTS_REFRESH_SECONDS / 2)
+        jobs = get_jobs(watching)
+        watching = {name for name, job in jobs.items() if not is_finished(job["status"])}
+
+        changed = False
+        for path, (file_name, offset) in list(partial_offsets.items()):
+            lines, offset = read_new_lines(path, offset)
+            if lines:
+                preview.extend(f"{file_name} {line}" for line in lines)
+                changed = True
+            if file_name in watching:
+                partial_offsets[path] = (file_name, offset)
+            else:
+                del partial_offsets[path]  # Al terminar, los parciales se reemplazan por el documento
+        if changed:
+            yield "\n".join(preview)
+
+def search_text(query):
+    """Busca el texto en las transcripciones terminadas y devuelve la tabla de resultados."""
+    if not query or not query.strip():
+        return ""
+    try:
+        return format_search_results(search_transcripts(query, limit=SEARCH_RESULTS_LIMIT))
+    except Exception as e:
+        return f"Error en la búsqueda: {e}"
 
-        except Exception as e:
-            result_data[idx] = [
-                file_name,
-                f"Error: {e}",
-                "-",
-                ""
-            ]
-            file_registry[file_name]["status"] = f"Error: {e}"
-            save_file_registry()
-            yield format_markdown_table(result_data), ""  # Mostrar error en la tabla si ocurre una excepción
-
-    # Estado final de la tabla
-    yield format_markdown_table(result_data), ""
-
-# Interfaz con Gradio
-with gr.Blocks() as demo:
-    with gr.Sidebar():
-        gr.Markdown("### Menú")
-        auth_button = gr.Button("Iniciar sesión con Google", size="sm")
-        logout_button = gr.Button("Cerrar sesión", size="sm")
-        user_status = gr.Textbox(label="Estado del usuario", interactive=False)
-
-    gr.Markdown("## Transcriptor de Audio a Texto")
-
-    # Actualiza el estado del usuario
-    user_status.value = update_user_status()
-
-    with gr.Row():
-        with gr.Column(scale=1):
-            gr.Markdown("### Archivos")
-            audio_input = gr.File(file_count="multiple", label="Seleccionar archivos de audio")
-            with gr.Blocks():
-                format_selector = gr.Dropdown(choices=["TXT", "DOCX", "PDF"], label="Seleccionar formato de archivo", value="PDF")
-            load_button = gr.Button("Cargar Archivos", interactive=True)
-
-        with gr.Column(scale=3):
-            gr.Markdown("### Resultados")
-            with gr.Row():
-                with gr.Column(scale=1):
-                    with gr.Row():
-                        with gr.Column(scale=4):
-                            gr.Row(visible=False)
-                        with gr.Column(scale=1):
-                            show_btn = gr.Button("Ver Detalle")
-                        with gr.Column(scale=1):
-                            transcribe_button = gr.Button("Transcribir", interactive=True, scale=1, min_width=300)
-
-            #result_output = gr.Markdown(value="| Nombre | Estado | Tiempo (s) | Descargar |\n| --- | --- | --- | --- |\n", elem_id="result_table", elem_classes="table")  # Usando Markdown para mostrar la tabla y asignando un ID
-            result_output = gr.Markdown(
-                value=load_existing_data(),  # Mostrar los datos al iniciar
-                elem_id="result_table",
-                elem_classes="table"
-            )            
-        
-        with Modal(visible=False, elem_classes="modal-status") as modal:
-            with gr.Row():
-                with gr.Column(scale=1):
-                    gr.Markdown("### Detalle Proceso")
-                    modal_output = gr.Textbox(show_label=False)
-
-    # Estilos personalizados para que la tabla ocupe el 100% del ancho
-    demo.css = """
-        #result_table {
-        width: 100%;
-        overflow-x: auto;
-        font-family: Arial, sans-serif;
-        border-collapse: collapse;
-    }
-    .modal-status .modal-block {
-        width: 20%;
-        float: right;
-    }
-    #result_table table {
-        width: 100%;
-        table-layout: fixed;
-    }
-    #result_table table a {
-        text-decoration: none !important;
-    }
-    #result_table th {
-        background-color: #333;
-        color: #FFF;
-        padding: 12px;
-        text-align: center;
-        border: 1px solid var(--block-border-color) !important;
-    }
-    #result_table th:first-child {
-        width: 50%;
-    }
-    #result_table td {
-        padding: 10px;
-        border: 1px solid var(--block-border-color) !important;
-        text-align: center; /* Centrar contenido */
-    }
-    #result_table td:nth-child(1) {
-        text-align: left; /* Alinear texto de la primera columna */
-        width: 50%;
-    }
-    #result_table tr:nth-child(even) {
-        background-color: #2e2e2e;
-    }
-    #result_table tr:nth-child(odd) {
-        background-color: #1e1e1e;
-    }
-    #result_table tr:hover {
-        background-color: #444;
-        cursor: pointer;
-    }
+def build_interface():
     """
+    Construye la interfaz de Gradio.
 
-    # Configuración de botones
-    show_btn.click(lambda: Modal(visible=True), None, modal)
-
-    load_button.click(
-        load_files,  # Llama a `load_files` para cargar nuevos archivos
-        inputs=audio_input,
-        outputs=result_output,  # Actualiza la tabla con TODOS los datos
-        show_progress=False
-    )
-
-    auth_button.click(
-        lambda: (webbrowser.open("https://127.0.0.1:5000/login"), update_user_status())[1],  # Abre el navegador y actualiza estado
-        inputs=None,
-        outputs=user_status  # Muestra el estado actualizado en la interfaz
-    )
-
-    logout_button.click(
-        lambda: (webbrowser.open("https://127.0.0.1:5000/logout"), update_user_status())[1],  # Abre el navegador y actualiza estado
-        inputs=None,
-        outputs=user_status  # Muestra el estado actualizado en la interfaz
-    )
-
-    transcribe_button.click(
-        transcribe_files,
-        inputs=[audio_input, format_selector],
-        outputs=[result_output, modal_output]
-    )
+    Se llama solo al arrancar la aplicación: los procesos que crean los pools con "spawn" vuelven a
+    importar este módulo y no deben construir la interfaz.
+    """
+    with gr.Blocks() as demo:
+        with gr.Sidebar():
+            gr.Markdown("### Menú")
+            auth_button = gr.Button("Iniciar sesión con Google", size="sm")
+            logout_button = gr.Button("Cerrar sesión", size="sm")
+            user_status = gr.Textbox(label="Estado del usuario", interactive=False)
+
+        gr.Markdown("## Transcriptor de Audio a Texto")
+
+
+        with gr.Row():
+            with gr.Column(scale=1):
+                gr.Markdown("### Archivos")
+                audio_input = gr.File(file_count="multiple", label="Seleccionar archivos de audio")
+                with gr.Blocks():
+                    format_selector = gr.Dropdown(choices=list(EXPORT_FORMATS), label="Seleccionar formato de archivo", value="PDF")
+                    language_selector = gr.Dropdown(choices=list(LANGUAGE_CHOICES), label="Idioma del audio", value=LANGUAGE,
+                                                    info="Con \"auto\" se detecta en cada archivo")
+                    fast_mode = gr.Checkbox(label=f"Modo rápido ({CPU_FALLBACK_MODEL})", value=False, visible=bool(CPU_FALLBACK_MODEL))
+                load_button = gr.Button("Cargar Archivos", interactive=True)
+
+            with gr.Column(scale=3):
+                gr.Markdown("### Resultados")
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        with gr.Row():
+                            with gr.Column(scale=4):
+                                gr.Row(visible=False)
+                            with gr.Column(scale=1):
+                                show_btn = gr.Button("Ver Detalle")
+                            with gr.Column(scale=1):
+                                transcribe_button = gr.Button("Transcribir", interactive=True, scale=1, min_width=300)
+
+                with gr.Row():
+                    status_filter = gr.Dropdown(choices=STATUS_FILTERS, value="Todos", label="Estado")
+                    since_filter = gr.DateTime(label="Desde", include_time=False, type="timestamp")
+                    until_filter = gr.DateTime(label="Hasta", include_time=False, type="timestamp")
+
+                #result_output = gr.Markdown(value="| Nombre | Estado | Tiempo (s) | Descargar |\n| --- | --- | --- | --- |\n", elem_id="result_table", elem_classes="table")  # Usando Markdown para mostrar la tabla y asignando un ID
+                result_output = gr.Markdown(
+                    elem_id="result_table",  # Se llena al abrir la página (ver demo.load)
+                    elem_classes="table"
+                )
+
+                with gr.Row():
+                    prev_button = gr.Button("◀ Anterior", size="sm")
+                    page_input = gr.Number(value=1, precision=0, minimum=1, show_label=False, container=False)
+                    page_label = gr.Markdown()
+                    next_button = gr.Button("Siguiente ▶", size="sm")
+
+                gr.Markdown("### Buscar en las transcripciones")
+                with gr.Row():
+                    search_input = gr.Textbox(show_label=False, placeholder='Palabras o "frase exacta"', scale=4)
+                    search_button = gr.Button("Buscar", scale=1)
+                search_output = gr.Markdown()
+
+                # Tabla de la página visible de esta sesión, para enviar solo los cambios
+                table_state = gr.State(None)
+                refresh_timer = gr.Timer(RESULTS_REFRESH_SECONDS)
+        
+            with Modal(visible=False, elem_classes="modal-status") as modal:
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        gr.Markdown("### Detalle Proceso")
+                        modal_output = gr.Textbox(show_label=False, lines=15, max_lines=15, autoscroll=True)
+
+        # Estilos personalizados para que la tabla ocupe el 100% del ancho
+        demo.css = """
+            #result_table {
+            width: 100%;
+            overflow-x: auto;
+            font-family: Arial, sans-serif;
+            border-collapse: collapse;
+        }
+        .modal-status .modal-block {
+            width: 20%;
+            float: right;
+        }
+        #result_table table {
+            width: 100%;
+            table-layout: fixed;
+        }
+        #result_table table a {
+            text-decoration: none !important;
+        }
+        #result_table th {
+            background-color: #333;
+            color: #FFF;
+            padding: 12px;
+            text-align: center;
+            border: 1px solid var(--block-border-color) !important;
+        }
+        #result_table th:first-child {
+            width: 50%;
+        }
+        #result_table td {
+            padding: 10px;
+            border: 1px solid var(--block-border-color) !important;
+            text-align: center; /* Centrar contenido */
+        }
+        #result_table td:nth-child(1) {
+            text-align: left; /* Alinear texto de la primera columna */
+            width: 50%;
+        }
+        #result_table tr:nth-child(even) {
+            background-color: #2e2e2e;
+        }
+        #result_table tr:nth-child(odd) {
+            background-color: #1e1e1e;
+        }
+        #result_table tr:hover {
+            background-color: #444;
+            cursor: pointer;
+        }
+        """
+
+        # Configuración de botones
+        show_btn.click(lambda: Modal(visible=True), None, modal)
+
+        # Controles de la tabla: página, filtros y refresco periódico
+        page_inputs = [page_input, status_filter, since_filter, until_filter, table_state]
+        page_outputs = [result_output, page_input, page_label, table_state]
+
+        load_button.click(
+            load_files,  # Llama a `load_files` para cargar nuevos archivos
+            inputs=[audio_input] + page_inputs,
+            outputs=page_outputs,  # Muestra la primera página con los archivos nuevos
+            show_progress=False
+        )
+
+        for control in (status_filter, since_filter, until_filter):
+            # Al cambiar un filtro se vuelve a la primera página
+            control.change(lambda *args: load_existing_data(1, *args[1:]), inputs=page_inputs, outputs=page_outputs,
+                           show_progress=False)
+        page_input.submit(load_existing_data, inputs=page_inputs, outputs=page_outputs, show_progress=False)
+        prev_button.click(lambda page, *args: load_existing_data((page or 1) - 1, *args), inputs=page_inputs,
+                          outputs=page_outputs, show_progress=False)
+        next_button.click(lambda page, *args: load_existing_data((page or 1) + 1, *args), inputs=page_inputs,
+                          outputs=page_outputs, show_progress=False)
+        refresh_timer.tick(poll_existing_data, inputs=page_inputs, outputs=page_outputs, show_progress=False)
+
+        auth_button.click(
+            lambda: (webbrowser.open("https://127.0.0.1:5000/login"), update_user_status())[1],  # Abre el navegador y actualiza estado
+            inputs=None,
+            outputs=user_status  # Muestra el estado actualizado en la interfaz
+        )
+
+        logout_button.click(
+            lambda: (webbrowser.open("https://127.0.0.1:5000/logout"), update_user_status())[1],  # Abre el navegador y actualiza estado
+            inputs=None,
+            outputs=user_status  # Muestra el estado actualizado en la interfaz
+        )
+
+        # Actualiza el estado del usuario y la tabla al abrir la página (no al construir la interfaz)
+        demo.load(update_user_status, inputs=None, outputs=user_status)
+        demo.load(load_existing_data, inputs=page_inputs, outputs=page_outputs, show_progress=False)
+
+        search_button.click(search_text, inputs=search_input, outputs=search_output)
+        search_input.submit(search_text, inputs=search_input, outputs=search_output)
+
+        transcribe_button.click(
+            transcribe_files,
+            inputs=[audio_input, format_selector, fast_mode, language_selector],
+            outputs=modal_output  # La tabla se actualiza con el refresco periódico
+        )
+
+    return demo
 
 if __name__ == "__main__":
+    init_store()
+    demo = build_interface()
     flask_process = Process(target=run_flask)
     flask_process.start()
+    # Procesar la cola de trabajos (de la interfaz y de la API), empezando por los que quedaron a medias;
+    # no espera a la precarga: el primer trabajo carga su modelo si todavía no está en memoria
+    start_workers()
+    # Cargar modelos y exportadores en segundo plano mientras arranca la interfaz
+    threading.Thread(target=warm_up, daemon=True).start()
     # Esperar a que Flask esté disponible
-    time.sleep(5)
-    demo.launch(share=True)
+    wait_for_flask()
+    # Los documentos de los trabajos enviados por la API también se descargan desde la tabla
+    demo.launch(share=True, prevent_thread_lock=True, allowed_paths=[UPLOAD_DIR])
+    print(f"Interfaz disponible en {time.perf_counter() - startup_time:.1f} s desde el arranque")
+    try:
+        demo.block_thread()
+    finally:
+        # Detener los procesos de transcripción en paralelo y liberar sus modelos
+        shutdown_pools()
@@ -0,0 +1,188 @@
+# src/api/jobs_api.py
+# API REST para enviar audios a la cola, consultar su estado y descargar el resultado
+import os
+import sqlite3
+
+from flask import Blueprint, jsonify, request, send_file, url_for
+from werkzeug.utils import secure_filename
+
+from config.settings import WHISPER_MODEL, CPU_FALLBACK_MODEL, LANGUAGE, LANGUAGE_CHOICES, UPLOAD_DIR
+from src.pipeline.job_queue import QueueFullError, queue_position, submit_job
+from src.storage.job_store import (
+    QUEUED_STATUS, count_jobs, get_job, get_spans, list_jobs, search_transcripts, stage_breakdown
+)
+from src.storage.transcription_cache import get_cached_segments
+from utils.file_handler import EXPORT_FORMATS, save_transcription
+
+jobs_api = Blueprint("jobs_api", __name__, url_prefix="/api")
+
+# Campos del registro que se devuelven en las respuestas
+_PUBLIC_FIELDS = ("file_name", "status", "time", "file_format", "model", "language", "detected_language",
+                  "priority", "duration", "submitted_at", "updated_at")
+# Modelos que se pueden pedir por trabajo: cada nombre nuevo se cargaría en el pool y expulsaría a los residentes
+_MODEL_CHOICES = tuple(model for model in (WHISPER_MODEL, CPU_FALLBACK_MODEL) if model)
+_SPAN_FIELDS = ("stage", "started_at", "seconds", "audio_seconds", "peak_rss_mb", "torch_threads", "detail")
+
+
+def _job_json(job):
+    data = {field: job.get(field) for field in _PUBLIC_FIELDS}
+    data["status_url"] = url_for("jobs_api.job_status", file_name=job["file_name"])
+    if job["status"] == QUEUED_STATUS:
+        data["queue_position"] = queue_position(job["file_name"])
+    if job["status"] == "Finalizado" and job.get("output_path"):
+        data["result_url"] = url_for("jobs_api.job_result", file_name=job["file_name"])
+    return data
+
+
+def _error(message, status_code, **extra):
+    return jsonify({"error": message, **extra}), status_code
+
+
+def _is_stale(path, document_path):
+    """Indica si hay que generar path: no existe o es anterior al documento (el trabajo se volvió a procesar)."""
+    if not os.path.exists(path):
+        return True
+    return os.path.exists(document_path) and os.path.getmtime(path) < os.path.getmtime(document_path)
+
+
+@jobs_api.route("/jobs", methods=["POST"])
+def submit():
+    """
+    Recibe un archivo (multipart, campo "file") y lo pone en la cola; responde 202 con el trabajo.
+
+    Campos opcionales: format, model (WHISPER_MODEL o CPU_FALLBACK_MODEL), priority y language
+    (código de idioma o "auto").
+    """
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return _error("Falta el archivo (campo 'file')", 400)
+    file_name = secure_filename(upload.filename)
+    if not file_name:
+        return _error("Nombre de archivo no válido", 400)
+
+    file_format = request.form.get("format", "PDF").upper()
+    if file_format not in EXPORT_FORMATS:
+        return _error(f"Formato no soportado: {file_format}", 400, formats=list(EXPORT_FORMATS))
+    model = request.form.get("model", WHISPER_MODEL)
+    if model not in _MODEL_CHOICES:
+        return _error(f"Modelo no disponible: {model}", 400, models=list(_MODEL_CHOICES))
+    language = request.form.get("language", LANGUAGE).lower()
+    if language not in LANGUAGE_CHOICES:
+        return _error(f"Idioma no soportado: {language}", 400, languages=list(LANGUAGE_CHOICES))
+    priority = request.form.get("priority")
+    if priority is not None:
+        try:
+            priority = int(priority)
+        except ValueError:
+            return _error("La prioridad debe ser un número entero", 400)
+
+    # Solo se vuelven a encolar los trabajos sin empezar o que terminaron con error
+    existing = get_job(file_name)
+    if existing and existing["status"] != "Pendiente" and not existing["status"].startswith("Error"):
+        return _error("Ya existe un trabajo con ese nombre", 409, job=_job_json(existing))
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    file_path = os.path.abspath(os.path.join(UPLOAD_DIR, file_name))
+    upload.save(file_path)
+    try:
+        submit_job(file_name, file_path, file_format, model=model, priority=priority, language=language)
+    except QueueFullError as e:
+        if existing is None:
+            os.remove(file_path)
+        response, status_code = _error(str(e), 429)
+        response.headers["Retry-After"] = "60"
+        return response, status_code
+
+    response = jsonify(_job_json(get_job(file_name)))
+    response.headers["Location"] = url_for("jobs_api.job_status", file_name=file_name)
+    return response, 202
+
+
+@jobs_api.route("/jobs", methods=["GET"])
+def jobs():
+    """
+    Lista paginada de trabajos, del más reciente al más antiguo.
+
+    Parámetros: page, page_size, status (estado exacto, "Error" o "En curso") y since/until
+    (timestamps de la fecha de envío).
+    """
+    page = max(request.args.get("page", 1, type=int), 1)
+    page_size = min(max(request.args.get("page_size", 50, type=int), 1), 500)
+    filters = {
+        "status": request.args.get("status"),
+        "since": request.args.get("since", type=float),
+        "until": request.args.get("until", type=float),
+    }
+    return jsonify({
+        "jobs": [_job_json(job) for job in list_jobs(page, page_size, newest_first=True, **filters)],
+        "page": page,
+        "page_size": page_size,
+        "total": count_jobs(**filters),
+    })
+
+
+@jobs_api.route("/jobs/<file_name>", methods=["GET"])
+def job_status(file_name):
+    """
+    Estado de un trabajo, con su posición en la cola, el tiempo de cada etapa y, en "spans", cada medición
+    de la última ejecución en orden cronológico (p. ej. la inferencia de cada fragmento).
+    """
+    job = get_job(file_name)
+    if job is None:
+        return _error("Trabajo no encontrado", 404)
+    data = _job_json(job)
+    data["stages"] = stage_breakdown([file_name]).get(file_name, {})
+    data["spans"] = [{field: span[field] for field in _SPAN_FIELDS} for span in get_spans(file_name)]
+    return jsonify(data)
+
+
+@jobs_api.route("/jobs/<file_name>/result", methods=["GET"])
+def job_result(file_name):
+    """
+    Descarga el documento generado.
+
+    Con el parámetro format se obtiene en otro formato, generado a partir de la transcripción en caché
+    sin volver a transcribir.
+    """
+    job = get_job(file_name)
+    if job is None:
+        return _error("Trabajo no encontrado", 404)
+    if job["status"] != "Finalizado":
+        return _error("El trabajo todavía no ha terminado", 409, status=job["status"])
+    output_path = job.get("output_path")
+    file_format = request.args.get("format", job.get("file_format") or "").upper()
+    if output_path and file_format != (job.get("file_format") or "").upper():
+        if file_format not in EXPORT_FORMATS:
+            return _error(f"Formato no soportado: {file_format}", 400, formats=list(EXPORT_FORMATS))
+        converted_path = f"{os.path.splitext(output_path)[0]}.{file_format.lower()}"
+        if _is_stale(converted_path, output_path):
+            transcript = get_cached_segments(job["audio_key"]) if job.get("audio_key") else None
+            if transcript is None:
+                return _error("La transcripción ya no está en caché", 410)
+            save_transcription(transcript, converted_path, file_format)
+        output_path = converted_path
+    if not output_path or not os.path.exists(output_path):
+        return _error("El documento ya no está disponible", 410)
+    return send_file(os.path.abspath(output_path), as_attachment=True)
+
+
+@jobs_api.route("/search", methods=["GET"])
+def search():
+    """
+    Busca un texto en las transcripciones terminadas.
+
+    Parámetros: q (palabras o "frases entre comillas"), limit, offset y file_name (solo en ese trabajo).
+    Cada resultado incluye el trabajo, los tiempos del segmento y un fragmento con los términos entre ** **.
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return _error("Falta el texto a buscar (parámetro 'q')", 400)
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 200)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    try:
+        results = search_transcripts(query, limit, offset, file_name=request.args.get("file_name"))
+    except sqlite3.OperationalError as e:
+        return _error(f"Consulta no válida: {e}", 400)
+    for result in results:
+        result["status_url"] = url_for("jobs_api.job_status", file_name=result["file_name"])
+    return jsonify({"query": query, "results": results, "limit": limit, "offset": offset})
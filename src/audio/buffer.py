@@ -0,0 +1,58 @@
+# src/audio/buffer.py
+import struct
+
+import numpy as np
+
+
+def _find_data_chunk(f):
+    """Recorre los chunks RIFF y devuelve (formato, offset y tamaño del chunk de datos)."""
+    riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+    if riff != b"RIFF" or wave_id != b"WAVE":
+        raise ValueError("El archivo no es un WAV válido")
+
+    fmt = None
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            raise ValueError("El WAV no contiene datos de audio")
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+            f.seek(chunk_size - 16 + (chunk_size & 1), 1)
+        elif chunk_id == b"data":
+            return fmt, f.tell(), chunk_size
+        else:
+            f.seek(chunk_size + (chunk_size & 1), 1)  # Los chunks se alinean a 2 bytes
+
+
+def open_wav(wav_path):
+    """
+    Mapea en memoria las muestras de un WAV PCM de 16 bits sin leerlo ni copiarlo.
+
+    :param wav_path: Ruta del archivo WAV (como el que genera preprocess_audio).
+    :return: Tupla (np.memmap int16 de solo lectura, frecuencia de muestreo).
+    """
+    with open(wav_path, "rb") as f:
+        fmt, data_offset, data_size = _find_data_chunk(f)
+        file_size = f.seek(0, 2)
+
+    if fmt is None:
+        raise ValueError("El WAV no contiene el chunk de formato")
+    audio_format, channels, sample_rate, _, _, bits_per_sample = fmt
+    if audio_format != 1 or bits_per_sample != 16:
+        raise ValueError("Se esperaba audio PCM de 16 bits")
+    if channels != 1:
+        raise ValueError("Se esperaba audio mono; convierte primero con preprocess_audio")
+
+    # ffmpeg deja el tamaño a 0 o incompleto cuando escribe en un pipe
+    data_size = min(data_size or file_size, file_size - data_offset)
+    n_samples = data_size // 2
+    if n_samples == 0:
+        return np.zeros(0, dtype=np.int16), sample_rate
+    samples = np.memmap(wav_path, dtype="<i2", mode="r", offset=data_offset, shape=(n_samples,))
+    return samples, sample_rate
+
+
+def to_float32(samples):
+    """Convierte muestras int16 al formato float32 en [-1, 1] que espera Whisper."""
+    return np.asarray(samples, dtype=np.float32) / 32768.0
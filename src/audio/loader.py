@@ -1,9 +1,113 @@
 # src/audio/loader.py
 import os
-from pydub import AudioSegment
+import subprocess
 
-def load_audio(audio_path):
+import numpy as np
+
+from config.settings import AUDIO_BLOCK_SECONDS
+from src.audio.preprocessor import probe_duration
+
+
+def pcm_args(sample_rate=16000, channels=1):
+    """Parámetros de salida con los que ffmpeg escribe el audio como PCM s16le crudo (los de stream_audio)."""
+    return [
+        "-vn",  # Ignorar video
+        "-ac", str(channels),  # Mezclar a este número de canales
+        "-ar", str(sample_rate),  # Remuestrear
+        "-sample_fmt", "s16",
+        "-f", "s16le",
+    ]
+
+
+def _pcm_command(audio_path, sample_rate, channels):
+    """Comando de ffmpeg que escribe el audio como PCM s16le crudo en stdout."""
+    return ["ffmpeg", "-v", "error", "-nostdin", "-i", audio_path, *pcm_args(sample_rate, channels), "-"]
+
+
+def _read_into(stream, buffer):
+    """Llena buffer desde stream; devuelve los bytes leídos (menos que su tamaño solo al final)."""
+    view = memoryview(buffer).cast("B")
+    filled = 0
+    while filled < len(view):
+        n = stream.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+def stream_audio(audio_path, sample_rate=16000, channels=1, block_seconds=AUDIO_BLOCK_SECONDS):
+    """
+    Decodifica un archivo con ffmpeg y entrega sus muestras por bloques de tamaño fijo.
+
+    La memoria usada no depende de la duración del archivo: todos los bloques se leen sobre el mismo
+    array preasignado, que se sobrescribe en la siguiente iteración (copia el bloque si lo necesitas después).
+
+    :param audio_path: Ruta del archivo de audio o video.
+    :param sample_rate: Frecuencia de muestreo de salida en Hz.
+    :param channels: Canales de salida (1 = mezcla a mono).
+    :param block_seconds: Duración de cada bloque en segundos.
+    :return: Iterador de arrays int16 de forma (muestras,) en mono o (muestras, canales); el último puede ser más corto.
+    """
     if not os.path.exists(audio_path):
         raise FileNotFoundError("Archivo de audio no encontrado")
-    audio = AudioSegment.from_file(audio_path)
-    return audio
+
+    frames = max(int(block_seconds * sample_rate), 1)
+    block = np.empty((frames, channels), dtype="<i2")
+    frame_bytes = 2 * channels
+
+    process = subprocess.Popen(_pcm_command(audio_path, sample_rate, channels),
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            n_frames = _read_into(process.stdout, block) // frame_bytes
+            if n_frames:
+                samples = block[:n_frames]
+                yield samples[:, 0] if channels == 1 else samples
+            if n_frames < frames:
+                break
+        process.stdout.close()
+        stderr = process.stderr.read().decode("utf-8", errors="replace")
+        if process.wait() != 0:
+            raise RuntimeError(f"Error al decodificar el audio: {stderr.strip()}")
+    finally:
+        # Si el consumidor abandona la iteración, no dejar ffmpeg bloqueado escribiendo en el pipe
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def load_audio(audio_path, sample_rate=16000, channels=1, block_seconds=AUDIO_BLOCK_SECONDS):
+    """
+    Carga un archivo de audio o video completo como muestras PCM int16.
+
+    El array de salida se preasigna con la duración que indica ffprobe y se rellena por bloques,
+    sin copias intermedias del audio decodificado.
+
+    :param audio_path: Ruta del archivo de audio o video.
+    :param sample_rate: Frecuencia de muestreo de salida en Hz.
+    :param channels: Canales de salida (1 = mezcla a mono).
+    :return: Tupla (array int16 de forma (muestras,) en mono o (muestras, canales), frecuencia de muestreo).
+    """
+    if not os.path.exists(audio_path):
+        raise FileNotFoundError("Archivo de audio no encontrado")
+
+    duration = probe_duration(audio_path) or 0.0
+    # Margen de un bloque: la duración del contenedor puede quedarse corta
+    capacity = int((duration + block_seconds) * sample_rate)
+    audio = np.empty((capacity, channels), dtype="<i2")
+    filled = 0
+    for block in stream_audio(audio_path, sample_rate, channels, block_seconds):
+        if filled + len(block) > len(audio):
+            grown = np.empty((max(len(audio) * 2, filled + len(block)), channels), dtype="<i2")
+            grown[:filled] = audio[:filled]
+            audio = grown
+        audio[filled:filled + len(block)] = block.reshape(len(block), channels)
+        filled += len(block)
+
+    audio = audio[:filled]
+    if channels == 1:
+        audio = audio[:, 0]
+    return np.ascontiguousarray(audio), sample_rate
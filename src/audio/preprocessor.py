@@ -1,22 +1,30 @@
 import os
 import subprocess
 
-def preprocess_audio(video_path):
+# Parámetros de ffmpeg de la conversión a WAV; forman parte de la clave de la caché de preprocesado
+WAV_CONVERSION_ARGS = [
+    "-vn",  # Ignorar video
+    "-ac", "1",  # Forzar audio mono
+    "-ar", "16000",  # Establecer tasa de muestreo
+    "-sample_fmt", "s16",  # Asegurar formato de muestra
+]
+
+
+def preprocess_audio(video_path, output_path=None):
     """
     Convierte un archivo de video a formato de audio WAV robusto.
     
     :param video_path: Ruta del archivo de video.
+    :param output_path: Ruta del WAV a generar (por defecto, junto al archivo original).
     :return: Ruta del archivo de audio en formato WAV.
     """
     base_name = os.path.splitext(video_path)[0]
-    wav_output_path = f"{base_name}.wav"
+    wav_output_path = output_path or f"{base_name}.wav"
     
     command = [
         "ffmpeg", "-y", "-i", video_path,
-        "-vn",  # Ignorar video
-        "-ac", "1",  # Forzar audio mono
-        "-ar", "16000",  # Establecer tasa de muestreo
-        "-sample_fmt", "s16",  # Asegurar formato de muestra
+        *WAV_CONVERSION_ARGS,
+        "-f", "wav",
         wav_output_path
     ]
 
@@ -29,20 +37,46 @@ def preprocess_audio(video_path):
 
 
 
+def probe_duration(file_path):
+    """
+    Obtiene la duración de un archivo de audio o video con ffprobe, sin decodificarlo.
+
+    :param file_path: Ruta del archivo.
+    :return: Duración en segundos, o None si no se pudo leer.
+    """
+    command = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        file_path
+    ]
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
 def split_audio(audio_path, segment_duration=1800):
     """
     Divide un archivo de audio en segmentos robustos.
     
     :param audio_path: Ruta del archivo de audio original (en formato WAV).
     :param segment_duration: Duración de cada segmento en segundos (por defecto, 30 minutos).
-    :return: Lista de rutas de los segmentos generados.
+    :return: Lista ordenada de rutas de los segmentos generados; el segmento i empieza en
+             i * segment_duration segundos del audio original.
     """
     base_name = os.path.splitext(audio_path)[0]
     output_dir = f"{base_name}_segments"
     os.makedirs(output_dir, exist_ok=True)
 
+    # Borrar los segmentos de una división anterior (podía tener otra duración o más segmentos)
+    for name in os.listdir(output_dir):
+        if name.startswith("segment_") and name.endswith(".wav"):
+            os.remove(os.path.join(output_dir, name))
+
     command = [
-        "ffmpeg", "-i", audio_path,
+        "ffmpeg", "-y", "-i", audio_path,
         "-f", "segment",
         "-segment_time", str(segment_duration),
         "-c", "pcm_s16le",  # Usar un formato robusto
@@ -50,10 +84,11 @@ def split_audio(audio_path, segment_duration=1800):
     ]
 
     try:
-        subprocess.run(command, check=True, text=True)
-        segment_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) if f.endswith(".wav")]
-        return segment_files
+        subprocess.run(command, check=True, capture_output=True, text=True)
+        # os.listdir no garantiza el orden: se ordena por el índice numérico del nombre
+        names = [f for f in os.listdir(output_dir) if f.startswith("segment_") and f.endswith(".wav")]
+        names.sort(key=lambda f: int(f[len("segment_"):-len(".wav")]))
+        return [os.path.join(output_dir, f) for f in names]
     except subprocess.CalledProcessError as e:
         print(f"Error al dividir el audio: {e.stderr}")
         return []
-
@@ -0,0 +1,111 @@
+# src/audio/vad.py
+import numpy as np
+
+from config.settings import VAD_THRESHOLD_DB, VAD_MIN_SILENCE, VAD_MAX_CHUNK, VAD_PADDING
+
+# Duración de la ventana de entrada de Whisper en segundos
+WINDOW_SECONDS = 30
+
+
+def frame_energy_db(samples, frame_length, block_frames=8192):
+    """
+    Energía RMS de cada trama en dBFS (0 dB = escala completa).
+
+    Se procesa por bloques para no copiar el audio completo en memoria.
+    """
+    n_frames = int(np.ceil(len(samples) / frame_length))
+    energy = np.empty(n_frames, dtype=np.float32)
+    for first in range(0, n_frames, block_frames):
+        last = min(first + block_frames, n_frames)
+        block = np.zeros((last - first) * frame_length, dtype=np.float32)
+        data = samples[first * frame_length:last * frame_length]
+        block[:len(data)] = data
+        frames = block.reshape(last - first, frame_length) / 32768.0
+        energy[first:last] = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    return energy
+
+
+def _split_long_region(energy, start, end, max_frames):
+    """Corta una región de voz demasiado larga por la trama más silenciosa cerca del límite."""
+    regions = []
+    while end - start > max_frames:
+        # Buscar la pausa en la segunda mitad de la ventana para no crear fragmentos muy cortos
+        search_start = start + max_frames // 2
+        search_end = start + max_frames
+        cut = search_start + int(np.argmin(energy[search_start:search_end]))
+        regions.append((start, cut))
+        start = cut
+    regions.append((start, end))
+    return regions
+
+
+def detect_speech_chunks(samples, sample_rate=16000, frame_ms=30, threshold_db=VAD_THRESHOLD_DB,
+                         min_silence=VAD_MIN_SILENCE, max_chunk=VAD_MAX_CHUNK, padding=VAD_PADDING):
+    """
+    Detecta los tramos con voz de un audio usando la energía por trama.
+
+    Los silencios más largos que min_silence se descartan; los más cortos se mantienen dentro del tramo.
+    Los tramos que superan max_chunk se cortan en la pausa más silenciosa cercana al límite.
+
+    :param samples: Muestras PCM mono (int16).
+    :param sample_rate: Frecuencia de muestreo en Hz.
+    :param frame_ms: Duración de cada trama de análisis en milisegundos.
+    :param threshold_db: Energía (dBFS) por debajo de la cual una trama se considera silencio.
+    :param min_silence: Duración mínima en segundos de un silencio para descartarlo.
+    :param max_chunk: Duración máxima en segundos de cada fragmento.
+    :param padding: Margen en segundos que se conserva antes y después de cada tramo.
+    :return: Lista de tuplas (muestra_inicial, muestra_final).
+    """
+    if len(samples) == 0:
+        return []
+
+    frame_length = int(sample_rate * frame_ms / 1000)
+    energy = frame_energy_db(samples, frame_length)
+    voiced = energy > threshold_db
+    if not voiced.any():
+        return []
+
+    # Bordes de los tramos de voz: +1 donde empieza la voz, -1 donde termina
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # Unir los tramos separados por silencios cortos
+    min_silence_frames = int(np.ceil(min_silence * 1000 / frame_ms))
+    regions = [[starts[0], ends[0]]]
+    for start, end in zip(starts[1:], ends[1:]):
+        if start - regions[-1][1] < min_silence_frames:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    max_frames = max(int(max_chunk * 1000 / frame_ms), 1)
+    padding_frames = int(padding * 1000 / frame_ms)
+    n_frames = len(energy)
+
+    chunks = []
+    for start, end in regions:
+        start = max(start - padding_frames, 0)
+        end = min(end + padding_frames, n_frames)
+        if chunks:
+            start = max(start, chunks[-1][1])  # Sin solaparse con el tramo anterior
+        chunks.extend(_split_long_region(energy, start, end, max_frames))
+
+    total = len(samples)
+    return [(start * frame_length, min(end * frame_length, total)) for start, end in chunks if end > start]
+
+
+def split_windows(audio, offset=0.0, sample_rate=16000):
+    """
+    Divide un fragmento en ventanas de 30 s como máximo, el tamaño de entrada de Whisper.
+
+    :param audio: Muestras mono.
+    :param offset: Segundo del archivo original en que empieza el fragmento.
+    :param sample_rate: Frecuencia de muestreo en Hz.
+    :return: Lista de tuplas (muestras, offset) con el offset de cada ventana.
+    """
+    window = WINDOW_SECONDS * sample_rate
+    return [
+        (audio[start:start + window], offset + start / sample_rate)
+        for start in range(0, len(audio), window)
+    ]
@@ -1,9 +1,11 @@
 # src/auth/google_auth.py
-from flask import Flask, session, redirect, url_for
+from flask import Flask, Response, session, redirect, url_for
 from flask_session import Session
 from authlib.integrations.flask_client import OAuth
 import os
 from dotenv import load_dotenv
+from src.api.jobs_api import jobs_api
+from src.pipeline.metrics import render_prometheus
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Cargar variables de entorno desde .env
@@ -15,6 +17,9 @@ app = Flask(__name__)
 # SECRET_KEY para la sesión de Flask
 app.secret_key = os.getenv("SECRET_KEY", "dev-secret-change-me")
 
+# API REST de la cola de trabajos (/api/jobs)
+app.register_blueprint(jobs_api)
+
 oauth = OAuth(app)
 
 app.config["SESSION_TYPE"] = "filesystem"
@@ -60,3 +65,8 @@ def auth_callback():
 def logout():
     session.pop('user', None)  # Elimina al usuario de la sesión
     return "Cerraste sesión correctamente."
+
+@app.route('/metrics')
+def metrics():
+    # Tiempos por etapa, tiempo real y memoria de los trabajos, leídos del registro compartido
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,124 @@
+# src/diarization/pyannote_diarizer.py
+import heapq
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from config.settings import DIARIZATION_MODEL
+from src.pipeline.metrics import span
+
+load_dotenv()
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+# Un solo hilo: el pipeline de PyAnnote no admite llamadas simultáneas
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarization")
+
+
+def get_pipeline():
+    """Carga el pipeline de diarización la primera vez y lo reutiliza en los siguientes trabajos."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            import torch
+            from pyannote.audio import Pipeline
+
+            _pipeline = Pipeline.from_pretrained(DIARIZATION_MODEL, use_auth_token=os.getenv("HUGGINGFACE_TOKEN"))
+            if _pipeline is None:
+                raise RuntimeError(f"No se pudo cargar {DIARIZATION_MODEL}; revisa HUGGINGFACE_TOKEN")
+            if torch.cuda.is_available():
+                _pipeline.to(torch.device("cuda"))
+        return _pipeline
+
+
+def diarize(audio, uri=None):
+    """
+    Detecta los turnos de palabra de cada hablante.
+
+    PyAnnote lee el archivo por su cuenta, así que no se hace una copia en float32 de todo el audio
+    además del WAV mapeado en memoria que usa la transcripción.
+
+    :param audio: Ruta del WAV o el WAV ya abierto en modo binario.
+    :param uri: Nombre del audio para PyAnnote (por defecto, el del archivo).
+    :return: Lista de tuplas (inicio, fin, hablante) ordenada por inicio; los hablantes se
+             nombran "Hablante 1", "Hablante 2"... por orden de aparición.
+    """
+    if uri is None:
+        uri = os.path.basename(audio if isinstance(audio, str) else audio.name)
+    annotation = get_pipeline()({"uri": uri, "audio": audio})
+
+    names = {}
+    turns = []
+    for turn, _, label in annotation.itertracks(yield_label=True):
+        if label not in names:
+            names[label] = f"Hablante {len(names) + 1}"
+        turns.append((turn.start, turn.end, names[label]))
+    turns.sort()
+    return turns
+
+
+def _diarize_measured(audio, audio_seconds, spans):
+    if spans is None:
+        return diarize(audio)
+    with span("diarization", spans, audio_seconds=audio_seconds):
+        return diarize(audio)
+
+
+def diarize_async(wav_path, audio_seconds=None, spans=None):
+    """
+    Lanza la diarización en segundo plano para que corra a la vez que la transcripción.
+
+    El WAV se abre antes de encolarla: si la caché de preprocesado lo expulsa mientras espera su turno,
+    el archivo abierto sigue siendo legible (en Linux) hasta que termina.
+
+    :param wav_path: Ruta del WAV del archivo (el de la caché de preprocesado).
+    :param audio_seconds: Duración del audio, para la medición.
+    :param spans: Lista opcional en la que se añade la medición de la diarización al terminar.
+    """
+    audio = open(wav_path, "rb")
+    try:
+        future = _executor.submit(_diarize_measured, audio, audio_seconds, spans)
+    except Exception:
+        audio.close()
+        raise
+    future.add_done_callback(lambda _: audio.close())
+    return future
+
+
+def assign_speakers(segments, turns):
+    """
+    Asigna a cada segmento el hablante con el que más se solapa.
+
+    Barrido en orden de inicio con un montículo de turnos activos (ordenados por fin), en tiempo
+    O((n + m) log m + solapes) en lugar de comparar cada segmento con todos los turnos.
+
+    :param segments: Segmentos {"start", "end", "text"} ordenados por inicio.
+    :param turns: Turnos (inicio, fin, hablante) ordenados por inicio.
+    :return: Nuevos segmentos con la clave "speaker" (None si ningún turno se solapa).
+    """
+    result = []
+    active = []  # Montículo (fin, inicio, hablante) de turnos que pueden solaparse
+    next_turn = 0
+    for seg in segments:
+        start, end = seg["start"], seg["end"]
+        # Entran los turnos que empiezan antes de que acabe el segmento
+        while next_turn < len(turns) and turns[next_turn][0] < end:
+            turn_start, turn_end, speaker = turns[next_turn]
+            heapq.heappush(active, (turn_end, turn_start, speaker))
+            next_turn += 1
+        # Salen los que terminaron antes de que empiece el segmento
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+
+        overlaps = {}
+        for turn_end, turn_start, speaker in active:
+            overlap = min(end, turn_end) - max(start, turn_start)
+            if overlap > 0:
+                overlaps[speaker] = overlaps.get(speaker, 0.0) + overlap
+
+        speaker = max(overlaps, key=overlaps.get) if overlaps else None
+        result.append({**seg, "speaker": speaker})
+    return result
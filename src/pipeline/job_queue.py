@@ -0,0 +1,124 @@
+# src/pipeline/job_queue.py
+# Cola de trabajos compartida por la API REST y la interfaz, guardada en el registro SQLite
+import os
+import threading
+import time
+
+from config.settings import (
+    WHISPER_MODEL, LANGUAGE, QUEUE_MAX_PENDING, QUEUE_WORKERS, QUEUE_SHORT_CLIP_SECONDS, QUEUE_AGING_SECONDS,
+    QUEUE_POLL_INTERVAL
+)
+from src.audio.preprocessor import probe_duration
+from src.storage.job_store import (
+    QUEUED_STATUS, enqueue_job, claim_next_job, list_queue, list_interrupted_jobs, update_job
+)
+from utils.formatter import format_download_link
+
+# Prioridades por defecto: los audios cortos (o de duración desconocida, los largos) pasan antes
+SHORT_CLIP_PRIORITY = 0
+LONG_CLIP_PRIORITY = 1
+
+_workers = []
+_workers_lock = threading.Lock()
+
+
+class QueueFullError(RuntimeError):
+    """La cola alcanzó QUEUE_MAX_PENDING trabajos y no admite más."""
+
+
+def submit_job(file_name, file_path, file_format, model=WHISPER_MODEL, priority=None, language=LANGUAGE):
+    """
+    Pone un archivo en la cola de transcripción.
+
+    :param file_name: Nombre con el que se identifica el trabajo.
+    :param file_path: Ruta del archivo de audio o video.
+    :param file_format: Formato de salida (uno de EXPORT_FORMATS).
+    :param model: Modelo Whisper del trabajo.
+    :param priority: Prioridad explícita (menor = antes); por defecto se decide por la duración.
+    :param language: Idioma del audio, o "auto" para detectarlo al transcribir.
+    :return: Duración del audio en segundos (None si ffprobe no pudo leerla).
+    :raises QueueFullError: Si la cola está llena.
+    """
+    duration = probe_duration(file_path)
+    if priority is None:
+        short = duration is not None and duration <= QUEUE_SHORT_CLIP_SECONDS
+        priority = SHORT_CLIP_PRIORITY if short else LONG_CLIP_PRIORITY
+    if not enqueue_job(file_name, file_path, file_format, model, priority, duration, QUEUE_MAX_PENDING, language):
+        raise QueueFullError(f"La cola está llena ({QUEUE_MAX_PENDING} trabajos en espera)")
+    return duration
+
+
+def queue_position(file_name):
+    """Posición (empezando en 1) de un trabajo en la cola, o None si no está en cola."""
+    for position, job in enumerate(list_queue(QUEUE_AGING_SECONDS), start=1):
+        if job["file_name"] == file_name:
+            return position
+    return None
+
+
+def requeue_interrupted_jobs():
+    """Devuelve a la cola los trabajos que quedaron a medias; continuarán desde su último punto de control."""
+    requeued = 0
+    for job in list_interrupted_jobs():
+        if not job["file_path"] or not os.path.exists(job["file_path"]):
+            update_job(job["file_name"], status="Error: archivo no disponible para reanudar")
+            continue
+        update_job(job["file_name"], status=QUEUED_STATUS)
+        requeued += 1
+    if requeued:
+        print(f"Reanudando {requeued} trabajo(s) interrumpido(s)")
+
+
+def _process(job, worker_index, worker_count):
+    from src.pipeline.transcription_pipeline import TranscriptionPipeline, make_job
+
+    pipeline_job = make_job(job["file_path"], job["file_format"] or "PDF", model=job["model"] or WHISPER_MODEL,
+                            file_name=job["file_name"], language=job["language"] or LANGUAGE)
+    # Un trabajo reanudado no vuelve a detectar el idioma
+    pipeline_job["detected_language"] = job["detected_language"]
+    # La espera en cola se mide desde que se encoló, no desde que un trabajador lo tomó
+    if job["queued_at"]:
+        pipeline_job["queued_at"] = job["queued_at"]
+    # Un trabajo por ejecución: los audios cortos no esperan a que termine uno largo en otro trabajador
+    pipeline = TranscriptionPipeline(inference_workers=1, first_replica=worker_index,
+                                     total_inference_workers=worker_count)
+    for event in pipeline.run([pipeline_job]):
+        if event.get("language"):
+            update_job(job["file_name"], detected_language=event["language"])
+        if event["status"] == "Finalizado":
+            update_job(job["file_name"], status="Finalizado", time=event["time"], output_path=event["output_path"],
+                       audio_key=event.get("audio_key"), download_link=format_download_link(event["output_path"]))
+        else:
+            update_job(job["file_name"], status=event["status"])
+
+
+def _work(worker_index, worker_count):
+    while True:
+        try:
+            job = claim_next_job(QUEUE_AGING_SECONDS)
+        except Exception as e:
+            print(f"Error al leer la cola de trabajos: {e}")
+            job = None
+        if job is None:
+            time.sleep(QUEUE_POLL_INTERVAL)
+            continue
+        try:
+            _process(job, worker_index, worker_count)
+        except Exception as e:
+            update_job(job["file_name"], status=f"Error: {e}")
+
+
+def start_workers(count=QUEUE_WORKERS):
+    """
+    Arranca los trabajadores que procesan la cola en segundo plano (una sola vez por proceso).
+
+    Antes se devuelven a la cola los trabajos interrumpidos por una parada anterior.
+    """
+    with _workers_lock:
+        if _workers:
+            return
+        requeue_interrupted_jobs()
+        for i in range(count):
+            thread = threading.Thread(target=_work, args=(i, count), daemon=True, name=f"queue-worker-{i}")
+            thread.start()
+            _workers.append(thread)
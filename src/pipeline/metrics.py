@@ -0,0 +1,110 @@
+# src/pipeline/metrics.py
+# Mediciones por etapa de cada trabajo y exposición en formato de texto de Prometheus
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from config.settings import JOB_DB_PATH
+from src.storage.job_store import stage_totals, latest_torch_threads, status_counts
+
+# Etapas medidas, en el orden en que ocurren; "total" abarca el trabajo completo
+STAGES = ("queue_wait", "decode", "split", "model_load", "language", "inference", "diarization", "export", "total")
+
+
+def resource_usage():
+    """
+    Pico de memoria residente del proceso actual (MB) e hilos de torch, si ya está importado.
+
+    El pico es el de toda la vida del proceso (ru_maxrss), no el de la etapa que se acaba de medir:
+    una etapa que usa poca memoria tras otra que usó mucha informa el pico de la anterior.
+    """
+    peak_rss_mb = None
+    if resource is not None:
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_rss_mb = round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    torch = sys.modules.get("torch")
+    return {"peak_rss_mb": peak_rss_mb, "torch_threads": torch.get_num_threads() if torch else None}
+
+
+def make_span(stage, started_at, seconds, audio_seconds=None, detail=None):
+    """Construye una medición con el uso de recursos del proceso en ese momento (ver resource_usage)."""
+    return {
+        "stage": stage,
+        "started_at": started_at,
+        "seconds": round(seconds, 4),
+        "audio_seconds": audio_seconds,
+        "detail": detail,
+        **resource_usage(),
+    }
+
+
+@contextmanager
+def span(stage, spans, audio_seconds=None, detail=None):
+    """
+    Mide el bloque y añade la medición a spans al salir.
+
+    Devuelve el diccionario de la medición, para completar audio_seconds o detail dentro del bloque.
+    """
+    entry = {"audio_seconds": audio_seconds, "detail": detail}
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        spans.append(make_span(stage, started_at, time.perf_counter() - start, entry["audio_seconds"],
+                               entry["detail"]))
+
+
+def real_time_factor(seconds, audio_seconds):
+    """Segundos de proceso por segundo de audio (None si no se conoce la duración)."""
+    return round(seconds / audio_seconds, 4) if seconds is not None and audio_seconds else None
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(db_path=JOB_DB_PATH):
+    """Devuelve las métricas acumuladas del registro de trabajos en formato de texto de Prometheus."""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            if value is None:
+                continue
+            label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    # Los estados de error incluyen el mensaje: se agrupan para no crear una serie por mensaje
+    jobs = {}
+    for status, count in status_counts(db_path).items():
+        status = "Error" if status.startswith("Error") else status
+        jobs[status] = jobs.get(status, 0) + count
+    metric("transcriptor_jobs", "gauge", "Trabajos por estado.",
+           [({"status": status}, count) for status, count in sorted(jobs.items())])
+
+    totals = stage_totals(db_path)
+    metric("transcriptor_stage_spans_total", "counter", "Mediciones registradas por etapa.",
+           [({"stage": row["stage"]}, row["count"]) for row in totals])
+    metric("transcriptor_stage_seconds_total", "counter", "Segundos acumulados por etapa.",
+           [({"stage": row["stage"]}, round(row["seconds"], 4)) for row in totals])
+    metric("transcriptor_stage_audio_seconds_total", "counter", "Segundos de audio procesados por etapa.",
+           [({"stage": row["stage"]}, row["audio_seconds"] and round(row["audio_seconds"], 4)) for row in totals])
+    metric("transcriptor_stage_real_time_factor", "gauge",
+           "Segundos de proceso por segundo de audio en cada etapa.",
+           [({"stage": row["stage"]}, real_time_factor(row["seconds"], row["audio_seconds"])) for row in totals])
+    metric("transcriptor_process_peak_rss_bytes", "gauge",
+           "Pico de memoria residente del proceso (desde su arranque) al terminar cada etapa.",
+           [({"stage": row["stage"]}, row["peak_rss_mb"] and int(row["peak_rss_mb"] * 1024 * 1024))
+            for row in totals])
+    metric("transcriptor_torch_threads", "gauge", "Hilos de torch en la última medición.",
+           [({}, latest_torch_threads(db_path))])
+    return "\n".join(lines) + "\n"
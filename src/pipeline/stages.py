@@ -0,0 +1,52 @@
+# src/pipeline/stages.py
+# Etapas que se ejecutan en procesos aparte: no deben importar torch ni whisper
+from config.settings import WHISPER_MODEL, LANGUAGE, DIARIZATION_ENABLED, VAD_MAX_CHUNK
+from src.audio.buffer import open_wav
+from src.audio.vad import detect_speech_chunks
+from src.pipeline.metrics import span
+from src.storage.preprocess_cache import get_preprocessed_audio
+from src.storage.transcription_cache import cache_key, get_cached_segments
+from utils.file_handler import save_transcription
+
+
+def decode_file(file_path, model_name=WHISPER_MODEL, language=LANGUAGE, max_chunk=VAD_MAX_CHUNK):
+    """
+    Etapa de decodificación: convierte el archivo a WAV (o lo toma de la caché de preprocesado), busca
+    su transcripción en la caché y, si no está, detecta los fragmentos de voz.
+
+    :param file_path: Ruta del archivo subido.
+    :param model_name: Modelo con el que se transcribirá (forma parte de la clave de caché).
+    :param language: Idioma pedido para el trabajo, o "auto" (también forma parte de la clave).
+    :param max_chunk: Duración máxima de cada fragmento en segundos.
+    :return: Diccionario con "audio_key", "spans" (mediciones de la etapa) y, o bien "segments"
+             (Transcript del acierto de caché), o bien "wav_path", "sample_rate", "chunks" (límites en muestras)
+             y "duration" (segundos).
+    """
+    spans = []
+    with span("decode", spans):
+        wav_path, audio_hash = get_preprocessed_audio(file_path)
+        audio_key = cache_key(audio_hash, model=model_name, language=language, diarization=DIARIZATION_ENABLED)
+        segments = get_cached_segments(audio_key)
+    if segments is not None:
+        spans[0]["detail"] = "caché"
+        return {"audio_key": audio_key, "segments": segments, "spans": spans}
+
+    with span("split", spans) as split_span:
+        samples, sample_rate = open_wav(wav_path)
+        chunks = detect_speech_chunks(samples, sample_rate, max_chunk=max_chunk)
+        split_span["audio_seconds"] = len(samples) / sample_rate
+    spans[0]["audio_seconds"] = split_span["audio_seconds"]  # La decodificación cubre el mismo audio
+    return {"audio_key": audio_key, "wav_path": wav_path, "sample_rate": sample_rate, "chunks": chunks,
+            "duration": split_span["audio_seconds"], "spans": spans}
+
+
+def export_file(segments, output_path, file_format):
+    """
+    Etapa de exportación: genera el documento final a partir de los segmentos.
+
+    :return: Tupla (ruta del documento, mediciones de la etapa).
+    """
+    spans = []
+    with span("export", spans, detail=file_format):
+        save_transcription(segments, output_path, file_format)
+    return output_path, spans
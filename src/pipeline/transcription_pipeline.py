@@ -0,0 +1,581 @@
+# src/pipeline/transcription_pipeline.py
+import os
+import queue
+from collections import deque
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import groupby
+
+from config.settings import (
+    PIPELINE_DECODE_WORKERS, PIPELINE_INFERENCE_WORKERS, PIPELINE_EXPORT_WORKERS, PIPELINE_MAX_PENDING,
+    INFERENCE_BATCH_SIZE, WHISPER_MODEL, LANGUAGE, LANGUAGE_DETECTION_SECONDS, DIARIZATION_ENABLED,
+    PARALLEL_SEGMENT_WORKERS, VAD_MAX_CHUNK, PIPELINE_STREAM_CHUNK
+)
+from src.audio.buffer import open_wav
+from src.audio.vad import split_windows
+from src.pipeline.metrics import make_span, span
+from src.pipeline.stages import decode_file, export_file
+from src.storage.job_store import (
+    save_checkpoint, load_checkpoints, clear_checkpoints, record_spans, clear_spans, index_transcript
+)
+from src.storage.transcription_cache import put_cached_segments
+from utils.file_handler import PartialTranscriptWriter
+from utils.transcript import Transcript, compact_segment
+
+# Pools de procesos por (etapa, procesos), compartidos entre ejecuciones para no pagar el arranque cada vez
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(name, workers):
+    with _pools_lock:
+        key = (name, workers)
+        if key not in _pools:
+            _pools[key] = ProcessPoolExecutor(max_workers=workers)
+        return _pools[key]
+
+
+def make_job(file_path, file_format, output_dir=None, model=WHISPER_MODEL, file_name=None, language=LANGUAGE):
+    """
+    Construye un trabajo para TranscriptionPipeline.run.
+
+    :param file_path: Ruta del archivo de audio o video.
+    :param file_format: Formato de salida (uno de EXPORT_FORMATS).
+    :param output_dir: Carpeta de salida (por defecto, la del archivo de entrada).
+    :param model: Modelo Whisper del trabajo.
+    :param file_name: Nombre con el que se identifica el trabajo (por defecto, el del archivo).
+    :param language: Idioma del audio, o "auto" para detectarlo una vez al empezar a transcribir.
+    """
+    file_name = file_name or os.path.basename(file_path)
+    output_filename = f"{os.path.splitext(file_name)[0]}.{file_format.lower()}"
+    return {
+        "file_name": file_name,
+        "file_path": file_path,
+        "output_path": os.path.join(output_dir or os.path.dirname(file_path), output_filename),
+        "file_format": file_format,
+        "model": model,
+        "language": language,
+    }
+
+
+def _event(job, status, done=False, **extra):
+    return {"file_name": job["file_name"], "status": status, "done": done, **extra}
+
+
+class TranscriptionPipeline:
+    """
+    Procesa varios archivos en tres etapas encadenadas:
+
+    - decodificación (ffmpeg + detección de silencios) en un pool de procesos,
+    - transcripción en un conjunto acotado de hilos, cada uno con su propio modelo
+      (con batch_size > 1, las ventanas de varios archivos se transcriben en lotes),
+    - exportación a TXT/DOCX/PDF en otro pool de procesos.
+
+    Las colas entre etapas están limitadas por max_pending, de modo que la decodificación
+    no se adelanta indefinidamente a la inferencia ni la inferencia a la exportación.
+    """
+
+    def __init__(self, decode_workers=PIPELINE_DECODE_WORKERS, inference_workers=PIPELINE_INFERENCE_WORKERS,
+                 export_workers=PIPELINE_EXPORT_WORKERS, max_pending=PIPELINE_MAX_PENDING,
+                 batch_size=INFERENCE_BATCH_SIZE, first_replica=0, total_inference_workers=None,
+                 segment_workers=PARALLEL_SEGMENT_WORKERS, stream_chunk=PIPELINE_STREAM_CHUNK, record=True):
+        self.decode_workers = decode_workers
+        self.inference_workers = inference_workers
+        self.export_workers = export_workers
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        # Varias ejecuciones simultáneas (p. ej. los trabajadores de la cola) deben usar copias distintas del modelo
+        self.first_replica = first_replica
+        # Hilos de inferencia de todas las ejecuciones del proceso, para repartir los núcleos en CPU
+        self.total_inference_workers = total_inference_workers or inference_workers
+        # Con más de un proceso, los fragmentos de un mismo archivo se transcriben en paralelo
+        self.segment_workers = segment_workers
+        # Sin registro (p. ej. la CLI), las mediciones y el índice de búsqueda no se guardan en jobs.db,
+        # porque los trabajos no están en la tabla de trabajos
+        self.record = record
+        # Por lotes, cada fragmento es una ventana de Whisper (30 s) cortada en una pausa. Uno a uno, los
+        # fragmentos llegan a VAD_MAX_CHUNK y Whisper conserva el contexto (condition_on_previous_text)
+        # dentro de cada uno; con stream_chunk se acotan para que el TXT/SRT parcial y la interfaz reciban
+        # texto tras cada ventana, a cambio de perder ese contexto en cada corte
+        if batch_size > 1:
+            self.max_chunk = 30
+        else:
+            self.max_chunk = min(stream_chunk, VAD_MAX_CHUNK) if stream_chunk else VAD_MAX_CHUNK
+
+    def run(self, jobs):
+        """
+        Procesa los trabajos y devuelve sus eventos de progreso a medida que ocurren.
+
+        :param jobs: Lista de diccionarios con "file_name", "file_path", "output_path", "file_format"
+                     y, opcionalmente, "model" (modelo Whisper del trabajo), "language" (idioma o "auto")
+                     "detected_language" (idioma ya detectado en una ejecución anterior) y "queued_at"
+                     (momento en que se encoló; por defecto, el de la llamada).
+        :return: Generador de eventos {"file_name", "status", "done", ...}; los de progreso de la
+                 transcripción incluyen "segments" con los segmentos nuevos (y el primero, "language" si se
+                 detectó el idioma), y el último evento de cada
+                 archivo tiene done=True y, si terminó bien, "time" y "output_path".
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return
+        for job in jobs:
+            job.setdefault("model", WHISPER_MODEL)
+            job.setdefault("language", LANGUAGE)
+            job.setdefault("queued_at", time.time())
+            if self.record:
+                clear_spans(job["file_name"])  # Las mediciones describen solo la última ejecución
+
+        # torch y whisper se importan al empezar a transcribir, no al importar el módulo
+        from src.transcription.cpu_mode import configure_cpu_threads
+        from src.transcription.model_pool import default_device
+        if default_device() == "cpu":
+            configure_cpu_threads(self.total_inference_workers)
+
+        events = queue.Queue()
+        decoded = queue.Queue()
+        held = deque()
+        decode_slots = threading.BoundedSemaphore(self.max_pending + self.inference_workers)
+        export_slots = threading.BoundedSemaphore(self.max_pending + self.export_workers)
+        decode_pool = _get_pool("decode", self.decode_workers)
+        export_pool = _get_pool("export", self.export_workers)
+
+        def feed():
+            for job in jobs:
+                decode_slots.acquire()  # Espera si la inferencia va atrasada
+                job["start_time"] = time.time()
+                events.put(_event(job, "Fragmentando..."))
+                try:
+                    future = decode_pool.submit(decode_file, job["file_path"], job["model"], job["language"],
+                                                self.max_chunk)
+                    decoded.put((job, future))
+                except Exception as e:
+                    decode_slots.release()
+                    events.put(_event(job, f"Error: {e}", done=True))
+            for _ in range(self.inference_workers):
+                decoded.put(None)
+
+        def infer(replica):
+            while True:
+                group = self._next_group(decoded, held)
+                if group is None:
+                    return
+
+                ready = []
+                for job, future in group:
+                    try:
+                        decoded_file = future.result()
+                    except Exception as e:
+                        decode_slots.release()
+                        events.put(_event(job, f"Error: {e}", done=True))
+                        continue
+                    self._record_decode(job, decoded_file)
+                    ready.append((job, decoded_file))
+
+                for job, result in self._transcribe_group(ready, events, replica):
+                    decode_slots.release()
+                    if isinstance(result, Exception):
+                        self._close_partial(job)
+                        events.put(_event(job, f"Error: {result}", done=True))
+                        continue
+
+                    export_slots.acquire()  # Espera si la exportación va atrasada
+                    events.put(_event(job, "Generando documento..."))
+                    try:
+                        export_future = export_pool.submit(export_file, result, job["output_path"], job["file_format"])
+                    except Exception as e:
+                        export_slots.release()
+                        events.put(_event(job, f"Error: {e}", done=True))
+                        continue
+                    export_future.add_done_callback(lambda f, job=job, segments=result: on_exported(job, f, segments))
+
+        def on_exported(job, future, segments):
+            export_slots.release()
+            try:
+                output_path, export_spans = future.result()
+            except Exception as e:
+                self._close_partial(job)
+                events.put(_event(job, f"Error: {e}", done=True))
+                return
+            self._close_partial(job, remove=True)  # El documento final reemplaza a los parciales
+            if self.record:
+                try:
+                    index_transcript(job["file_name"], segments)
+                except Exception as e:
+                    print(f"No se pudo indexar la transcripción de {job['file_name']}: {e}")
+            elapsed_time = round(time.time() - job["start_time"], 2)
+            total = make_span("total", job["queued_at"], time.time() - job["queued_at"], job.get("duration"))
+            self._record_spans(job["file_name"], export_spans + [total])
+            events.put(_event(job, "Finalizado", done=True, time=elapsed_time, output_path=output_path,
+                              audio_key=job.get("audio_key")))
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        threads += [threading.Thread(target=infer, args=(self.first_replica + i,), daemon=True)
+                    for i in range(self.inference_workers)]
+        for thread in threads:
+            thread.start()
+
+        remaining = len(jobs)
+        while remaining:
+            event = events.get()
+            if event["done"]:
+                remaining -= 1
+            yield event
+
+    def _record_spans(self, file_name, spans):
+        """Guarda mediciones; si falla el registro (p. ej. "database is locked"), el trabajo sigue."""
+        if not self.record:
+            return
+        try:
+            record_spans(file_name, spans)
+        except Exception as e:
+            print(f"No se pudieron guardar las mediciones de {file_name}: {e}")
+
+    def _next_group(self, decoded, held):
+        """
+        Toma el siguiente archivo de la cola y, con inferencia por lotes, también los que ya estén
+        decodificados con el mismo modelo, para llenar los lotes con ventanas de varios archivos.
+
+        :param decoded: Cola de (trabajo, future) de la etapa de decodificación.
+        :param held: Elementos sacados de la cola que todavía no se usaron; van antes que la cola.
+        :return: Lista de (trabajo, future), o None cuando no quedan trabajos.
+        """
+        item = self._take(decoded, held, block=True)
+        if item is None:
+            return None
+        group = [item]
+        if self.batch_size <= 1:
+            return group
+
+        while True:
+            try:
+                item = self._take(decoded, held, block=False)
+            except queue.Empty:
+                break
+            if item is None or not item[1].done() or item[0]["model"] != group[0][0]["model"]:
+                held.appendleft(item)  # Se conserva su turno para la siguiente vuelta
+                break
+            group.append(item)
+        return group
+
+    @staticmethod
+    def _take(decoded, held, block):
+        try:
+            return held.popleft()
+        except IndexError:
+            return decoded.get(block=block)
+
+    def _transcribe_group(self, ready, events, replica):
+        """
+        Transcribe un grupo de archivos decodificados.
+
+        :return: Lista de (trabajo, segmentos o excepción) en el mismo orden.
+        """
+        results = []
+        pending = []
+        for job, decoded_file in ready:
+            segments = decoded_file.get("segments")
+            if segments is not None:
+                results.append((job, segments))  # Acierto de caché
+            else:
+                pending.append((job, decoded_file))
+
+        # La diarización corre en paralelo a la transcripción sobre el mismo WAV mapeado en memoria
+        diarizations = [self._start_diarization(decoded_file) for _, decoded_file in pending]
+
+        if self.batch_size <= 1:
+            for (job, decoded_file), diarization in zip(pending, diarizations):
+                try:
+                    segments = self._transcribe(job, decoded_file, events, replica)
+                    results.append((job, self._complete(job, decoded_file, segments, diarization)))
+                except Exception as e:
+                    results.append((job, e))
+            return results
+
+        try:
+            per_file = self._transcribe_batched(pending, events, replica)
+            results += [
+                (job, self._complete(job, decoded_file, segments, diarization))
+                for (job, decoded_file), segments, diarization in zip(pending, per_file, diarizations)
+            ]
+        except Exception as e:
+            results += [(job, e) for job, _ in pending]
+        return results
+
+    def _record_decode(self, job, decoded_file):
+        """Guarda las mediciones de la decodificación y el tiempo que el trabajo esperó antes de ella."""
+        spans = decoded_file.get("spans", [])
+        if spans:
+            queue_wait = make_span("queue_wait", job["queued_at"], max(spans[0]["started_at"] - job["queued_at"], 0))
+            self._record_spans(job["file_name"], [queue_wait] + spans)
+        job["duration"] = decoded_file.get("duration")
+        job["audio_key"] = decoded_file.get("audio_key")
+
+    def _load_model(self, job, replica):
+        """Carga el modelo del trabajo antes de transcribir y, si no estaba en memoria, registra cuánto tardó."""
+        from src.transcription.model_pool import get_model, loaded_models, default_device, default_dtype
+
+        device = default_device()
+        dtype = default_dtype(device)
+        if (job["model"], device, dtype, replica) in loaded_models():
+            return
+        spans = []
+        with span("model_load", spans, detail=job["model"]):
+            get_model(job["model"], device=device, dtype=dtype, replica=replica)
+        self._record_spans(job["file_name"], spans)
+
+    def _resolve_language(self, job, decoded_file, replica, parallel=False):
+        """
+        Idioma con el que se transcriben todos los fragmentos del archivo.
+
+        Con "auto" se detecta una sola vez, con LANGUAGE_DETECTION_SECONDS de audio desde el primer tramo
+        de voz, salvo que el trabajo ya traiga el idioma detectado en una ejecución anterior.
+
+        :param parallel: Si la detección debe hacerse en los procesos de transcripción en paralelo.
+        """
+        if job["language"] != "auto":
+            return job["language"]
+        chunks = decoded_file["chunks"]
+        if not job.get("detected_language") and chunks:
+            sample_rate = decoded_file["sample_rate"]
+            start = chunks[0][0]
+            end = start + int(LANGUAGE_DETECTION_SECONDS * sample_rate)
+            audio_seconds = min(LANGUAGE_DETECTION_SECONDS, decoded_file["duration"] - start / sample_rate)
+            spans = []
+            if parallel:
+                from src.transcription.parallel_transcriber import detect_language
+
+                with span("language", spans, audio_seconds=audio_seconds):
+                    language = detect_language(decoded_file["wav_path"], start, end, model_name=job["model"],
+                                               workers=self.segment_workers)
+            else:
+                from src.transcription.whisper_transcriber import detect_language
+
+                self._load_model(job, replica)
+                samples, _ = open_wav(decoded_file["wav_path"])
+                with span("language", spans, audio_seconds=audio_seconds):
+                    language = detect_language(samples[start:end], replica=replica, model_name=job["model"])
+            spans[0]["detail"] = language
+            self._record_spans(job["file_name"], spans)
+            job["detected_language"] = language
+        return job.get("detected_language") or "auto"
+
+    @staticmethod
+    def _open_partial(job, chunk_segments):
+        """Abre los TXT/SRT parciales del trabajo y escribe los fragmentos ya transcritos."""
+        writer = job["partial_writer"] = PartialTranscriptWriter(job["output_path"])
+        for idx in sorted(chunk_segments):
+            writer.write(chunk_segments[idx])
+        return writer
+
+    @staticmethod
+    def _close_partial(job, remove=False):
+        writer = job.pop("partial_writer", None)
+        if writer is None:
+            return
+        try:
+            writer.remove() if remove else writer.close()
+        except OSError as e:
+            print(f"No se pudo cerrar la transcripción parcial de {job['file_name']}: {e}")
+
+    @staticmethod
+    def _start_diarization(decoded_file):
+        """
+        Lanza la diarización del archivo; devuelve (future, mediciones) o None si está desactivada.
+
+        Si no se puede lanzar, el error queda en el future y se informa como error del trabajo al completarlo.
+        """
+        if not DIARIZATION_ENABLED:
+            return None
+        spans = []
+        try:
+            from src.diarization.pyannote_diarizer import diarize_async
+
+            return diarize_async(decoded_file["wav_path"], decoded_file["duration"], spans=spans), spans
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+            return future, spans
+
+    def _complete(self, job, decoded_file, chunk_segments, diarization=None):
+        """
+        Une los segmentos de los fragmentos, añade los hablantes si hubo diarización, los guarda en
+        caché y borra los puntos de control.
+
+        :return: Transcript con la transcripción completa (la que reciben la exportación y el índice de búsqueda).
+        """
+        segments = [seg for idx in sorted(chunk_segments) for seg in chunk_segments[idx]]
+        if diarization is not None:
+            from src.diarization.pyannote_diarizer import assign_speakers
+
+            future, spans = diarization
+            segments = assign_speakers(segments, future.result())
+            self._record_spans(job["file_name"], spans)
+        transcript = Transcript.from_segments(segments)
+        put_cached_segments(decoded_file["audio_key"], transcript)
+        clear_checkpoints(decoded_file["audio_key"])
+        return transcript
+
+    def _transcribe(self, job, decoded_file, events, replica):
+        """
+        Transcribe los fragmentos de un archivo uno a uno (o en varios procesos si segment_workers > 1),
+        guardando un punto de control tras cada uno.
+
+        :return: Diccionario índice de fragmento -> segmentos.
+        """
+        from src.transcription.whisper_transcriber import transcribe_audio
+
+        samples, _ = open_wav(decoded_file["wav_path"])
+        sample_rate = decoded_file["sample_rate"]
+        chunks = decoded_file["chunks"]
+        audio_key = decoded_file["audio_key"]
+
+        # Retomar desde el primer fragmento sin terminar
+        chunk_segments = load_checkpoints(audio_key, chunks)
+        pending = [i for i in range(len(chunks)) if i not in chunk_segments]
+        parallel = self.segment_workers > 1 and len(pending) > 1
+        if pending and not parallel:
+            self._load_model(job, replica)
+        language = self._resolve_language(job, decoded_file, replica, parallel) if pending else None
+        writer = self._open_partial(job, chunk_segments)
+        # Los fragmentos retomados ya están en el TXT/SRT parcial; los eventos solo llevan los nuevos
+        events.put(_event(job, f"Transcribiendo... ({int(len(chunk_segments) / max(len(chunks), 1) * 100)}%)",
+                          language=job.get("detected_language")))
+        if parallel:
+            return self._transcribe_parallel(job, decoded_file, chunk_segments, pending, events, language)
+
+        for i, (start, end) in enumerate(chunks):
+            if i in chunk_segments:
+                continue
+            spans = []
+            with span("inference", spans, audio_seconds=(end - start) / sample_rate, detail=f"fragmento {i}"):
+                transcribed = transcribe_audio(samples[start:end], replica=replica, model_name=job["model"],
+                                               language=language)
+            self._record_spans(job["file_name"], spans)
+            segments = [compact_segment(seg, start / sample_rate) for seg in transcribed]
+            save_checkpoint(audio_key, i, start, end, segments)
+            writer.write(segments)
+            chunk_segments[i] = segments
+            progress = int(len(chunk_segments) / len(chunks) * 100)
+            events.put(_event(job, f"Transcribiendo... ({progress}%)", segments=segments))
+        return chunk_segments
+
+    def _transcribe_parallel(self, job, decoded_file, chunk_segments, pending, events, language):
+        """
+        Reparte los fragmentos pendientes de un archivo entre procesos con su propio modelo.
+
+        Los puntos de control se guardan según terminan los fragmentos; la transcripción parcial y los
+        eventos se emiten en orden, cuando ya terminaron todos los fragmentos anteriores.
+        """
+        from src.transcription.parallel_transcriber import transcribe_parts
+
+        sample_rate = decoded_file["sample_rate"]
+        chunks = decoded_file["chunks"]
+        parts = [
+            (i, decoded_file["wav_path"], chunks[i][0], chunks[i][1], chunks[i][0] / sample_rate)
+            for i in pending
+        ]
+
+        next_pending = 0  # Posición en pending del siguiente fragmento por escribir
+        results = transcribe_parts(parts, model_name=job["model"], workers=self.segment_workers, language=language)
+        for i, segments, spans in results:
+            self._record_spans(job["file_name"], spans)
+            save_checkpoint(decoded_file["audio_key"], i, chunks[i][0], chunks[i][1], segments)
+            chunk_segments[i] = segments
+
+            written = []
+            while next_pending < len(pending) and pending[next_pending] in chunk_segments:
+                written += chunk_segments[pending[next_pending]]
+                next_pending += 1
+            if written:
+                job["partial_writer"].write(written)
+            progress = int(len(chunk_segments) / len(chunks) * 100)
+            events.put(_event(job, f"Transcribiendo... ({progress}%)", segments=written))
+        return chunk_segments
+
+    def _transcribe_batched(self, pending, events, replica):
+        """
+        Reúne las ventanas de 30 s de todos los archivos y las transcribe en lotes, guardando un punto
+        de control por cada fragmento completado.
+
+        :return: Lista (una entrada por archivo) de diccionarios índice de fragmento -> segmentos.
+        """
+        if not pending:
+            return []
+        from src.transcription.batched_transcriber import transcribe_windows
+
+        per_file = []
+        languages = []  # Idioma de cada archivo, detectado una vez si se pidió "auto"
+        windows = []  # (índice del archivo, índice del fragmento, offset, muestras)
+        remaining = {}  # (índice del archivo, índice del fragmento) -> ventanas sin transcribir
+        for file_idx, (job, decoded_file) in enumerate(pending):
+            samples, _ = open_wav(decoded_file["wav_path"])
+            sample_rate = decoded_file["sample_rate"]
+            chunks = decoded_file["chunks"]
+            per_file.append(load_checkpoints(decoded_file["audio_key"], chunks))
+            self._open_partial(job, per_file[file_idx])
+            for chunk_idx, (start, end) in enumerate(chunks):
+                if chunk_idx in per_file[file_idx]:
+                    continue
+                per_file[file_idx][chunk_idx] = []
+                for audio, offset in split_windows(samples[start:end], start / sample_rate, sample_rate):
+                    windows.append((file_idx, chunk_idx, offset, audio))
+                    remaining[(file_idx, chunk_idx)] = remaining.get((file_idx, chunk_idx), 0) + 1
+            has_windows = windows and windows[-1][0] == file_idx
+            languages.append(self._resolve_language(job, decoded_file, replica) if has_windows else None)
+            events.put(_event(job, "Transcribiendo... (0%)", language=job.get("detected_language")))
+
+        if windows:
+            self._load_model(pending[0][0], replica)
+
+        # Cada ronda es un lote de un solo idioma: al terminarla se guardan los fragmentos completos.
+        # La ordenación es estable, así que los fragmentos de cada archivo siguen en orden.
+        windows.sort(key=lambda window: languages[window[0]])
+        rounds = []
+        for language, group in groupby(windows, key=lambda window: languages[window[0]]):
+            group = list(group)
+            rounds += [(language, group[first:first + self.batch_size])
+                       for first in range(0, len(group), self.batch_size)]
+
+        for language, batch in rounds:
+            started_at = time.time()
+            start = time.perf_counter()
+            batch_segments = transcribe_windows(
+                [audio for _, _, _, audio in batch], batch_size=self.batch_size, language=language,
+                replica=replica, model_name=pending[0][0]["model"]
+            )
+            self._record_batch(pending, batch, started_at, time.perf_counter() - start)
+
+            touched = {}  # índice del archivo -> segmentos de los fragmentos completados en la ronda
+            for (file_idx, chunk_idx, offset, _), segments in zip(batch, batch_segments):
+                per_file[file_idx][chunk_idx] += [compact_segment(seg, offset) for seg in segments]
+                remaining[(file_idx, chunk_idx)] -= 1
+                if remaining[(file_idx, chunk_idx)] == 0:
+                    start, end = pending[file_idx][1]["chunks"][chunk_idx]
+                    save_checkpoint(pending[file_idx][1]["audio_key"], chunk_idx, start, end,
+                                    per_file[file_idx][chunk_idx])
+                    pending[file_idx][0]["partial_writer"].write(per_file[file_idx][chunk_idx])
+                    touched.setdefault(file_idx, []).extend(per_file[file_idx][chunk_idx])
+                else:
+                    touched.setdefault(file_idx, [])
+
+            for file_idx, new_segments in touched.items():
+                total = len(pending[file_idx][1]["chunks"])
+                left = sum(1 for (f, _), n in remaining.items() if f == file_idx and n)
+                progress = int((total - left) / total * 100)
+                events.put(_event(pending[file_idx][0], f"Transcribiendo... ({progress}%)", segments=new_segments))
+
+        return per_file
+
+    def _record_batch(self, pending, batch, started_at, seconds):
+        """Reparte el tiempo de un lote entre sus archivos según los segundos de audio de cada uno."""
+        audio_seconds = {}
+        for file_idx, _, _, audio in batch:
+            sample_rate = pending[file_idx][1]["sample_rate"]
+            audio_seconds[file_idx] = audio_seconds.get(file_idx, 0.0) + len(audio) / sample_rate
+        total = sum(audio_seconds.values()) or 1.0
+        for file_idx, file_seconds in audio_seconds.items():
+            self._record_spans(pending[file_idx][0]["file_name"], [
+                make_span("inference", started_at, seconds * file_seconds / total, file_seconds,
+                          detail=f"lote de {len(batch)} ventanas")
+            ])
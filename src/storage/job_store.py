@@ -0,0 +1,561 @@
+# src/storage/job_store.py
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from config.settings import JOB_DB_PATH
+from utils.transcript import compact_segment
+
+# Columnas que se pueden actualizar desde fuera del módulo
+JOB_FIELDS = ("file_path", "file_format", "model", "status", "time", "download_link", "output_path", "language",
+              "detected_language", "audio_key")
+
+# Estado de los trabajos que esperan en la cola a un trabajador
+QUEUED_STATUS = "En cola"
+
+# Estado de un trabajo que un trabajador acaba de tomar de la cola
+CLAIMED_STATUS = "Iniciando..."
+
+# Estados en los que un trabajo no está en curso
+IDLE_STATUSES = ("Pendiente", QUEUED_STATUS, "Finalizado")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_name TEXT NOT NULL UNIQUE,
+    file_path TEXT,
+    status TEXT NOT NULL DEFAULT 'Pendiente',
+    time TEXT NOT NULL DEFAULT '-',
+    download_link TEXT NOT NULL DEFAULT '',
+    submitted_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS idx_jobs_submitted_at ON jobs (submitted_at);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    audio_key TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    chunk_start INTEGER NOT NULL,
+    chunk_end INTEGER NOT NULL,
+    segments TEXT NOT NULL,
+    PRIMARY KEY (audio_key, chunk_index)
+);
+
+CREATE TABLE IF NOT EXISTS spans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_name TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    seconds REAL NOT NULL,
+    audio_seconds REAL,
+    peak_rss_mb REAL,
+    torch_threads INTEGER,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_spans_file_name ON spans (file_name);
+
+CREATE TABLE IF NOT EXISTS transcript_segments (
+    id INTEGER PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    speaker TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transcript_segments_file_name ON transcript_segments (file_name);
+
+-- Índice invertido sobre el texto de transcript_segments (FTS5 con contenido externo)
+CREATE VIRTUAL TABLE IF NOT EXISTS transcript_search USING fts5(
+    text, content='transcript_segments', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS transcript_segments_ai AFTER INSERT ON transcript_segments BEGIN
+    INSERT INTO transcript_search (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS transcript_segments_ad AFTER DELETE ON transcript_segments BEGIN
+    INSERT INTO transcript_search (transcript_search, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# Columnas añadidas después de la primera versión del esquema
+_ADDED_COLUMNS = {
+    "file_format": "TEXT",
+    "model": "TEXT",
+    "output_path": "TEXT",
+    "priority": "INTEGER NOT NULL DEFAULT 0",
+    "duration": "REAL",
+    "queued_at": "REAL",
+    "language": "TEXT",
+    "detected_language": "TEXT",
+    "audio_key": "TEXT",
+}
+
+# Una conexión por hilo: Gradio atiende cada evento en su propio hilo
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def get_connection(db_path=JOB_DB_PATH):
+    """Devuelve la conexión del hilo actual, creando el esquema la primera vez."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = connections[db_path] = _connect(db_path)
+        init_store(db_path, conn)
+    return conn
+
+
+def init_store(db_path=JOB_DB_PATH, conn=None):
+    """
+    Crea las tablas e índices si no existen e importa el antiguo file_registry.json.
+
+    :param db_path: Ruta de la base de datos SQLite.
+    :param conn: Conexión ya abierta (opcional).
+    """
+    with _init_lock:
+        if db_path in _initialized:
+            return
+        conn = conn or _connect(db_path)
+        with conn:
+            conn.executescript(_SCHEMA)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        _migrate_json_registry(conn)
+        _initialized.add(db_path)
+
+
+def _migrate_json_registry(conn, json_path="file_registry.json"):
+    """Importa una sola vez los registros del formato JSON anterior."""
+    if not os.path.exists(json_path):
+        return
+    if conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone():
+        return
+    try:
+        with open(json_path, "r") as f:
+            registry = json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"No se pudo migrar {json_path}: {e}")
+        return
+
+    now = time.time()
+    with conn:
+        for offset, (file_name, data) in enumerate(registry.items()):
+            # Se conserva el orden original usando la posición como desempate
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (file_name, status, time, download_link, submitted_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (file_name, data.get("status", "Pendiente"), str(data.get("time", "-")),
+                 data.get("download_link", ""), now + offset * 1e-6, now),
+            )
+    print(f"Migrados {len(registry)} registros desde {json_path}")
+
+
+def add_job(file_name, file_path=None, file_format=None, db_path=JOB_DB_PATH):
+    """
+    Registra un archivo como "Pendiente" si todavía no existe.
+
+    :return: True si se creó un registro nuevo, False si ya existía.
+    """
+    conn = get_connection(db_path)
+    now = time.time()
+    with conn:
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO jobs (file_name, file_path, file_format, submitted_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (file_name, file_path, file_format, now, now),
+        )
+    return cursor.rowcount > 0
+
+
+def update_job(file_name, db_path=JOB_DB_PATH, **fields):
+    """Actualiza solo las columnas indicadas de un registro."""
+    unknown = set(fields) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+    if not fields:
+        return
+
+    if "time" in fields:
+        fields["time"] = str(fields["time"])
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    conn = get_connection(db_path)
+    with conn:
+        conn.execute(
+            f"UPDATE jobs SET {assignments}, updated_at = ? WHERE file_name = ?",
+            (*fields.values(), time.time(), file_name),
+        )
+
+
+def get_job(file_name, db_path=JOB_DB_PATH):
+    """Devuelve el registro de un archivo como diccionario, o None si no existe."""
+    row = get_connection(db_path).execute(
+        "SELECT * FROM jobs WHERE file_name = ?", (file_name,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+# Filtros de estado que agrupan varios estados
+ERROR_FILTER = "Error"  # Cualquier estado "Error: ..."
+ACTIVE_FILTER = "En curso"  # Trabajos que se están procesando
+
+
+def _job_filters(status=None, since=None, until=None):
+    """Cláusula WHERE y parámetros para filtrar por estado y fecha de envío."""
+    conditions = []
+    params = []
+    if status == ERROR_FILTER:
+        conditions.append("status LIKE 'Error%'")
+    elif status == ACTIVE_FILTER:
+        conditions.append(f"status NOT IN ({', '.join('?' for _ in IDLE_STATUSES)}) AND status NOT LIKE 'Error%'")
+        params += IDLE_STATUSES
+    elif status:
+        conditions.append("status = ?")
+        params.append(status)
+    if since is not None:
+        conditions.append("submitted_at >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("submitted_at < ?")
+        params.append(until)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+
+def list_jobs(page=1, page_size=50, status=None, since=None, until=None, newest_first=False, db_path=JOB_DB_PATH):
+    """
+    Consulta paginada de registros en orden de llegada.
+
+    :param page: Número de página (empieza en 1).
+    :param page_size: Registros por página (None = todos).
+    :param status: Filtrar por estado exacto, ERROR_FILTER o ACTIVE_FILTER (opcional).
+    :param since: Solo los enviados a partir de este instante (timestamp, opcional).
+    :param until: Solo los enviados antes de este instante (timestamp, opcional).
+    :param newest_first: Ordenar del más reciente al más antiguo.
+    :return: Lista de diccionarios con los registros de la página.
+    """
+    where, params = _job_filters(status, since, until)
+    query = "SELECT * FROM jobs" + where
+    query += " ORDER BY submitted_at DESC, id DESC" if newest_first else " ORDER BY submitted_at, id"
+    if page_size:
+        query += " LIMIT ? OFFSET ?"
+        params += [page_size, (max(page, 1) - 1) * page_size]
+    rows = get_connection(db_path).execute(query, params).fetchall()
+    return [dict(row) for row in rows]
+
+
+def count_jobs(status=None, since=None, until=None, db_path=JOB_DB_PATH):
+    """Cuenta los registros con los mismos filtros que list_jobs."""
+    where, params = _job_filters(status, since, until)
+    return get_connection(db_path).execute("SELECT COUNT(*) FROM jobs" + where, params).fetchone()[0]
+
+
+def list_interrupted_jobs(db_path=JOB_DB_PATH):
+    """Trabajos que quedaron a medias (ni pendientes, ni finalizados, ni con error)."""
+    rows = get_connection(db_path).execute(
+        f"SELECT * FROM jobs WHERE status NOT IN ({', '.join('?' for _ in IDLE_STATUSES)}) "
+        "AND status NOT LIKE 'Error%' ORDER BY submitted_at, id",
+        IDLE_STATUSES,
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_jobs(file_names, db_path=JOB_DB_PATH):
+    """Registros de varios archivos como diccionario file_name -> registro."""
+    file_names = list(file_names)
+    if not file_names:
+        return {}
+    rows = get_connection(db_path).execute(
+        f"SELECT * FROM jobs WHERE file_name IN ({', '.join('?' for _ in file_names)})", file_names
+    ).fetchall()
+    return {row["file_name"]: dict(row) for row in rows}
+
+
+def enqueue_job(file_name, file_path, file_format, model, priority=0, duration=None, max_queued=None,
+                language=None, db_path=JOB_DB_PATH):
+    """
+    Pone un trabajo en la cola, creándolo si no existe.
+
+    Se olvida el idioma detectado en un envío anterior: el archivo puede haber cambiado.
+
+    :param priority: Prioridad (menor = antes).
+    :param duration: Duración del audio en segundos, si se conoce.
+    :param max_queued: Máximo de trabajos en cola; si ya se alcanzó, el trabajo no entra.
+    :param language: Idioma pedido para el trabajo, o "auto".
+    :return: True si el trabajo quedó en cola, False si la cola estaba llena.
+    """
+    conn = get_connection(db_path)
+    now = time.time()
+    with conn:
+        # Reservar la escritura antes de contar para que dos procesos no superen el límite a la vez
+        conn.execute("BEGIN IMMEDIATE")
+        if max_queued:
+            queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED_STATUS,)).fetchone()[0]
+            if queued >= max_queued:
+                return False
+        conn.execute(
+            "INSERT INTO jobs (file_name, file_path, file_format, model, priority, duration, language, status, "
+            "submitted_at, queued_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (file_name) DO UPDATE SET file_path = excluded.file_path, "
+            "file_format = excluded.file_format, model = excluded.model, priority = excluded.priority, "
+            "duration = excluded.duration, language = excluded.language, detected_language = NULL, "
+            "status = excluded.status, queued_at = excluded.queued_at, updated_at = excluded.updated_at",
+            (file_name, file_path, file_format, model, priority, duration, language, QUEUED_STATUS, now, now, now),
+        )
+    return True
+
+
+# Orden de la cola: prioridad, adelantada un nivel por cada aging_seconds de espera, y luego llegada
+_QUEUE_ORDER = "ORDER BY priority - (? - queued_at) / ?, queued_at, id"
+
+
+def list_queue(aging_seconds, db_path=JOB_DB_PATH):
+    """Trabajos en cola en el orden en que se procesarán."""
+    rows = get_connection(db_path).execute(
+        f"SELECT * FROM jobs WHERE status = ? {_QUEUE_ORDER}", (QUEUED_STATUS, time.time(), aging_seconds)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def claim_next_job(aging_seconds, db_path=JOB_DB_PATH):
+    """
+    Toma el siguiente trabajo de la cola y lo marca como CLAIMED_STATUS.
+
+    :return: Registro del trabajo, o None si la cola está vacía.
+    """
+    conn = get_connection(db_path)
+    now = time.time()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")  # Dos trabajadores no pueden tomar el mismo trabajo
+        row = conn.execute(
+            f"SELECT * FROM jobs WHERE status = ? {_QUEUE_ORDER} LIMIT 1", (QUEUED_STATUS, now, aging_seconds)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (CLAIMED_STATUS, now, row["id"]))
+    job = dict(row)
+    job["status"] = CLAIMED_STATUS
+    return job
+
+
+def save_checkpoint(audio_key, chunk_index, chunk_start, chunk_end, segments, db_path=JOB_DB_PATH):
+    """
+    Guarda los segmentos de un fragmento ya transcrito.
+
+    :param audio_key: Clave de caché del audio (hash + modelo + idioma).
+    :param chunk_index: Posición del fragmento en el archivo.
+    :param chunk_start: Primera muestra del fragmento (para comprobar que la división no cambió).
+    :param chunk_end: Última muestra del fragmento.
+    :param segments: Segmentos {"start", "end", "text"[, "confidence"]} ya trasladados al archivo original.
+    """
+    data = json.dumps([compact_segment(seg) for seg in segments], ensure_ascii=False)
+    conn = get_connection(db_path)
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO checkpoints (audio_key, chunk_index, chunk_start, chunk_end, segments) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (audio_key, chunk_index, int(chunk_start), int(chunk_end), data),
+        )
+
+
+def load_checkpoints(audio_key, chunks, db_path=JOB_DB_PATH):
+    """
+    Devuelve los segmentos de los fragmentos ya transcritos de un audio.
+
+    :param audio_key: Clave de caché del audio.
+    :param chunks: Límites (inicio, fin) actuales de los fragmentos; se ignoran los puntos de
+                   control cuyos límites no coincidan.
+    :return: Diccionario índice de fragmento -> segmentos.
+    """
+    rows = get_connection(db_path).execute(
+        "SELECT chunk_index, chunk_start, chunk_end, segments FROM checkpoints WHERE audio_key = ?",
+        (audio_key,),
+    ).fetchall()
+    done = {}
+    for row in rows:
+        idx = row["chunk_index"]
+        if idx < len(chunks) and tuple(chunks[idx]) == (row["chunk_start"], row["chunk_end"]):
+            done[idx] = json.loads(row["segments"])
+    return done
+
+
+def clear_checkpoints(audio_key, db_path=JOB_DB_PATH):
+    """Elimina los puntos de control de un audio cuando su transcripción ya está completa."""
+    conn = get_connection(db_path)
+    with conn:
+        conn.execute("DELETE FROM checkpoints WHERE audio_key = ?", (audio_key,))
+
+
+def record_spans(file_name, spans, db_path=JOB_DB_PATH):
+    """
+    Guarda las mediciones de las etapas de un trabajo.
+
+    :param file_name: Trabajo al que pertenecen.
+    :param spans: Diccionarios {"stage", "started_at", "seconds"[, "audio_seconds", "peak_rss_mb",
+                  "torch_threads", "detail"]}.
+    """
+    if not spans:
+        return
+    conn = get_connection(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO spans (file_name, stage, started_at, seconds, audio_seconds, peak_rss_mb, torch_threads, "
+            "detail) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (file_name, span["stage"], span["started_at"], span["seconds"], span.get("audio_seconds"),
+                 span.get("peak_rss_mb"), span.get("torch_threads"), span.get("detail"))
+                for span in spans
+            ],
+        )
+
+
+def get_spans(file_name, db_path=JOB_DB_PATH):
+    """Mediciones de un trabajo en orden cronológico."""
+    rows = get_connection(db_path).execute(
+        "SELECT * FROM spans WHERE file_name = ? ORDER BY started_at, id", (file_name,)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def clear_spans(file_name, db_path=JOB_DB_PATH):
+    """Elimina las mediciones de un trabajo antes de volver a procesarlo."""
+    conn = get_connection(db_path)
+    with conn:
+        conn.execute("DELETE FROM spans WHERE file_name = ?", (file_name,))
+
+
+def stage_breakdown(file_names=None, db_path=JOB_DB_PATH):
+    """
+    Tiempo acumulado por etapa de cada trabajo.
+
+    :param file_names: Trabajos a consultar (por defecto, todos).
+    :return: Diccionario file_name -> {etapa: {"seconds", "audio_seconds"}}.
+    """
+    query = "SELECT file_name, stage, SUM(seconds) AS seconds, SUM(audio_seconds) AS audio_seconds FROM spans"
+    params = []
+    if file_names is not None:
+        file_names = list(file_names)
+        if not file_names:
+            return {}
+        query += f" WHERE file_name IN ({', '.join('?' for _ in file_names)})"
+        params = file_names
+    query += " GROUP BY file_name, stage"
+
+    breakdown = {}
+    for row in get_connection(db_path).execute(query, params):
+        breakdown.setdefault(row["file_name"], {})[row["stage"]] = {
+            "seconds": row["seconds"], "audio_seconds": row["audio_seconds"],
+        }
+    return breakdown
+
+
+def stage_totals(db_path=JOB_DB_PATH):
+    """Totales de todas las mediciones por etapa (para el endpoint de métricas)."""
+    rows = get_connection(db_path).execute(
+        "SELECT stage, COUNT(*) AS count, SUM(seconds) AS seconds, SUM(audio_seconds) AS audio_seconds, "
+        "MAX(peak_rss_mb) AS peak_rss_mb FROM spans GROUP BY stage ORDER BY stage"
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def latest_torch_threads(db_path=JOB_DB_PATH):
+    """Número de hilos de torch de la medición más reciente que lo registró."""
+    row = get_connection(db_path).execute(
+        "SELECT torch_threads FROM spans WHERE torch_threads IS NOT NULL ORDER BY started_at DESC, id DESC LIMIT 1"
+    ).fetchone()
+    return row[0] if row else None
+
+
+def status_counts(db_path=JOB_DB_PATH):
+    """Número de trabajos por estado."""
+    rows = get_connection(db_path).execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def index_transcript(file_name, segments, db_path=JOB_DB_PATH):
+    """
+    Añade los segmentos de una transcripción terminada al índice de búsqueda.
+
+    Reemplaza lo indexado antes para el mismo trabajo; el resto del índice no se toca.
+
+    :param file_name: Trabajo al que pertenecen.
+    :param segments: Transcript, o segmentos {"start", "end", "text"[, "speaker"]} con los tiempos del archivo
+                     original.
+    """
+    conn = get_connection(db_path)
+    with conn:
+        conn.execute("DELETE FROM transcript_segments WHERE file_name = ?", (file_name,))
+        conn.executemany(
+            "INSERT INTO transcript_segments (file_name, start_time, end_time, speaker, text) VALUES (?, ?, ?, ?, ?)",
+            [
+                (file_name, seg["start"], seg["end"], seg.get("speaker"), seg["text"].strip())
+                for seg in segments if seg["text"].strip()
+            ],
+        )
+
+
+def _match_expression(query):
+    """
+    Convierte el texto buscado en una consulta FTS5: deben aparecer todas las palabras y "frases entre comillas".
+
+    Cada término se pasa entre comillas para que los operadores de FTS5 (-, *, :, AND...) se busquen como texto.
+    """
+    terms = [phrase or word for phrase, word in re.findall(r'"([^"]+)"|(\S+)', query)]
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms if term.strip())
+
+
+def search_transcripts(query, limit=20, offset=0, file_name=None, highlight=("**", "**"), db_path=JOB_DB_PATH):
+    """
+    Busca en el texto de todas las transcripciones indexadas.
+
+    Los resultados van de la transcripción más reciente a la más antigua: FTS5 los recorre en ese orden
+    sin tener que puntuar y ordenar todas las coincidencias, así que la consulta no se ralentiza con el
+    tamaño del índice.
+
+    :param query: Palabras o "frases entre comillas" que deben aparecer en el segmento.
+    :param limit: Número máximo de resultados.
+    :param offset: Resultados que se saltan (paginación).
+    :param file_name: Buscar solo en un trabajo (opcional).
+    :param highlight: Marcas de inicio y fin alrededor de los términos encontrados en el fragmento.
+    :return: Lista de diccionarios {"file_name", "start", "end", "speaker", "snippet"}.
+    """
+    expression = _match_expression(query)
+    if not expression:
+        return []
+    sql = (
+        "SELECT s.file_name, s.start_time, s.end_time, s.speaker, "
+        "snippet(transcript_search, 0, ?, ?, '…', 16) AS snippet "
+        "FROM transcript_search JOIN transcript_segments s ON s.id = transcript_search.rowid "
+        "WHERE transcript_search MATCH ?"
+    )
+    params = [highlight[0], highlight[1], expression]
+    if file_name is not None:
+        # Los segmentos de un trabajo se insertan juntos y tienen ids consecutivos: el rango de rowid
+        # deja a FTS5 recorrer solo esa parte del índice
+        sql += (
+            " AND transcript_search.rowid BETWEEN (SELECT MIN(id) FROM transcript_segments WHERE file_name = ?) "
+            "AND (SELECT MAX(id) FROM transcript_segments WHERE file_name = ?) AND s.file_name = ?"
+        )
+        params += [file_name, file_name, file_name]
+    sql += " ORDER BY transcript_search.rowid DESC LIMIT ? OFFSET ?"
+    params += [limit, offset]
+    rows = get_connection(db_path).execute(sql, params).fetchall()
+    return [
+        {"file_name": row["file_name"], "start": row["start_time"], "end": row["end_time"],
+         "speaker": row["speaker"], "snippet": row["snippet"]}
+        for row in rows
+    ]
@@ -0,0 +1,159 @@
+# src/storage/preprocess_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+import wave
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: allí no se puede borrar un WAV que otro proceso tiene abierto
+    fcntl = None
+
+from config.settings import PREPROCESS_CACHE_DIR, PREPROCESS_CACHE_MAX_BYTES, PREPROCESS_CACHE_GRACE_SECONDS
+from src.audio.loader import pcm_args, stream_audio
+
+_lock = threading.Lock()
+
+
+@contextmanager
+def _cache_lock(exclusive=True):
+    """
+    Bloqueo de la caché compartido por los hilos y los procesos del pool de decodificación.
+
+    Se usa un archivo de bloqueo en PREPROCESS_CACHE_DIR (flock); sin fcntl, solo se sincronizan
+    los hilos del proceso.
+
+    :param exclusive: False para un bloqueo compartido (varios aciertos de caché a la vez).
+    """
+    if fcntl is None:
+        with _lock:
+            yield
+        return
+    os.makedirs(PREPROCESS_CACHE_DIR, exist_ok=True)
+    with open(os.path.join(PREPROCESS_CACHE_DIR, ".lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def hash_file(file_path, block_size=1024 * 1024):
+    """Hash SHA-256 del contenido del archivo original, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def convert_to_wav(file_path, wav_path, sample_rate=16000):
+    """
+    Convierte el archivo a WAV (mono, s16) leyendo de ffmpeg por bloques, y calcula a la vez el hash de su audio.
+
+    El hash es el del audio decodificado: dos archivos con el mismo audio tienen el mismo hash aunque
+    cambien el nombre o el contenedor.
+
+    :return: Hash SHA-256 de las muestras s16 escritas.
+    """
+    digest = hashlib.sha256()
+    with wave.open(wav_path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for block in stream_audio(file_path, sample_rate):
+            data = memoryview(block).cast("B")
+            digest.update(data)
+            wav.writeframesraw(data)
+    return digest.hexdigest()
+
+
+def preprocess_key(file_hash, ffmpeg_args):
+    """Clave de la conversión: hash del archivo original y parámetros con los que se ejecuta ffmpeg."""
+    key = f"{file_hash}:{' '.join(ffmpeg_args)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _entry_paths(key):
+    base = os.path.join(PREPROCESS_CACHE_DIR, key)
+    return f"{base}.wav", f"{base}.json"
+
+
+def get_preprocessed_audio(file_path):
+    """
+    Devuelve el WAV (16 kHz, mono, s16) del archivo, convirtiéndolo con ffmpeg solo la primera vez.
+
+    Junto al WAV se guarda el hash de su audio, que es la base de la clave de la caché de transcripciones.
+
+    :param file_path: Ruta del archivo de audio o video subido.
+    :return: Tupla (ruta del WAV en caché, hash del audio decodificado).
+    """
+    wav_path, meta_path = _entry_paths(preprocess_key(hash_file(file_path), pcm_args()))
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            audio_hash = json.load(f)["audio_hash"]
+        # Con el bloqueo, una expulsión en otro proceso no puede borrar el WAV entre la comprobación y el uso
+        with _cache_lock(exclusive=False):
+            if os.path.exists(wav_path):
+                # Marcar la entrada como usada recientemente para la expulsión LRU
+                os.utime(wav_path)
+                return wav_path, audio_hash
+    except (FileNotFoundError, KeyError, json.JSONDecodeError):
+        pass
+    except OSError as e:
+        print(f"Entrada de caché de audio inaccesible {meta_path}: {e}")
+
+    os.makedirs(PREPROCESS_CACHE_DIR, exist_ok=True)
+    # Nombre temporal propio de este proceso: otro puede estar convirtiendo el mismo archivo
+    tmp_path = f"{wav_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        audio_hash = convert_to_wav(file_path, tmp_path)
+    except RuntimeError as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise RuntimeError(f"No se pudo convertir el archivo a WAV: {e}") from e
+    os.replace(tmp_path, wav_path)  # Escritura atómica
+    with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump({"audio_hash": audio_hash, "source": os.path.basename(file_path)}, f)
+    os.replace(f"{meta_path}.tmp", meta_path)
+
+    evict_preprocessed(keep=wav_path)
+    return wav_path, audio_hash
+
+
+def evict_preprocessed(max_bytes=PREPROCESS_CACHE_MAX_BYTES, keep=None, grace_seconds=PREPROCESS_CACHE_GRACE_SECONDS):
+    """
+    Elimina los WAV usados hace más tiempo hasta que la caché quepa en max_bytes.
+
+    Los usados en los últimos grace_seconds se conservan aunque la caché siga por encima del límite:
+    pueden ser de trabajos que todavía esperan a la transcripción y aún no los abrieron.
+
+    :param keep: WAV que no se debe eliminar (el que se acaba de generar).
+    """
+    if not max_bytes or not os.path.isdir(PREPROCESS_CACHE_DIR):
+        return
+
+    with _cache_lock():
+        recent = time.time() - grace_seconds
+        entries = []
+        for entry in os.scandir(PREPROCESS_CACHE_DIR):
+            if entry.is_file() and entry.name.endswith(".wav"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= max_bytes or mtime > recent:
+                break
+            if keep and os.path.abspath(path) == os.path.abspath(keep):
+                continue
+            try:
+                # Si otro trabajo tiene el WAV mapeado, en Linux sigue accesible hasta que lo suelte
+                os.remove(path)
+                total -= size
+                os.remove(f"{os.path.splitext(path)[0]}.json")
+            except OSError as e:
+                print(f"No se pudo eliminar la entrada de caché {path}: {e}")
@@ -0,0 +1,83 @@
+# src/storage/transcription_cache.py
+import hashlib
+import os
+import threading
+
+from config.settings import (
+    WHISPER_MODEL, LANGUAGE, TRANSCRIPTION_CACHE_DIR, TRANSCRIPTION_CACHE_MAX_BYTES
+)
+from utils.transcript import TRANSCRIPT_EXTENSION, Transcript
+
+_lock = threading.Lock()
+
+
+def cache_key(audio_hash, model=WHISPER_MODEL, language=LANGUAGE, diarization=False):
+    """Clave de caché a partir del hash del audio, el modelo, el idioma y si se separan hablantes."""
+    key = f"{audio_hash}:{model}:{language}"
+    if diarization:
+        key += ":diarization"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(TRANSCRIPTION_CACHE_DIR, f"{key}{TRANSCRIPT_EXTENSION}")
+
+
+def get_cached_segments(key):
+    """
+    Devuelve la transcripción guardada para la clave, o None si no está en caché.
+
+    :param key: Clave obtenida con cache_key.
+    :return: Transcript mapeada en memoria (sin copiar ni interpretar el archivo) o None.
+    """
+    path = _entry_path(key)
+    try:
+        segments = Transcript.load(path)
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError) as e:
+        print(f"Entrada de caché corrupta {path}: {e}")
+        return None
+
+    # Marcar la entrada como usada recientemente para la expulsión LRU
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return segments
+
+
+def put_cached_segments(key, segments):
+    """
+    Guarda los segmentos de una transcripción y expulsa entradas antiguas si se supera el tamaño máximo.
+
+    :param key: Clave obtenida con cache_key.
+    :param segments: Transcript, o segmentos {"start", "end", "text"[, "speaker", "confidence"]}.
+    """
+    os.makedirs(TRANSCRIPTION_CACHE_DIR, exist_ok=True)
+    Transcript.from_segments(segments).save(_entry_path(key))  # Escritura atómica
+    evict_cache()
+
+
+def evict_cache(max_bytes=TRANSCRIPTION_CACHE_MAX_BYTES):
+    """Elimina las entradas usadas hace más tiempo hasta que la caché quepa en max_bytes."""
+    if not max_bytes or not os.path.isdir(TRANSCRIPTION_CACHE_DIR):
+        return
+
+    with _lock:
+        entries = []
+        for entry in os.scandir(TRANSCRIPTION_CACHE_DIR):
+            # También las entradas JSON del formato anterior, que ya no se leen
+            if entry.is_file() and entry.name.endswith((TRANSCRIPT_EXTENSION, ".json")):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                print(f"No se pudo eliminar la entrada de caché {path}: {e}")
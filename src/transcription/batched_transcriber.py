@@ -0,0 +1,122 @@
+# src/transcription/batched_transcriber.py
+import torch
+import whisper
+from whisper.audio import CHUNK_LENGTH, N_FRAMES, SAMPLE_RATE
+from whisper.tokenizer import get_tokenizer
+
+from config.settings import WHISPER_MODEL, LANGUAGE, INFERENCE_BATCH_SIZE
+from src.audio.buffer import to_float32
+from src.transcription.model_pool import get_model, default_device, default_dtype
+
+# Duración de cada token de tiempo de Whisper en segundos
+TIME_PRECISION = 0.02
+
+# Tamaño de lote reducido tras quedarse sin memoria, por (modelo, dispositivo)
+_batch_limits = {}
+
+
+def _is_out_of_memory(error):
+    if isinstance(error, torch.cuda.OutOfMemoryError):
+        return True
+    message = str(error).lower()
+    return "out of memory" in message or "can't allocate memory" in message
+
+
+def _parse_segments(tokens, tokenizer, duration):
+    """Convierte los tokens de una ventana en segmentos usando los tokens de tiempo."""
+    timestamp_begin = tokenizer.timestamp_begin
+    segments = []
+    text_tokens = []
+    start = None
+    last_time = 0.0
+
+    for token in tokens:
+        if token >= timestamp_begin:
+            time = (token - timestamp_begin) * TIME_PRECISION
+            if text_tokens:
+                segments.append({
+                    "start": start if start is not None else last_time,
+                    "end": time,
+                    "text": tokenizer.decode(text_tokens),
+                })
+                text_tokens = []
+                start = None
+            else:
+                start = time
+            last_time = time
+        else:
+            text_tokens.append(token)
+
+    # Texto sin token de cierre: termina al final de la ventana
+    if text_tokens:
+        segments.append({
+            "start": start if start is not None else last_time,
+            "end": duration,
+            "text": tokenizer.decode(text_tokens),
+        })
+    return segments
+
+
+def _decode_batch(model, mels, options):
+    return whisper.decode(model, torch.stack(mels), options)
+
+
+def transcribe_windows(windows, batch_size=INFERENCE_BATCH_SIZE, language=LANGUAGE, replica=0,
+                       model_name=WHISPER_MODEL):
+    """
+    Transcribe varias ventanas de hasta 30 s en pasadas conjuntas del modelo.
+
+    Si falta memoria para un lote, se reintenta con la mitad de ventanas.
+
+    :param windows: Lista de ventanas (muestras mono a 16 kHz, int16 o float32), de cualquier archivo.
+    :param batch_size: Número máximo de ventanas por pasada.
+    :param language: Idioma de la transcripción; con "auto", Whisper lo detecta en cada ventana.
+    :param replica: Copia del modelo a usar (una por hilo de inferencia).
+    :param model_name: Modelo Whisper (por defecto, WHISPER_MODEL).
+    :return: Lista con los segmentos {"start", "end", "text"} de cada ventana, con tiempos relativos
+             al inicio de la ventana.
+    """
+    device = default_device()
+    dtype = default_dtype(device)
+    fp16 = dtype == "float16"
+    model = get_model(model_name, device=device, dtype=dtype, replica=replica)
+    if language == "auto":
+        language = None
+    tokenizer = get_tokenizer(
+        model.is_multilingual, num_languages=model.num_languages, language=language, task="transcribe"
+    )
+    options = whisper.DecodingOptions(language=language, task="transcribe", without_timestamps=False, fp16=fp16)
+
+    results = []
+    position = 0
+    limit_key = (model_name, device)
+    batch_size = max(min(int(batch_size), _batch_limits.get(limit_key, batch_size)), 1)
+    while position < len(windows):
+        batch = windows[position:position + batch_size]
+        mels = []
+        for audio in batch:
+            if audio.dtype != "float32":
+                audio = to_float32(audio)
+            mel = whisper.log_mel_spectrogram(audio, model.dims.n_mels)
+            mel = whisper.pad_or_trim(mel, N_FRAMES).to(model.device)
+            mels.append(mel.half() if fp16 else mel)
+
+        try:
+            with torch.no_grad():
+                decoded = _decode_batch(model, mels, options)
+        except RuntimeError as e:
+            if not _is_out_of_memory(e) or batch_size == 1:
+                raise
+            batch_size //= 2
+            _batch_limits[limit_key] = batch_size  # Se recuerda para las siguientes llamadas
+            print(f"Memoria insuficiente; reintentando con lotes de {batch_size} ventanas")
+            if device == "cuda":
+                torch.cuda.empty_cache()
+            continue
+
+        for audio, result in zip(batch, decoded):
+            duration = min(len(audio) / SAMPLE_RATE, CHUNK_LENGTH)
+            results.append(_parse_segments(result.tokens, tokenizer, duration))
+        position += len(batch)
+
+    return results
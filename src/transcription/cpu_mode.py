@@ -0,0 +1,122 @@
+# src/transcription/cpu_mode.py
+import argparse
+import os
+import time
+
+import torch
+from torch import nn
+
+from config.settings import CPU_THREADS, WHISPER_MODEL, CPU_FALLBACK_MODEL
+
+
+def quantize_int8(model):
+    """
+    Aplica cuantización dinámica int8 a las capas lineales de un modelo Whisper.
+
+    :param model: Modelo Whisper en CPU y en fp32.
+    :return: Modelo cuantizado (mismo objeto modificado).
+    """
+    # Whisper usa su propia subclase de nn.Linear y quantize_dynamic solo reconoce nn.Linear,
+    # así que primero se reemplazan por capas estándar con los mismos pesos
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, nn.Linear) and type(child) is not nn.Linear:
+                linear = nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                linear.load_state_dict(child.state_dict())
+                setattr(parent, name, linear)
+    return torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def configure_cpu_threads(workers=1):
+    """
+    Fija los hilos de torch para que los hilos de inferencia no compitan por los núcleos.
+
+    :param workers: Número de hilos de inferencia del proceso.
+    :return: Número de hilos configurado.
+    """
+    threads = CPU_THREADS or max((os.cpu_count() or 1) // max(workers, 1), 1)
+    if torch.get_num_threads() != threads:
+        torch.set_num_threads(threads)
+    return threads
+
+
+def word_error_rate(reference, hypothesis):
+    """Tasa de error por palabra (distancia de edición entre palabras / palabras de referencia)."""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,                               # borrado
+                current[j - 1] + 1,                            # inserción
+                previous[j - 1] + (ref_word != hyp_word),      # sustitución
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def compare_cpu_modes(audio_path, reference_text=None, models=None):
+    """
+    Compara latencia y WER de los modelos en fp32 e int8 sobre el mismo audio en CPU.
+
+    :param audio_path: Ruta del audio de prueba.
+    :param reference_text: Transcripción de referencia; si falta, se usa la del primer modelo en fp32.
+    :param models: Modelos a comparar (por defecto, WHISPER_MODEL y CPU_FALLBACK_MODEL).
+    :return: Lista de diccionarios con model, dtype, load_s, transcribe_s, rtf y wer.
+    """
+    from src.audio.buffer import to_float32
+    from src.audio.loader import load_audio
+    from src.transcription.model_pool import get_model
+
+    models = models or [m for m in (WHISPER_MODEL, CPU_FALLBACK_MODEL) if m]
+    samples, sample_rate = load_audio(audio_path)
+    audio = to_float32(samples)
+    del samples
+    duration = len(audio) / sample_rate
+    configure_cpu_threads()
+
+    results = []
+    for name in models:
+        for dtype in ("float32", "int8"):
+            start = time.perf_counter()
+            model = get_model(name, device="cpu", dtype=dtype)
+            load_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            text = model.transcribe(audio, fp16=False)["text"]
+            transcribe_s = time.perf_counter() - start
+
+            if reference_text is None:
+                reference_text = text
+            results.append({
+                "model": name,
+                "dtype": dtype,
+                "load_s": round(load_s, 2),
+                "transcribe_s": round(transcribe_s, 2),
+                "rtf": round(transcribe_s / duration, 3) if duration else None,
+                "wer": round(word_error_rate(reference_text, text), 4),
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara la transcripción en CPU en fp32 e int8.")
+    parser.add_argument("audio", help="Archivo de audio de prueba")
+    parser.add_argument("--reference", help="Archivo de texto con la transcripción de referencia")
+    parser.add_argument("--models", nargs="+", help="Modelos a comparar")
+    args = parser.parse_args()
+
+    reference = None
+    if args.reference:
+        with open(args.reference, "r", encoding="utf-8") as f:
+            reference = f.read()
+
+    print(f"{'Modelo':<16}{'dtype':<10}{'Carga (s)':>10}{'Transc. (s)':>13}{'RTF':>8}{'WER':>8}")
+    for row in compare_cpu_modes(args.audio, reference, args.models):
+        print(f"{row['model']:<16}{row['dtype']:<10}{row['load_s']:>10}{row['transcribe_s']:>13}"
+              f"{row['rtf']:>8}{row['wer']:>8}")
@@ -0,0 +1,120 @@
+# src/transcription/model_pool.py
+import threading
+from collections import OrderedDict
+
+import torch
+import whisper
+
+from config.settings import WHISPER_MODEL, MODEL_POOL_MAX_BYTES, PRELOAD_MODELS, CPU_INT8_QUANTIZATION
+from src.transcription.cpu_mode import quantize_int8
+
+# Registro de modelos residentes en el proceso: (modelo, dispositivo, dtype, réplica) -> modelo
+# El orden del OrderedDict es el orden de uso (el último es el más reciente)
+_models = OrderedDict()
+_model_sizes = {}
+_lock = threading.Lock()
+# Un bloqueo por clave mientras se carga: la carga (segundos) no bloquea a quien usa otros modelos
+_loading = {}
+
+
+def default_device():
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def default_dtype(device):
+    # En GPU se infiere en fp16; en CPU en fp32, o int8 si está activada la cuantización
+    if device == "cuda":
+        return "float16"
+    return "int8" if CPU_INT8_QUANTIZATION else "float32"
+
+
+def _model_size(model):
+    """Tamaño aproximado en bytes de los pesos y buffers del modelo."""
+    params = sum(p.numel() * p.element_size() for p in model.parameters())
+    buffers = sum(b.numel() * b.element_size() for b in model.buffers())
+    return params + buffers
+
+
+def _evict(key):
+    model = _models.pop(key)
+    _model_sizes.pop(key, None)
+    print(f"Liberando modelo {key[0]} ({key[1]}, {key[2]}) de la memoria")
+    del model
+    if key[1] == "cuda" and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def _evict_to_fit(incoming_size):
+    """Descarga los modelos menos usados hasta que el nuevo quepa en el presupuesto."""
+    if not MODEL_POOL_MAX_BYTES:
+        return
+    while _models and sum(_model_sizes.values()) + incoming_size > MODEL_POOL_MAX_BYTES:
+        oldest_key = next(iter(_models))
+        _evict(oldest_key)
+
+
+def _load(name, device, dtype):
+    model = whisper.load_model(name, device=device)
+    model.eval()
+    if dtype == "int8":
+        if device != "cpu":
+            raise ValueError("La cuantización int8 solo está disponible en CPU")
+        model = quantize_int8(model)
+    return model
+
+
+def get_model(name=WHISPER_MODEL, device=None, dtype=None, replica=0):
+    """
+    Devuelve un modelo Whisper residente, cargándolo solo la primera vez.
+
+    :param name: Nombre del modelo Whisper (por defecto, WHISPER_MODEL).
+    :param device: "cuda" o "cpu" (por defecto, el disponible).
+    :param dtype: Tipo de cómputo de la inferencia ("float16", "float32" o "int8" en CPU).
+    :param replica: Índice de copia; cada hilo de inferencia usa la suya porque whisper
+                    no admite decodificaciones simultáneas sobre el mismo modelo.
+    :return: Modelo Whisper listo para transcribir.
+    """
+    device = device or default_device()
+    dtype = dtype or default_dtype(device)
+    key = (name, device, dtype, replica)
+
+    with _lock:
+        if key in _models:
+            _models.move_to_end(key)
+            return _models[key]
+        key_lock = _loading.setdefault(key, threading.Lock())
+
+    with key_lock:
+        with _lock:
+            if key in _models:  # Lo cargó otro hilo mientras se esperaba
+                _models.move_to_end(key)
+                return _models[key]
+
+        model = _load(name, device, dtype)
+        size = _model_size(model)
+        with _lock:
+            _evict_to_fit(size)
+            _models[key] = model
+            _model_sizes[key] = size
+            _loading.pop(key, None)
+    print(f"Modelo {name} cargado en {device} ({dtype}, {size / 1024 ** 2:.0f} MB)")
+    return model
+
+
+def preload_models(names=None, device=None, dtype=None):
+    """Carga por adelantado los modelos indicados (por defecto, PRELOAD_MODELS)."""
+    for name in names or PRELOAD_MODELS:
+        get_model(name, device=device, dtype=dtype)
+
+
+def loaded_models():
+    """Lista las claves (modelo, dispositivo, dtype, réplica) residentes, de la menos a la más usada."""
+    with _lock:
+        return list(_models.keys())
+
+
+def clear_models():
+    """Descarga todos los modelos del registro."""
+    with _lock:
+        for key in list(_models.keys()):
+            _evict(key)
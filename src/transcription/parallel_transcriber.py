@@ -0,0 +1,119 @@
+# src/transcription/parallel_transcriber.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config.settings import WHISPER_MODEL, LANGUAGE, PARALLEL_SEGMENT_WORKERS, PARALLEL_THREADS_PER_WORKER
+from src.audio.buffer import open_wav
+from src.pipeline.metrics import span
+from utils.transcript import compact_segment
+
+# Pools de procesos por (modelo, procesos); cada proceso conserva su modelo entre archivos
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def threads_per_worker(workers, threads=PARALLEL_THREADS_PER_WORKER):
+    """Hilos de torch de cada proceso para que entre todos no superen los núcleos disponibles."""
+    return threads or max((os.cpu_count() or 1) // max(workers, 1), 1)
+
+
+def _init_worker(model_name, threads):
+    """Fija los hilos del proceso antes de importar torch y carga el modelo una sola vez."""
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Ya se había iniciado el paralelismo entre operaciones
+    from src.transcription.model_pool import get_model
+
+    get_model(model_name)
+
+
+def _get_pool(model_name, workers, threads):
+    with _pools_lock:
+        key = (model_name, workers, threads)
+        if key not in _pools:
+            # "spawn": un proceso hijo creado con fork tras iniciar OpenMP en torch puede bloquearse
+            _pools[key] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, threads),
+            )
+        return _pools[key]
+
+
+def _detect_part(audio_path, start, end, model_name):
+    from src.transcription.whisper_transcriber import detect_language
+
+    samples, _ = open_wav(audio_path)
+    return detect_language(samples[start:end], model_name=model_name)
+
+
+def _transcribe_part(audio_path, start, end, offset, model_name, language):
+    """
+    Transcribe una parte en un proceso del pool.
+
+    :param audio_path: WAV que se mapea en memoria; start/end son los límites de la parte en muestras.
+    :param offset: Segundo del archivo original en que empieza la parte.
+    :param language: Idioma del audio (el mismo para todas las partes del archivo).
+    :return: Tupla (segmentos con tiempos del archivo original, mediciones).
+    """
+    from src.transcription.whisper_transcriber import transcribe_audio
+
+    samples, sample_rate = open_wav(audio_path)
+    spans = []
+    with span("inference", spans, audio_seconds=(end - start) / sample_rate, detail=f"proceso {os.getpid()}"):
+        segments = transcribe_audio(samples[start:end], model_name=model_name, language=language)
+    return [compact_segment(seg, offset) for seg in segments], spans
+
+
+def detect_language(audio_path, start, end, model_name=WHISPER_MODEL, workers=PARALLEL_SEGMENT_WORKERS):
+    """
+    Detecta el idioma de un tramo del WAV en uno de los procesos, que ya tienen el modelo cargado.
+
+    :param start: Muestra inicial del tramo.
+    :param end: Muestra final del tramo.
+    :return: Código del idioma más probable.
+    """
+    pool = _get_pool(model_name, workers, threads_per_worker(workers))
+    return pool.submit(_detect_part, audio_path, start, end, model_name).result()
+
+
+def transcribe_parts(parts, model_name=WHISPER_MODEL, workers=PARALLEL_SEGMENT_WORKERS, language=LANGUAGE):
+    """
+    Reparte las partes de un archivo entre procesos, cada uno con su modelo residente.
+
+    :param parts: Lista de tuplas (índice, ruta del WAV, muestra inicial, muestra final, offset en segundos).
+    :param model_name: Modelo Whisper.
+    :param workers: Número de procesos.
+    :param language: Idioma del audio; conviene detectarlo antes (detect_language) para no repetirlo en cada parte.
+    :return: Generador de (índice, segmentos, mediciones) a medida que terminan las partes,
+             no necesariamente en orden; los tiempos ya están trasladados al archivo original.
+    """
+    pool = _get_pool(model_name, workers, threads_per_worker(workers))
+    futures = {
+        pool.submit(_transcribe_part, path, start, end, offset, model_name, language): idx
+        for idx, path, start, end, offset in parts
+    }
+    try:
+        for future in as_completed(futures):
+            segments, spans = future.result()
+            yield futures[future], segments, spans
+    finally:
+        for future in futures:
+            future.cancel()  # Si falla una parte, no seguir con las que no han empezado
+
+
+def shutdown_pools():
+    """Detiene los procesos y libera sus modelos."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(cancel_futures=True)
+        _pools.clear()
@@ -1,30 +1,55 @@
 # src/transcription/whisper_transcriber.py
-import whisper
 import torch
+import whisper
 from config.settings import WHISPER_MODEL, LANGUAGE
-from src.audio.preprocessor import split_audio
+from src.audio.buffer import to_float32
+from src.transcription.model_pool import get_model, default_device, default_dtype
 
-def transcribe_audio(audio_path):
-    
+if torch.cuda.is_available():
     torch.backends.cuda.matmul.allow_tf32 = True
     torch.backends.cudnn.allow_tf32 = True
 
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = whisper.load_model(WHISPER_MODEL, device=device)
-    result = model.transcribe(audio_path, language=LANGUAGE)
+def detect_language(audio, replica=0, model_name=WHISPER_MODEL):
+    """
+    Detecta el idioma de un fragmento con una sola pasada del codificador sobre sus primeros 30 s.
+
+    :param audio: Muestras mono a 16 kHz (int16 o float32) en un array de NumPy.
+    :param replica: Copia del modelo a usar (una por hilo de inferencia).
+    :param model_name: Modelo Whisper (por defecto, WHISPER_MODEL).
+    :return: Código del idioma más probable, p. ej. "es".
+    """
+    if audio.dtype != "float32":
+        audio = to_float32(audio)
+
+    device = default_device()
+    dtype = default_dtype(device)
+    model = get_model(model_name, device=device, dtype=dtype, replica=replica)
+    if not model.is_multilingual:
+        return "en"  # Los modelos ".en" solo transcriben inglés
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels).to(model.device)
+    _, probs = model.detect_language(mel.half() if dtype == "float16" else mel)
+    return max(probs, key=probs.get)
+
+
+def transcribe_audio(audio, replica=0, model_name=WHISPER_MODEL, language=LANGUAGE):
+    """
+    Transcribe un archivo de audio o un fragmento ya decodificado.
+
+    :param audio: Ruta del archivo, o muestras mono a 16 kHz (int16 o float32) en un array de NumPy.
+    :param replica: Copia del modelo a usar (una por hilo de inferencia).
+    :param model_name: Modelo Whisper (por defecto, WHISPER_MODEL).
+    :param language: Idioma del audio; con "auto", Whisper lo detecta en esta llamada.
+    :return: Lista de segmentos de Whisper con sus tiempos.
+    """
+    if not isinstance(audio, str) and audio.dtype != "float32":
+        audio = to_float32(audio)  # Whisper espera float32 en [-1, 1]
+
+    device = default_device()
+    dtype = default_dtype(device)
+    model = get_model(model_name, device=device, dtype=dtype, replica=replica)  # Se carga una sola vez por proceso
+    if language == "auto":
+        language = None  # Whisper detecta el idioma si no se indica
+    result = model.transcribe(audio, language=language, fp16=(dtype == "float16"))
     
     # Retorna los segmentos en lugar de solo el texto
     return result["segments"]
-
-def transcribe_large_audio(file_path):
-    segments = split_audio(file_path)
-    full_transcription = []
-    
-    for segment in segments:
-        try:
-            segment_transcription = transcribe_audio(segment)
-            full_transcription.extend(segment_transcription)  # Añadir segmentos individuales
-        except Exception as e:
-            print(f"Error al transcribir el segmento {segment}: {e}")
-
-    return full_transcription  # Devuelve la lista de segmentos
@@ -0,0 +1,34 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# Las pruebas importan los módulos desde la raíz del repositorio, como main.py y cli.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Base de datos de trabajos vacía y propia de cada prueba."""
+    return str(tmp_path / "jobs.db")
+
+
+# Sustituto de ffmpeg: copia a stdout los bytes del archivo, que ya son PCM s16le; falla si no existe
+_FAKE_FFMPEG = (
+    "import sys\n"
+    "try:\n"
+    "    data = open(sys.argv[1], 'rb').read()\n"
+    "except OSError as e:\n"
+    "    sys.exit(str(e))\n"
+    "sys.stdout.buffer.write(data)\n"
+)
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """Hace que stream_audio lea archivos PCM crudos sin necesidad de ffmpeg."""
+    from src.audio import loader
+
+    monkeypatch.setattr(loader, "_pcm_command",
+                        lambda audio_path, sample_rate, channels: [sys.executable, "-c", _FAKE_FFMPEG, audio_path])
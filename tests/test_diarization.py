@@ -0,0 +1,40 @@
+# tests/test_diarization.py
+from src.diarization.pyannote_diarizer import assign_speakers
+
+
+def seg(start, end, text="x"):
+    return {"start": start, "end": end, "text": text}
+
+
+def test_speaker_with_the_largest_overlap_wins():
+    segments = [seg(0.0, 4.0), seg(4.0, 10.0)]
+    turns = [(0.0, 3.0, "A"), (3.0, 5.0, "B"), (5.0, 10.0, "A")]
+
+    result = assign_speakers(segments, turns)
+
+    assert [s["speaker"] for s in result] == ["A", "A"]
+    assert result[0]["text"] == "x" and "speaker" not in segments[0]  # No modifica la entrada
+
+
+def test_overlaps_of_the_same_speaker_add_up():
+    # B tiene el turno más largo, pero A suma más tiempo entre sus dos turnos
+    segments = [seg(0.0, 10.0)]
+    turns = [(0.0, 3.0, "A"), (3.0, 7.0, "B"), (7.0, 10.0, "A")]
+    assert assign_speakers(segments, turns)[0]["speaker"] == "A"
+
+
+def test_segments_without_overlap_have_no_speaker():
+    segments = [seg(0.0, 1.0), seg(2.0, 3.0), seg(20.0, 21.0)]
+    turns = [(1.0, 2.0, "A"), (2.5, 3.0, "B")]
+    assert [s["speaker"] for s in assign_speakers(segments, turns)] == [None, "B", None]
+
+
+def test_long_turn_covers_later_segments():
+    # Un turno largo sigue activo después de que terminen los turnos cortos que empezaron más tarde
+    segments = [seg(0.0, 1.0), seg(2.0, 3.0), seg(8.0, 9.0)]
+    turns = [(0.0, 10.0, "A"), (2.0, 2.5, "B"), (2.5, 6.0, "C")]
+    assert [s["speaker"] for s in assign_speakers(segments, turns)] == ["A", "A", "A"]
+
+
+def test_no_turns():
+    assert assign_speakers([seg(0.0, 1.0)], [])[0]["speaker"] is None
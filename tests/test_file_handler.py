@@ -0,0 +1,78 @@
+# tests/test_file_handler.py
+import json
+
+import pytest
+
+from utils.file_handler import PartialTranscriptWriter, partial_paths, save_transcription
+from utils.formatter import format_timestamp
+from utils.transcript import Transcript
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.5, "text": " Buenos días.", "speaker": "SPEAKER_00", "confidence": 0.91},
+    {"start": 3661.2, "end": 3662.0, "text": " Hola \"a\" todos."},
+]
+
+
+def test_format_timestamp():
+    assert format_timestamp(3661.2) == "01:01:01.200"
+    assert format_timestamp(59.9996, ",") == "00:01:00,000"
+
+
+def test_srt(tmp_path):
+    path = tmp_path / "t.srt"
+    save_transcription(SEGMENTS, str(path), "SRT")
+    assert path.read_text(encoding="utf-8") == (
+        "1\n00:00:00,000 --> 00:00:02,500\nSPEAKER_00: Buenos días.\n\n"
+        "2\n01:01:01,200 --> 01:01:02,000\nHola \"a\" todos.\n\n"
+    )
+
+
+def test_vtt(tmp_path):
+    path = tmp_path / "t.vtt"
+    save_transcription(SEGMENTS, str(path), "VTT")
+    assert path.read_text(encoding="utf-8") == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:02.500\n<v SPEAKER_00>Buenos días.\n\n"
+        "01:01:01.200 --> 01:01:02.000\nHola \"a\" todos.\n\n"
+    )
+
+
+def test_json(tmp_path):
+    path = tmp_path / "t.json"
+    save_transcription(SEGMENTS, str(path), "JSON")
+    assert json.loads(path.read_text(encoding="utf-8")) == [
+        {"start": 0.0, "end": 2.5, "text": "Buenos días.", "speaker": "SPEAKER_00", "confidence": 0.91},
+        {"start": 3661.2, "end": 3662.0, "text": "Hola \"a\" todos."},
+    ]
+
+
+def test_empty_json_is_valid(tmp_path):
+    path = tmp_path / "t.json"
+    save_transcription([], str(path), "JSON")
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+
+def test_transcript_exports_like_a_list(tmp_path):
+    from_list, from_transcript = tmp_path / "a.srt", tmp_path / "b.srt"
+    save_transcription(SEGMENTS, str(from_list), "SRT")
+    save_transcription(Transcript.from_segments(SEGMENTS), str(from_transcript), "SRT")
+    assert from_list.read_text(encoding="utf-8") == from_transcript.read_text(encoding="utf-8")
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        save_transcription(SEGMENTS, str(tmp_path / "t.xyz"), "XYZ")
+
+
+def test_partial_writer(tmp_path):
+    output_path = str(tmp_path / "reunion.pdf")
+    writer = PartialTranscriptWriter(output_path)
+    writer.write(SEGMENTS[:1])
+    txt_path, srt_path = partial_paths(output_path)
+    # Lo escrito se puede leer mientras el trabajo sigue en curso
+    assert open(txt_path, encoding="utf-8").read() == "SPEAKER_00: Buenos días.\n"
+
+    writer.write(SEGMENTS[1:])
+    writer.remove()
+    assert not (tmp_path / "reunion.partial.txt").exists() and not (tmp_path / "reunion.partial.srt").exists()
+    assert srt_path.endswith("reunion.partial.srt")
@@ -0,0 +1,181 @@
+# tests/test_job_store.py
+import json
+import time
+
+import pytest
+
+from src.storage.job_store import (
+    ACTIVE_FILTER, CLAIMED_STATUS, ERROR_FILTER, add_job, claim_next_job, clear_checkpoints, count_jobs, enqueue_job,
+    get_connection, get_job, index_transcript, list_jobs, load_checkpoints, save_checkpoint, search_transcripts,
+    update_job
+)
+
+
+def enqueue(db_path, file_name, priority, waited=0.0):
+    assert enqueue_job(file_name, f"/audio/{file_name}", "TXT", "base", priority, db_path=db_path)
+    if waited:
+        conn = get_connection(db_path)
+        with conn:
+            conn.execute("UPDATE jobs SET queued_at = ? WHERE file_name = ?", (time.time() - waited, file_name))
+
+
+def claimed(db_path, aging_seconds):
+    names = []
+    while (job := claim_next_job(aging_seconds, db_path=db_path)) is not None:
+        names.append(job["file_name"])
+    return names
+
+
+def test_claim_by_priority_then_arrival(db_path):
+    enqueue(db_path, "largo1.mp3", priority=1)
+    enqueue(db_path, "corto1.mp3", priority=0)
+    enqueue(db_path, "largo2.mp3", priority=1)
+    enqueue(db_path, "corto2.mp3", priority=0)
+
+    assert claimed(db_path, aging_seconds=3600) == ["corto1.mp3", "corto2.mp3", "largo1.mp3", "largo2.mp3"]
+
+
+def test_waiting_moves_a_job_ahead(db_path):
+    # Tras esperar dos veces aging_seconds, un trabajo de prioridad 1 pasa delante de uno nuevo de prioridad 0
+    enqueue(db_path, "largo.mp3", priority=1, waited=200)
+    enqueue(db_path, "corto.mp3", priority=0)
+
+    assert claimed(db_path, aging_seconds=100) == ["largo.mp3", "corto.mp3"]
+
+
+def test_short_wait_does_not_move_a_job_ahead(db_path):
+    enqueue(db_path, "largo.mp3", priority=1, waited=50)
+    enqueue(db_path, "corto.mp3", priority=0)
+
+    assert claimed(db_path, aging_seconds=100) == ["corto.mp3", "largo.mp3"]
+
+
+def test_claim_marks_the_job_and_empty_queue(db_path):
+    assert claim_next_job(60, db_path=db_path) is None
+    enqueue(db_path, "a.mp3", priority=0)
+
+    job = claim_next_job(60, db_path=db_path)
+    assert job["status"] == CLAIMED_STATUS
+    assert get_job("a.mp3", db_path=db_path)["status"] == CLAIMED_STATUS
+    assert claim_next_job(60, db_path=db_path) is None
+
+
+def segments(*texts):
+    return [{"start": float(i), "end": float(i + 1), "text": text} for i, text in enumerate(texts)]
+
+
+def test_search_words_and_phrases(db_path):
+    index_transcript("reunion.mp3", segments(" El presupuesto del segundo trimestre.", " Nada que ver."),
+                     db_path=db_path)
+
+    assert [r["start"] for r in search_transcripts("trimestre presupuesto", db_path=db_path)] == [0.0]
+    assert search_transcripts('"segundo trimestre"', db_path=db_path)[0]["file_name"] == "reunion.mp3"
+    assert search_transcripts('"trimestre segundo"', db_path=db_path) == []
+    assert search_transcripts("presupuesto ausente", db_path=db_path) == []
+    assert search_transcripts("   ", db_path=db_path) == []
+
+
+def test_search_ignores_accents_and_case(db_path):
+    index_transcript("a.mp3", segments(" La Reunión de Producción."), db_path=db_path)
+
+    results = search_transcripts("reunion produccion", highlight=("[", "]"), db_path=db_path)
+    assert len(results) == 1
+    assert "[Reunión]" in results[0]["snippet"]
+
+
+def test_search_newest_first_and_by_file(db_path):
+    index_transcript("viejo.mp3", segments(" informe anual", " otro informe"), db_path=db_path)
+    index_transcript("nuevo.mp3", [{"start": 5.0, "end": 6.0, "text": " informe", "speaker": "SPEAKER_01"}],
+                     db_path=db_path)
+
+    results = search_transcripts("informe", db_path=db_path)
+    assert [(r["file_name"], r["start"]) for r in results] == [("nuevo.mp3", 5.0), ("viejo.mp3", 1.0),
+                                                               ("viejo.mp3", 0.0)]
+    assert results[0]["speaker"] == "SPEAKER_01"
+    assert len(search_transcripts("informe", limit=1, offset=1, db_path=db_path)) == 1
+    assert {r["file_name"] for r in search_transcripts("informe", file_name="viejo.mp3", db_path=db_path)} == {
+        "viejo.mp3"
+    }
+
+
+def test_reindexing_replaces_the_transcript(db_path):
+    index_transcript("a.mp3", segments(" primera versión"), db_path=db_path)
+    index_transcript("a.mp3", segments(" segunda versión"), db_path=db_path)
+
+    assert search_transcripts("primera", db_path=db_path) == []
+    assert len(search_transcripts("segunda", db_path=db_path)) == 1
+
+
+def test_add_job_keeps_existing_record(db_path):
+    assert add_job("a.mp3", "/audio/a.mp3", "PDF", db_path=db_path)
+    update_job("a.mp3", status="Finalizado", time=12.5, db_path=db_path)
+
+    assert not add_job("a.mp3", "/otra/a.mp3", "TXT", db_path=db_path)
+    job = get_job("a.mp3", db_path=db_path)
+    assert (job["file_path"], job["file_format"], job["status"], job["time"]) == (
+        "/audio/a.mp3", "PDF", "Finalizado", "12.5"
+    )
+    assert get_job("otro.mp3", db_path=db_path) is None
+
+
+def test_update_job_rejects_unknown_fields(db_path):
+    add_job("a.mp3", db_path=db_path)
+    with pytest.raises(ValueError):
+        update_job("a.mp3", db_path=db_path, submitted_at=0)
+
+
+def test_list_jobs_pages(db_path):
+    for i in range(5):
+        add_job(f"audio{i}.mp3", f"/audio/audio{i}.mp3", "TXT", db_path=db_path)
+
+    pages = [[job["file_name"] for job in list_jobs(page, 2, db_path=db_path)] for page in (1, 2, 3, 4)]
+    assert pages == [["audio0.mp3", "audio1.mp3"], ["audio2.mp3", "audio3.mp3"], ["audio4.mp3"], []]
+    newest = list_jobs(1, 2, newest_first=True, db_path=db_path)
+    assert [job["file_name"] for job in newest] == ["audio4.mp3", "audio3.mp3"]
+    assert count_jobs(db_path=db_path) == 5
+
+
+def test_list_jobs_status_filters(db_path):
+    statuses = {"a.mp3": "Pendiente", "b.mp3": "Transcribiendo... (40%)", "c.mp3": "Error: sin audio",
+                "d.mp3": "Finalizado", "e.mp3": CLAIMED_STATUS}
+    for name, status in statuses.items():
+        add_job(name, f"/audio/{name}", "TXT", db_path=db_path)
+        update_job(name, db_path=db_path, status=status)
+
+    def names(status):
+        return [job["file_name"] for job in list_jobs(page_size=None, status=status, db_path=db_path)]
+
+    assert names(ACTIVE_FILTER) == ["b.mp3", "e.mp3"]
+    assert names(ERROR_FILTER) == ["c.mp3"]
+    assert names("Finalizado") == ["d.mp3"]
+    assert count_jobs(status=ACTIVE_FILTER, db_path=db_path) == 2
+
+
+def test_json_registry_is_imported_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry = {"b.mp3": {"status": "Finalizado", "time": 3.2, "download_link": "<a>b</a>"}, "a.mp3": {}}
+    (tmp_path / "file_registry.json").write_text(json.dumps(registry))
+    db_path = str(tmp_path / "migrated.db")
+
+    jobs = list_jobs(page_size=None, db_path=db_path)
+    assert [job["file_name"] for job in jobs] == ["b.mp3", "a.mp3"]  # Se conserva el orden del JSON
+    assert (jobs[0]["status"], jobs[0]["time"]) == ("Finalizado", "3.2")
+    assert jobs[1]["status"] == "Pendiente"
+
+
+def test_checkpoints_resume_only_matching_chunks(db_path):
+    chunks = [(0, 16000), (16000, 48000), (48000, 64000)]
+    first = [{"start": 0.0, "end": 1.0, "text": " uno", "avg_logprob": 0.0, "tokens": [1, 2]}]
+    save_checkpoint("key", 0, *chunks[0], first, db_path=db_path)
+    save_checkpoint("key", 1, 16000, 40000, [{"start": 1.0, "end": 2.5, "text": " dos"}], db_path=db_path)
+    save_checkpoint("key", 5, 64000, 80000, [], db_path=db_path)
+    save_checkpoint("otra", 2, *chunks[2], [{"start": 3.0, "end": 4.0, "text": " otra"}], db_path=db_path)
+
+    # El fragmento 1 cambió de límites y el 5 ya no existe: solo se retoma el 0, y sin los campos de Whisper
+    assert load_checkpoints("key", chunks, db_path=db_path) == {
+        0: [{"start": 0.0, "end": 1.0, "text": " uno", "confidence": 1.0}]
+    }
+
+    clear_checkpoints("key", db_path=db_path)
+    assert load_checkpoints("key", chunks, db_path=db_path) == {}
+    assert list(load_checkpoints("otra", chunks, db_path=db_path)) == [2]
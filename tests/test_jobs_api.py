@@ -0,0 +1,33 @@
+# tests/test_jobs_api.py
+import io
+
+import pytest
+from flask import Flask
+
+from config.settings import WHISPER_MODEL
+from src.api.jobs_api import jobs_api
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(jobs_api)
+    return app.test_client()
+
+
+def _upload(**fields):
+    return {"file": (io.BytesIO(b"audio"), "audio.mp3"), **fields}
+
+
+def test_submit_rejects_unknown_model(client):
+    response = client.post("/api/jobs", data=_upload(model="tiny"), content_type="multipart/form-data")
+
+    assert response.status_code == 400
+    assert WHISPER_MODEL in response.get_json()["models"]
+
+
+def test_submit_rejects_unknown_format(client):
+    response = client.post("/api/jobs", data=_upload(format="ODT"), content_type="multipart/form-data")
+
+    assert response.status_code == 400
+    assert "formats" in response.get_json()
@@ -0,0 +1,91 @@
+# tests/test_loader.py
+import io
+
+import numpy as np
+import pytest
+
+from src.audio.loader import _read_into, pcm_args, stream_audio
+
+
+class TrickleStream(io.BytesIO):
+    """Flujo que entrega como mucho 3 bytes por lectura, como un pipe que todavía se está llenando."""
+
+    def readinto(self, buffer):
+        return super().readinto(memoryview(buffer)[:3])
+
+
+def pcm_file(tmp_path, samples, name="audio.raw"):
+    path = tmp_path / name
+    path.write_bytes(np.asarray(samples, dtype="<i2").tobytes())
+    return str(path)
+
+
+def test_pcm_args():
+    args = pcm_args(8000, 2)
+    assert args[args.index("-ar") + 1] == "8000"
+    assert args[args.index("-ac") + 1] == "2"
+    assert args[-2:] == ["-f", "s16le"]
+    assert pcm_args() != pcm_args(16000, 2)
+
+
+def test_read_into_fills_the_buffer_across_short_reads():
+    buffer = np.zeros(4, dtype="<i2")
+    assert _read_into(TrickleStream(np.arange(4, dtype="<i2").tobytes()), buffer) == 8
+    assert buffer.tolist() == [0, 1, 2, 3]
+
+
+def test_read_into_stops_at_the_end():
+    buffer = np.zeros(4, dtype="<i2")
+    assert _read_into(TrickleStream(b"\x01\x00\x02\x00"), buffer) == 4
+    assert buffer[:2].tolist() == [1, 2]
+
+
+def test_stream_audio_blocks(tmp_path, fake_ffmpeg):
+    path = pcm_file(tmp_path, np.arange(250))
+
+    blocks = [block.copy() for block in stream_audio(path, sample_rate=100, block_seconds=1)]
+
+    assert [len(block) for block in blocks] == [100, 100, 50]
+    assert np.concatenate(blocks).tolist() == list(range(250))
+
+
+def test_stream_audio_exact_multiple_has_no_empty_block(tmp_path, fake_ffmpeg):
+    path = pcm_file(tmp_path, np.arange(200))
+
+    assert [len(block) for block in stream_audio(path, sample_rate=100, block_seconds=1)] == [100, 100]
+
+
+def test_stream_audio_reuses_one_buffer(tmp_path, fake_ffmpeg):
+    path = pcm_file(tmp_path, np.arange(300))
+
+    blocks = list(stream_audio(path, sample_rate=100, block_seconds=1))
+
+    assert all(np.shares_memory(blocks[0], block) for block in blocks[1:])
+
+
+def test_stream_audio_stereo(tmp_path, fake_ffmpeg):
+    path = pcm_file(tmp_path, np.arange(20))
+
+    blocks = list(stream_audio(path, sample_rate=10, channels=2, block_seconds=1))
+
+    assert blocks[0].shape == (10, 2)
+    assert blocks[0][1].tolist() == [2, 3]
+
+
+def test_stream_audio_errors(tmp_path, fake_ffmpeg):
+    with pytest.raises(FileNotFoundError):
+        list(stream_audio(str(tmp_path / "no_existe.raw")))
+
+    unreadable = tmp_path / "carpeta.raw"
+    unreadable.mkdir()  # Existe, pero el sustituto de ffmpeg no puede leerlo
+    with pytest.raises(RuntimeError):
+        list(stream_audio(str(unreadable)))
+
+
+def test_stream_audio_can_be_abandoned(tmp_path, fake_ffmpeg):
+    # Más de lo que cabe en el pipe: el proceso sigue escribiendo cuando se deja de leer
+    path = pcm_file(tmp_path, np.zeros(1_000_000))
+
+    blocks = stream_audio(path, sample_rate=100, block_seconds=1)
+    assert len(next(blocks)) == 100
+    blocks.close()
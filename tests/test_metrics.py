@@ -0,0 +1,55 @@
+# tests/test_metrics.py
+import pytest
+
+from src.pipeline.metrics import make_span, real_time_factor, render_prometheus, span
+from src.storage.job_store import add_job, record_spans, update_job
+
+
+def test_span_measures_the_block():
+    spans = []
+    with span("decode", spans, detail="x") as entry:
+        entry["audio_seconds"] = 60.0
+    assert len(spans) == 1
+    assert spans[0]["stage"] == "decode" and spans[0]["detail"] == "x" and spans[0]["audio_seconds"] == 60.0
+    assert spans[0]["seconds"] >= 0 and "peak_rss_mb" in spans[0] and "torch_threads" in spans[0]
+
+
+def test_span_is_recorded_when_the_block_fails():
+    spans = []
+    with pytest.raises(RuntimeError):
+        with span("inference", spans):
+            raise RuntimeError("fallo")
+    assert [entry["stage"] for entry in spans] == ["inference"]
+
+
+def test_real_time_factor():
+    assert real_time_factor(30.0, 60.0) == 0.5
+    assert real_time_factor(30.0, None) is None
+    assert real_time_factor(None, 60.0) is None
+
+
+def test_render_prometheus(db_path):
+    for name, status in (("a.mp3", "Finalizado"), ("b.mp3", "Error: disco lleno"), ("c.mp3", "Error: otro"),
+                         ("d.mp3", None)):
+        add_job(name, db_path=db_path)
+        if status:
+            update_job(name, status=status, db_path=db_path)
+    record_spans("a.mp3", [make_span("inference", 0.0, 30.0, 60.0, detail='fragmento "0"'),
+                           make_span("inference", 1.0, 10.0, 40.0), make_span("export", 2.0, 1.5)],
+                 db_path=db_path)
+
+    text = render_prometheus(db_path)
+    lines = text.splitlines()
+
+    assert text.endswith("\n")
+    # Los errores se agrupan en una sola serie, sin el mensaje
+    assert 'transcriptor_jobs{status="Error"} 2' in lines
+    assert 'transcriptor_jobs{status="Finalizado"} 1' in lines
+    assert 'transcriptor_jobs{status="Pendiente"} 1' in lines
+    assert 'transcriptor_stage_spans_total{stage="inference"} 2' in lines
+    assert 'transcriptor_stage_seconds_total{stage="inference"} 40.0' in lines
+    assert 'transcriptor_stage_audio_seconds_total{stage="inference"} 100.0' in lines
+    assert 'transcriptor_stage_real_time_factor{stage="inference"} 0.4' in lines
+    # Sin segundos de audio no hay factor de tiempo real para la etapa
+    assert not any(line.startswith('transcriptor_stage_real_time_factor{stage="export"}') for line in lines)
+    assert "# TYPE transcriptor_stage_seconds_total counter" in lines
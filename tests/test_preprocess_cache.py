@@ -0,0 +1,84 @@
+# tests/test_preprocess_cache.py
+import os
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from src.audio.loader import pcm_args
+from src.storage import preprocess_cache
+from src.storage.preprocess_cache import evict_preprocessed, get_preprocessed_audio, preprocess_key
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "preprocessed"
+    monkeypatch.setattr(preprocess_cache, "PREPROCESS_CACHE_DIR", str(path))
+    return path
+
+
+def cache_entry(cache_dir, name, size, age):
+    """Entrada falsa de la caché de size bytes, usada por última vez hace age segundos."""
+    cache_dir.mkdir(exist_ok=True)
+    wav = cache_dir / f"{name}.wav"
+    wav.write_bytes(b"\0" * size)
+    (cache_dir / f"{name}.json").write_text("{}")
+    used = time.time() - age
+    os.utime(wav, (used, used))
+    return wav
+
+
+def entries(cache_dir):
+    return sorted(path.stem for path in cache_dir.glob("*.wav"))
+
+
+def test_preprocess_key_depends_on_ffmpeg_args():
+    assert preprocess_key("abc", pcm_args()) == preprocess_key("abc", pcm_args())
+    assert preprocess_key("abc", pcm_args()) != preprocess_key("abc", pcm_args(8000))
+    assert preprocess_key("abc", pcm_args()) != preprocess_key("abd", pcm_args())
+
+
+def test_evicts_least_recently_used_first(cache_dir):
+    cache_entry(cache_dir, "antigua", 100, age=300)
+    cache_entry(cache_dir, "media", 100, age=200)
+    cache_entry(cache_dir, "nueva", 100, age=100)
+
+    evict_preprocessed(max_bytes=150, grace_seconds=0)
+
+    assert entries(cache_dir) == ["nueva"]
+    assert not (cache_dir / "antigua.json").exists()
+
+
+def test_eviction_keeps_recent_entries(cache_dir):
+    cache_entry(cache_dir, "antigua", 100, age=7200)
+    cache_entry(cache_dir, "reciente", 100, age=60)
+
+    evict_preprocessed(max_bytes=50, grace_seconds=3600)
+
+    # La reciente puede ser de un trabajo que aún no la abrió: se conserva aunque se supere el límite
+    assert entries(cache_dir) == ["reciente"]
+
+
+def test_eviction_skips_the_entry_to_keep(cache_dir):
+    keep = cache_entry(cache_dir, "generada", 100, age=300)
+    cache_entry(cache_dir, "otra", 100, age=200)
+
+    evict_preprocessed(max_bytes=150, keep=str(keep), grace_seconds=0)
+
+    assert entries(cache_dir) == ["generada"]
+
+
+def test_converts_once_and_reuses_the_wav(tmp_path, cache_dir, fake_ffmpeg, monkeypatch):
+    source = tmp_path / "audio.raw"
+    source.write_bytes(np.arange(1600, dtype="<i2").tobytes())
+
+    wav_path, audio_hash = get_preprocessed_audio(str(source))
+    with wave.open(wav_path) as wav:
+        assert (wav.getframerate(), wav.getnchannels(), wav.getnframes()) == (16000, 1, 1600)
+
+    def fail(*args):
+        raise AssertionError("no debería volver a convertirse")
+
+    monkeypatch.setattr(preprocess_cache, "convert_to_wav", fail)
+    assert get_preprocessed_audio(str(source)) == (wav_path, audio_hash)
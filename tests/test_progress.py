@@ -0,0 +1,32 @@
+# tests/test_progress.py
+from utils.formatter import TABLE_HEADER, format_status
+from utils.progress import ProgressTable
+
+
+def test_render_only_reformats_changed_rows():
+    table = ProgressTable([["a.mp3", "En cola", "-", "-"], ["b.mp3", "En cola", "-", "-"]])
+    first = table.render()
+    assert first.startswith(TABLE_HEADER)
+    assert table.changed_rows() == []
+
+    table.update(1, status="Transcribiendo... (50%)")
+    assert table.changed_rows() == [1]
+    lines = table.render().splitlines()
+    assert "En cola" in lines[2]
+    assert "Transcribiendo... (50%)" in lines[3]
+    assert table.changed_rows() == []
+
+
+def test_update_replaces_the_whole_row():
+    table = ProgressTable([["a.mp3", "Iniciando...", "-", "-"]])
+    table.update(0, row=["a.mp3", "Finalizado", 12.5, "enlace", "inferencia 10.0 s"])
+
+    assert table.render().splitlines()[2].endswith("| 12.5 | enlace | inferencia 10.0 s |")
+
+
+def test_status_styles_cover_the_pipeline_statuses():
+    for status in ("Pendiente", "En cola", "Iniciando...", "Fragmentando...", "Transcribiendo... (40%)",
+                   "Generando documento...", "Finalizado", "Error: sin audio"):
+        assert format_status(status).startswith("<span style=")
+        assert status in format_status(status)
+    assert format_status("Desconocido") == "Desconocido"
@@ -0,0 +1,63 @@
+# tests/test_transcript.py
+import pickle
+
+import numpy as np
+import pytest
+
+from utils.transcript import Transcript, compact_segment
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.5, "text": " Hola, ¿qué tal?", "speaker": "SPEAKER_00", "confidence": 0.912},
+    {"start": 2.5, "end": 4.0, "text": " Bien, gracias."},
+    {"start": 4.0, "end": 7.25, "text": " Año y señal: ñandú.", "speaker": "SPEAKER_01"},
+    {"start": 7.25, "end": 8.0, "text": "", "speaker": "SPEAKER_00", "confidence": 0.5},
+]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "t.trs"
+    Transcript.from_segments(SEGMENTS).save(path)
+    loaded = Transcript.load(path)
+
+    assert len(loaded) == len(SEGMENTS)
+    assert list(loaded) == SEGMENTS
+    assert loaded[-1] == SEGMENTS[-1]
+    assert isinstance(loaded.start, np.memmap) or isinstance(loaded.start.base, np.memmap)
+
+
+def test_empty_transcript(tmp_path):
+    path = tmp_path / "empty.trs"
+    Transcript.from_segments([]).save(path)
+    assert list(Transcript.load(path)) == []
+
+
+def test_pickle_sends_columns(tmp_path):
+    path = tmp_path / "t.trs"
+    Transcript.from_segments(SEGMENTS).save(path)
+    copy = pickle.loads(pickle.dumps(Transcript.load(path)))
+    assert list(copy) == SEGMENTS
+
+
+def test_index_out_of_range():
+    transcript = Transcript.from_segments(SEGMENTS)
+    with pytest.raises(IndexError):
+        transcript[len(SEGMENTS)]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.trs"
+    path.write_bytes(b"no es una transcripcion")
+    with pytest.raises(ValueError):
+        Transcript.load(path)
+
+    good = tmp_path / "good.trs"
+    Transcript.from_segments(SEGMENTS).save(good)
+    truncated = tmp_path / "truncated.trs"
+    truncated.write_bytes(good.read_bytes()[:-10])
+    with pytest.raises(ValueError):
+        Transcript.load(truncated)
+
+
+def test_compact_segment_keeps_only_stored_fields():
+    seg = {"id": 3, "start": 1.0, "end": 2.0, "text": " hola", "tokens": [1, 2], "avg_logprob": 0.0}
+    assert compact_segment(seg, offset=30.0) == {"start": 31.0, "end": 32.0, "text": " hola", "confidence": 1.0}
@@ -0,0 +1,60 @@
+# tests/test_transcription_cache.py
+import os
+import time
+
+import pytest
+
+from src.storage import transcription_cache
+from src.storage.transcription_cache import cache_key, evict_cache, get_cached_segments, put_cached_segments
+
+SEGMENTS = [{"start": 0.0, "end": 1.5, "text": " hola"}, {"start": 1.5, "end": 3.0, "text": " adiós"}]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "transcriptions"
+    monkeypatch.setattr(transcription_cache, "TRANSCRIPTION_CACHE_DIR", str(path))
+    return path
+
+
+def test_cache_key_depends_on_every_part():
+    base = cache_key("abc", model="small", language="es")
+    assert base == cache_key("abc", model="small", language="es")
+    assert len(base) == 64
+    assert len({
+        base,
+        cache_key("abd", model="small", language="es"),
+        cache_key("abc", model="medium", language="es"),
+        cache_key("abc", model="small", language="auto"),
+        cache_key("abc", model="small", language="es", diarization=True),
+    }) == 5
+
+
+def test_round_trip_and_miss(cache_dir):
+    key = cache_key("abc")
+    assert get_cached_segments(key) is None
+
+    put_cached_segments(key, SEGMENTS)
+    assert list(get_cached_segments(key)) == SEGMENTS
+
+
+def test_corrupt_entry_is_a_miss(cache_dir):
+    key = cache_key("abc")
+    put_cached_segments(key, SEGMENTS)
+    path = next(cache_dir.iterdir())
+    path.write_bytes(b"basura")
+    assert get_cached_segments(key) is None
+
+
+def test_eviction_removes_least_recently_used(cache_dir):
+    keys = [cache_key(str(i)) for i in range(3)]
+    for age, key in zip((300, 200, 100), keys):
+        put_cached_segments(key, SEGMENTS)
+        path = cache_dir / f"{key}.trs"
+        os.utime(path, (time.time() - age, time.time() - age))
+    get_cached_segments(keys[0])  # Usarla la pasa al final del orden LRU
+
+    evict_cache(max_bytes=2 * os.path.getsize(cache_dir / f"{keys[0]}.trs"))
+
+    assert get_cached_segments(keys[1]) is None
+    assert get_cached_segments(keys[0]) is not None and get_cached_segments(keys[2]) is not None
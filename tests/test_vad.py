@@ -0,0 +1,66 @@
+# tests/test_vad.py
+import numpy as np
+
+from src.audio.vad import detect_speech_chunks, split_windows
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * 32767 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16)
+
+
+def test_silence_has_no_chunks():
+    assert detect_speech_chunks(silence(5)) == []
+    assert detect_speech_chunks(np.zeros(0, dtype=np.int16)) == []
+
+
+def test_long_silence_separates_chunks():
+    samples = np.concatenate([silence(1), tone(2), silence(3), tone(2)])
+    chunks = detect_speech_chunks(samples, padding=0.2)
+
+    assert len(chunks) == 2
+    (first_start, first_end), (second_start, second_end) = chunks
+    # Cada tramo conserva su margen y la voz queda dentro
+    assert abs(first_start - 0.8 * SAMPLE_RATE) <= 0.05 * SAMPLE_RATE
+    assert abs(first_end - 3.2 * SAMPLE_RATE) <= 0.05 * SAMPLE_RATE
+    assert second_start <= 6 * SAMPLE_RATE < 8 * SAMPLE_RATE <= second_end
+    assert second_end <= len(samples)
+
+
+def test_short_silence_stays_inside_the_chunk():
+    samples = np.concatenate([tone(2), silence(0.5), tone(2)])
+    chunks = detect_speech_chunks(samples, min_silence=1.0)
+
+    assert len(chunks) == 1
+    assert chunks[0][0] == 0
+    assert chunks[0][1] == len(samples)
+
+
+def test_long_speech_is_split_at_max_chunk():
+    samples = tone(10)
+    chunks = detect_speech_chunks(samples, max_chunk=3)
+
+    assert len(chunks) >= 4
+    assert all(end - start <= 3 * SAMPLE_RATE for start, end in chunks)
+    # Los fragmentos cubren el audio sin huecos ni solapes
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(samples)
+    assert all(prev[1] == cur[0] for prev, cur in zip(chunks, chunks[1:]))
+
+
+def test_split_windows_offsets():
+    audio = tone(65)
+    windows = split_windows(audio, offset=10.0)
+
+    assert [offset for _, offset in windows] == [10.0, 40.0, 70.0]
+    assert [len(window) for window, _ in windows] == [30 * SAMPLE_RATE, 30 * SAMPLE_RATE, 5 * SAMPLE_RATE]
+    assert np.shares_memory(windows[0][0], audio)  # Vistas, sin copiar las muestras
+
+
+def test_split_windows_empty():
+    assert split_windows(np.zeros(0, dtype=np.int16)) == []
@@ -1,25 +1,45 @@
 # utils/file_handler.py
-from docx import Document
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.enums import TA_JUSTIFY
+# python-docx y reportlab se importan dentro de cada función para no retrasar el arranque
+import json
+import os
 import textwrap
+from xml.sax.saxutils import escape
 
-def save_as_text(text, file_path):
+from utils.formatter import format_timestamp
+
+# Los exportadores reciben los segmentos {"start", "end", "text"[, "speaker", "confidence"]} (una lista
+# o una Transcript) y escriben un párrafo o una línea por segmento a medida que los recorren.
+EXPORT_FORMATS = ("TXT", "DOCX", "PDF", "SRT", "VTT", "JSON")
+
+
+def _segment_text(seg):
+    text = seg["text"].strip()
+    return f"{seg['speaker']}: {text}" if seg.get("speaker") else text
+
+
+def save_as_text(segments, file_path):
     try:
         with open(file_path, "w", encoding="utf-8") as f:
-            f.write(text)
+            for seg in segments:
+                f.write(f"{_segment_text(seg)}\n")
     except Exception as e:
         print("Error al guardar el archivo de texto:", e)
 
-def save_as_docx(text, file_path="transcription.docx"):
+def save_as_docx(segments, file_path="transcription.docx"):
+    from docx import Document
+
     doc = Document()
-    doc.add_paragraph(text)
+    doc.add_heading("Transcripción Generada", level=1)
+    for seg in segments:
+        paragraph = doc.add_paragraph()
+        paragraph.add_run(f"[{format_timestamp(seg['start'])[:8]}] ").bold = True
+        paragraph.add_run(_segment_text(seg))
     doc.save(file_path)
 
 def save_as_pdf_normal(text, file_path="transcription.pdf"):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
     c = canvas.Canvas(file_path, pagesize=letter)
     width, height = letter
     y_position = height - 40  # Inicializa la posición en la parte superior
@@ -42,7 +62,12 @@ def save_as_pdf_normal(text, file_path="transcription.pdf"):
     c.save()
 
 
-def save_as_pdf(text, file_path="transcription.pdf"):
+def save_as_pdf(segments, file_path="transcription.pdf"):
+    from reportlab.lib.enums import TA_JUSTIFY
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
     # Crear documento PDF
     doc = SimpleDocTemplate(file_path, pagesize=letter)
     styles = getSampleStyleSheet()
@@ -52,16 +77,118 @@ def save_as_pdf(text, file_path="transcription.pdf"):
     style.alignment = TA_JUSTIFY
     style.fontSize = 11
     style.leading = 14  # Espaciado entre líneas
+    style.spaceAfter = 4
 
     # Título del documento
     title_style = styles["Title"]
     title = Paragraph("Transcripción Generada", title_style)
 
-    # Unir las líneas del texto en párrafos completos
+    # Un párrafo por segmento: reportlab compone cada uno por separado, así que el coste crece
+    # linealmente con la longitud en lugar de maquetar un único bloque gigante
     paragraphs = [title, Spacer(1, 12)]  # Título con espacio
-    processed_text = text.replace("\n", " ").strip()  # Combina el texto en un solo bloque
-    paragraphs.append(Paragraph(processed_text, style))
+    for seg in segments:
+        timestamp = format_timestamp(seg["start"])[:8]
+        paragraphs.append(Paragraph(f"<b>[{timestamp}]</b> {escape(_segment_text(seg))}", style))
 
     # Construir el PDF
     doc.build(paragraphs)
 
+
+def save_as_srt(segments, file_path="transcription.srt"):
+    with open(file_path, "w", encoding="utf-8") as f:
+        for index, seg in enumerate(segments, start=1):
+            f.write(
+                f"{index}\n"
+                f"{format_timestamp(seg['start'], ',')} --> {format_timestamp(seg['end'], ',')}\n"
+                f"{_segment_text(seg)}\n\n"
+            )
+
+
+def save_as_vtt(segments, file_path="transcription.vtt"):
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("WEBVTT\n\n")
+        for seg in segments:
+            text = seg["text"].strip()
+            if seg.get("speaker"):
+                text = f"<v {seg['speaker']}>{text}"  # Etiqueta de voz de WebVTT
+            f.write(f"{format_timestamp(seg['start'])} --> {format_timestamp(seg['end'])}\n{text}\n\n")
+
+
+def save_as_json(segments, file_path="transcription.json"):
+    # Se escribe segmento a segmento en lugar de serializar la lista completa de una vez
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for index, seg in enumerate(segments):
+            entry = {"start": seg["start"], "end": seg["end"], "text": seg["text"].strip()}
+            if seg.get("speaker"):
+                entry["speaker"] = seg["speaker"]
+            if seg.get("confidence") is not None:
+                entry["confidence"] = seg["confidence"]
+            f.write(("," if index else "") + "\n  " + json.dumps(entry, ensure_ascii=False))
+        f.write("\n]\n")
+
+
+_EXPORTERS = {
+    "TXT": save_as_text,
+    "DOCX": save_as_docx,
+    "PDF": save_as_pdf,
+    "SRT": save_as_srt,
+    "VTT": save_as_vtt,
+    "JSON": save_as_json,
+}
+
+
+def save_transcription(segments, file_path, file_format):
+    """Guarda los segmentos en el formato seleccionado (uno de EXPORT_FORMATS)."""
+    exporter = _EXPORTERS.get(file_format)
+    if exporter is None:
+        raise ValueError(f"Formato no soportado: {file_format}")
+    exporter(segments, file_path)
+
+
+def partial_paths(output_path):
+    """Rutas (TXT, SRT) de la transcripción parcial de un documento de salida."""
+    base = os.path.splitext(output_path)[0]
+    return f"{base}.partial.txt", f"{base}.partial.srt"
+
+
+class PartialTranscriptWriter:
+    """
+    Escribe una transcripción parcial en TXT y SRT a medida que llegan los segmentos.
+
+    Los archivos se llaman <salida>.partial.txt y <salida>.partial.srt y se pueden abrir mientras
+    el trabajo sigue en curso; no se guarda el texto en memoria.
+    """
+
+    def __init__(self, output_path):
+        self.paths = partial_paths(output_path)
+        self._txt = open(self.paths[0], "w", encoding="utf-8")
+        self._srt = open(self.paths[1], "w", encoding="utf-8")
+        self._index = 0
+
+    def write(self, segments):
+        for seg in segments:
+            text = _segment_text(seg)
+            self._index += 1
+            self._txt.write(f"{text}\n")
+            self._srt.write(
+                f"{self._index}\n"
+                f"{format_timestamp(seg['start'], ',')} --> {format_timestamp(seg['end'], ',')}\n"
+                f"{text}\n\n"
+            )
+        # Vaciar el búfer para que el archivo refleje el progreso real
+        self._txt.flush()
+        self._srt.flush()
+
+    def close(self):
+        self._txt.close()
+        self._srt.close()
+
+    def remove(self):
+        """Elimina los archivos parciales (cuando ya existe el documento final)."""
+        self.close()
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,104 @@
+# utils/formatter.py
+import os
+from pathlib import Path
+
+TABLE_HEADER = "| Nombre | Estado | Tiempo (s) | Descargar | Etapas |\n| --- | --- | --- | --- | --- |\n"
+
+# Estilo de cada estado; los que llevan detalle ("Transcribiendo... (40%)", "Error: ...") usan el de su prefijo
+STATUS_STYLES = {
+    "Pendiente": "color: orange; font-weight: bold;",
+    "En cola": "color: orange; font-weight: bold;",
+    "Iniciando...": "color: blue; font-weight: bold;",
+    "Fragmentando...": "color: blue; font-weight: bold;",
+    "Transcribiendo...": "color: blue; font-weight: bold;",
+    "Generando documento...": "color: blue; font-weight: bold;",
+    "Finalizado": "color: green; font-weight: bold;",
+    "Error": "color: red; font-weight: bold;",
+}
+
+
+def format_status(status):
+    style = STATUS_STYLES.get(status.split(" (")[0].split(":")[0])
+    if style is None:
+        return status
+    return f'<span style="{style}">{status}</span>'  # Devuelve el estado con su estilo
+
+
+# Nombres de las etapas medidas en el desglose de la tabla
+STAGE_LABELS = {
+    "queue_wait": "cola",
+    "decode": "decodificación",
+    "split": "división",
+    "model_load": "modelo",
+    "language": "idioma",
+    "inference": "inferencia",
+    "diarization": "diarización",
+    "export": "exportación",
+}
+
+
+def format_markdown_row(row):
+    """Formatea una fila [nombre, estado, tiempo, enlace, desglose opcional] de la tabla de resultados."""
+    breakdown = row[4] if len(row) > 4 else ""
+    return f"| {row[0]} | {format_status(row[1])} | {row[2]} | {row[3]} | {breakdown} |\n"
+
+
+def format_stage_breakdown(stages):
+    """
+    Resume el tiempo de cada etapa de un trabajo, p. ej. "decodificación 3.1 s · inferencia 40.2 s · RTF 0.12".
+
+    :param stages: Diccionario etapa -> {"seconds", "audio_seconds"} (ver job_store.stage_breakdown).
+    """
+    if not stages:
+        return ""
+    parts = [
+        f"{label} {stages[stage]['seconds']:.1f} s"
+        for stage, label in STAGE_LABELS.items() if stage in stages
+    ]
+    total = stages.get("total")
+    if total and total["audio_seconds"]:
+        parts.append(f"RTF {total['seconds'] / total['audio_seconds']:.2f}")
+    return " · ".join(parts)
+
+
+def format_download_link(output_path):
+    """Enlace de descarga del documento a través del servidor de archivos de Gradio."""
+    document_url = f"/gradio_api/file={Path(output_path).as_posix()}"
+    return f"<a href='{document_url}' download='{os.path.basename(output_path)}'>Descargar ⇣</a>"
+
+
+def format_timestamp(seconds, separator="."):
+    """Formatea segundos como hh:mm:ss.mmm (separator="," para SRT)."""
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
+
+
+# Función para formatear los datos en Markdown
+SEARCH_HEADER = "| Archivo | Momento | Texto |\n| --- | --- | --- |\n"
+
+
+def format_search_results(results):
+    """Tabla Markdown con los resultados de search_transcripts (archivo, momento y fragmento resaltado)."""
+    if not results:
+        return "Sin resultados."
+    lines = [SEARCH_HEADER]
+    for result in results:
+        snippet = " ".join(result["snippet"].split()).replace("|", "\\|")
+        if result.get("speaker"):
+            snippet = f"{result['speaker']}: {snippet}"
+        lines.append(f"| {result['file_name']} | {format_timestamp(result['start'])[:8]} | {snippet} |\n")
+    return "".join(lines)
+
+
+def format_markdown_table(data):
+    lines = [TABLE_HEADER]
+    for row in data:
+        try:
+            lines.append(format_markdown_row(row))
+        except Exception as e:
+            # Captura cualquier problema con los datos
+            print(f"Error al procesar la fila: {row}. Error: {e}")
+    return "".join(lines)
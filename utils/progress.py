@@ -0,0 +1,35 @@
+# utils/progress.py
+from utils.formatter import TABLE_HEADER, format_markdown_row
+
+
+class ProgressTable:
+    """
+    Tabla de resultados que se actualiza fila a fila.
+
+    Solo se vuelven a formatear las filas que cambiaron; la frecuencia de refresco la marca el
+    temporizador de la interfaz (RESULTS_REFRESH_SECONDS).
+    """
+
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]
+        self._formatted = [format_markdown_row(row) for row in self.rows]
+        self._dirty = set()
+
+    def update(self, idx, status=None, row=None):
+        """Cambia el estado de una fila, o la fila completa si se indica row."""
+        if row is not None:
+            self.rows[idx] = list(row)
+        else:
+            self.rows[idx][1] = status
+        self._dirty.add(idx)
+
+    def changed_rows(self):
+        """Índices de las filas modificadas desde el último refresco."""
+        return sorted(self._dirty)
+
+    def render(self):
+        """Devuelve la tabla en Markdown y marca los cambios como enviados."""
+        for idx in self._dirty:
+            self._formatted[idx] = format_markdown_row(self.rows[idx])
+        self._dirty.clear()
+        return TABLE_HEADER + "".join(self._formatted)
@@ -0,0 +1,164 @@
+# utils/transcript.py
+import json
+import math
+import os
+import struct
+
+import numpy as np
+
+# Formato en disco (little-endian; cada columna empieza alineada a 8 bytes para mapearla sin copias):
+#   cabecera: MAGIC, versión (u4), longitud del JSON (u4) y JSON {"count", "text_bytes", "speakers"}
+#   columnas: start (f8), end (f8), offsets del texto (u8, count + 1), speaker (i2), confidence (f2)
+#   y el texto de todos los segmentos en UTF-8
+MAGIC = b"TRSC"
+VERSION = 1
+TRANSCRIPT_EXTENSION = ".trs"
+
+_HEADER = struct.Struct("<4sII")
+
+
+def _align(size):
+    return (size + 7) & ~7
+
+
+def compact_segment(seg, offset=0.0):
+    """
+    Conserva de un segmento de Whisper solo lo que se guarda (sin tokens, logprobs ni otros campos).
+
+    :param seg: Segmento de Whisper o ya compacto.
+    :param offset: Segundos que se suman a los tiempos (inicio del fragmento en el archivo original).
+    :return: Diccionario {"start", "end", "text"[, "speaker", "confidence"]}; la confianza es la
+             probabilidad media de los tokens (exp de avg_logprob).
+    """
+    entry = {"start": seg["start"] + offset, "end": seg["end"] + offset, "text": seg["text"]}
+    if seg.get("speaker"):
+        entry["speaker"] = seg["speaker"]
+    if seg.get("avg_logprob") is not None:
+        entry["confidence"] = round(math.exp(seg["avg_logprob"]), 4)
+    elif seg.get("confidence") is not None:
+        entry["confidence"] = seg["confidence"]
+    return entry
+
+
+class Transcript:
+    """
+    Transcripción en columnas: tiempos en arrays float64, el texto en un único bloque UTF-8 con offsets,
+    y el hablante (índice en speakers, -1 = ninguno) y la confianza (NaN = desconocida) en arrays pequeños.
+
+    Al recorrerla se crean al vuelo los segmentos {"start", "end", "text"[, "speaker", "confidence"]},
+    así que los exportadores y el índice de búsqueda la aceptan igual que una lista de segmentos. Con
+    load, las columnas son vistas de un archivo mapeado en memoria y no se copian.
+    """
+
+    def __init__(self, start, end, offsets, text, speaker, confidence, speakers=()):
+        self.start = start
+        self.end = end
+        self.offsets = offsets
+        self.text = text
+        self.speaker = speaker
+        self.confidence = confidence
+        self.speakers = list(speakers)
+
+    @classmethod
+    def from_segments(cls, segments):
+        """Construye la transcripción a partir de segmentos (diccionarios o otra Transcript)."""
+        if isinstance(segments, Transcript):
+            return segments
+        segments = list(segments)
+        count = len(segments)
+        start = np.empty(count, dtype="<f8")
+        end = np.empty(count, dtype="<f8")
+        offsets = np.zeros(count + 1, dtype="<u8")
+        speaker = np.full(count, -1, dtype="<i2")
+        confidence = np.full(count, np.nan, dtype="<f2")
+        speakers = {}
+        texts = []
+        for i, seg in enumerate(segments):
+            start[i] = seg["start"]
+            end[i] = seg["end"]
+            texts.append(seg["text"].encode("utf-8"))
+            offsets[i + 1] = offsets[i] + len(texts[-1])
+            if seg.get("speaker"):
+                speaker[i] = speakers.setdefault(seg["speaker"], len(speakers))
+            if seg.get("confidence") is not None:
+                confidence[i] = seg["confidence"]
+        text = np.frombuffer(b"".join(texts), dtype=np.uint8)
+        return cls(start, end, offsets, text, speaker, confidence, speakers)
+
+    def __len__(self):
+        return len(self.start)
+
+    def text_at(self, index):
+        """Texto de un segmento, decodificado solo de su tramo del bloque UTF-8."""
+        return self.text[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Índice de segmento fuera de rango")
+        seg = {"start": float(self.start[index]), "end": float(self.end[index]), "text": self.text_at(index)}
+        if self.speaker[index] >= 0:
+            seg["speaker"] = self.speakers[self.speaker[index]]
+        if not np.isnan(self.confidence[index]):
+            seg["confidence"] = round(float(self.confidence[index]), 3)
+        return seg
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __reduce__(self):
+        # Al pasar a otro proceso se envían las columnas, no el mapeo del archivo
+        columns = (self.start, self.end, self.offsets, self.text, self.speaker, self.confidence)
+        return Transcript, tuple(np.asarray(column) for column in columns) + (tuple(self.speakers),)
+
+    @property
+    def nbytes(self):
+        """Bytes que ocupan las columnas."""
+        columns = (self.start, self.end, self.offsets, self.text, self.speaker, self.confidence)
+        return sum(column.nbytes for column in columns)
+
+    def save(self, path):
+        """Escribe la transcripción en el formato de MAGIC (de forma atómica)."""
+        meta = json.dumps({"count": len(self), "text_bytes": int(self.offsets[-1]), "speakers": self.speakers},
+                          ensure_ascii=False).encode("utf-8")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(meta)))
+            f.write(meta)
+            for column in (self.start, self.end, self.offsets, self.speaker, self.confidence, self.text):
+                f.write(b"\0" * (_align(f.tell()) - f.tell()))
+                f.write(np.ascontiguousarray(column).tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Abre una transcripción guardada con save mapeándola en memoria.
+
+        :raises ValueError: Si el archivo no tiene el formato esperado.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError("La transcripción está incompleta")
+            magic, version, meta_size = _HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("El archivo no es una transcripción en formato TRSC")
+            meta = json.loads(f.read(meta_size).decode("utf-8"))
+
+        count = meta["count"]
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        position = _HEADER.size + meta_size
+        columns = []
+        for dtype, length in (("<f8", count), ("<f8", count), ("<u8", count + 1), ("<i2", count),
+                              ("<f2", count), (np.uint8, meta["text_bytes"])):
+            position = _align(position)
+            size = np.dtype(dtype).itemsize * length
+            if position + size > len(data):
+                raise ValueError("La transcripción está incompleta")
+            columns.append(data[position:position + size].view(dtype))
+            position += size
+        start, end, offsets, speaker, confidence, text = columns
+        return cls(start, end, offsets, text, speaker, confidence, meta["speakers"])